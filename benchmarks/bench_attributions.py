@@ -0,0 +1,50 @@
+"""
+Compare JSON dict attributions with packed float32/float16 vectors.
+
+    python benchmarks/bench_attributions.py [--features 800] [--top-k 50]
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from ml_audit.attributions import expand_attributions, pack_attributions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=int, default=800)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [f"feature_{i}" for i in range(args.features)]
+    values = [rng.gauss(0, 0.1) for _ in names]
+    as_dict = dict(zip(names, values))
+
+    cases = {
+        "json dict": lambda: json.dumps(as_dict, separators=(",", ":")).encode(),
+        "packed float32": lambda: pack_attributions(values),
+        "packed float16": lambda: pack_attributions(values, dtype="float16"),
+        f"packed float16 top-{args.top_k}": lambda: pack_attributions(
+            values, dtype="float16", top_k=args.top_k
+        ),
+    }
+    for name, encode in cases.items():
+        data = encode()
+        write = min(timeit.repeat(encode, number=args.number, repeat=3)) / args.number
+        if name == "json dict":
+            read = lambda: json.loads(data)  # noqa: E731
+        else:
+            read = lambda: expand_attributions(data, names)  # noqa: E731
+        read_time = min(timeit.repeat(read, number=args.number, repeat=3)) / args.number
+        print(
+            f"{name:24s} {len(data):8d} bytes  encode {write * 1e6:8.1f} us"
+            f"  decode {read_time * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare input fingerprinting strategies.
+
+    python benchmarks/bench_fingerprint.py [--rows 20000] [--features 40]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import timeit
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=[])
+django.setup()
+
+from ml_audit.fingerprint import compute_fingerprint, fingerprint_many, xxhash  # noqa: E402
+
+
+def _rows(count, width):
+    rng = random.Random(0)
+    return [
+        {
+            **{f"f{i}": rng.random() for i in range(width // 2)},
+            **{f"c{i}": rng.choice(["IN", "US", "DE"]) for i in range(width // 2)},
+        }
+        for _ in range(count)
+    ]
+
+
+def _json_sha256(rows):
+    return [
+        hashlib.sha256(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()
+        for row in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows, args.features)
+    cases = {
+        "json.dumps(sort_keys) + sha256": lambda: _json_sha256(rows),
+        "compute_fingerprint (blake2b)": lambda: [compute_fingerprint(row) for row in rows],
+        "fingerprint_many (blake2b)": lambda: fingerprint_many(rows),
+    }
+    if xxhash is not None:
+        cases["fingerprint_many (xxh3)"] = lambda: fingerprint_many(rows, algorithm="xxh3")
+
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:34s} {best * 1e6 / len(rows):8.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
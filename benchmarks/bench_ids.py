@@ -0,0 +1,97 @@
+"""
+Compare insert throughput and primary key index size for UUIDv4 and UUIDv7 keys.
+
+Rows are inserted in batches into a table shaped like a narrow audit event
+(UUID primary key plus a text payload).
+
+    python benchmarks/bench_ids.py [--rows 200000] [--batch 1000]
+    python benchmarks/bench_ids.py --postgres ml_audit_bench   # libpq env for host/user
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+import django
+from django.conf import settings
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=200000)
+parser.add_argument("--batch", type=int, default=1000)
+parser.add_argument("--postgres", metavar="DBNAME", help="benchmark PostgreSQL instead of SQLite")
+args = parser.parse_args()
+
+if args.postgres:
+    database = {"ENGINE": "django.db.backends.postgresql", "NAME": args.postgres}
+else:
+    database = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(tempfile.mkdtemp(), "bench_ids.sqlite3"),
+    }
+settings.configure(INSTALLED_APPS=[], DATABASES={"default": database})
+django.setup()
+
+from django.db import connection, models, transaction  # noqa: E402
+
+from ml_audit.ids import uuid7  # noqa: E402
+
+TABLE = "bench_ids"
+PAYLOAD = "x" * 200
+
+
+def _create_table(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    id_type = connection.data_types["UUIDField"]
+    cursor.execute(f"CREATE TABLE {TABLE} (id {id_type} PRIMARY KEY, payload text NOT NULL)")
+
+
+def _index_bytes(cursor):
+    if connection.vendor == "postgresql":
+        cursor.execute(f"SELECT pg_relation_size('{TABLE}_pkey')")
+        return cursor.fetchone()[0]
+    try:
+        cursor.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = ?", [f"sqlite_autoindex_{TABLE}_1"]
+        )
+    except Exception:  # SQLite built without the dbstat table
+        return None
+    return cursor.fetchone()[0]
+
+
+def _run(generate):
+    field = models.UUIDField()
+    sql = f"INSERT INTO {TABLE} (id, payload) VALUES (%s, %s)"
+    with connection.cursor() as cursor:
+        _create_table(cursor)
+    elapsed = 0.0
+    for offset in range(0, args.rows, args.batch):
+        rows = [
+            (field.get_db_prep_value(generate(), connection), PAYLOAD)
+            for _ in range(min(args.batch, args.rows - offset))
+        ]
+        started = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        elapsed += time.perf_counter() - started
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"VACUUM ANALYZE {TABLE}")
+        size = _index_bytes(cursor)
+        cursor.execute(f"DROP TABLE {TABLE}")
+    return elapsed, size
+
+
+def main():
+    print(f"{connection.vendor}, {args.rows} rows in batches of {args.batch}")
+    for name, generate in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        elapsed, size = _run(generate)
+        size_text = "n/a" if size is None else f"{size / 2**20:.1f} MiB"
+        print(
+            f"{name}  {args.rows / elapsed:10.0f} rows/s   primary key index {size_text}"
+        )
+
+
+if __name__ == "__main__":
+    main()
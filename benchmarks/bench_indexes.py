@@ -0,0 +1,160 @@
+"""
+Compare insert and read cost of the old (per-column) and current index sets.
+
+Both SQLite databases get the current schema; the "old" one has its
+PredictionEvent indexes swapped for the pre-0007 set and is queried through
+the ModelVersion/RequestingActor joins, as the API used to be.
+
+    python benchmarks/bench_indexes.py [--rows 50000] [--batch 1000]
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=["django.contrib.contenttypes", "ml_audit"],
+    DATABASES={
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        "old": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    },
+    USE_TZ=True,
+)
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connections, models  # noqa: E402
+
+from ml_audit.models import (  # noqa: E402
+    ModelVersion,
+    PredictionEvent,
+    PredictionStatus,
+    RequestingActor,
+)
+
+DATABASES = {"old": "old", "current": "default"}
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+# PredictionEvent indexes before migration 0007.
+OLD_INDEXES = [
+    models.Index(fields=[name], name=f"bench_old_{name}")
+    for name in (
+        "timestamp",
+        "trace_id",
+        "environment",
+        "input_fingerprint",
+        "output",
+        "confidence",
+        "status",
+        "decision_outcome",
+        "model",
+        "actor",
+    )
+]
+
+
+def _migrate(alias):
+    call_command("migrate", database=alias, verbosity=0)
+    if alias != "old":
+        return
+    with connections[alias].schema_editor() as schema_editor:
+        for index in PredictionEvent._meta.indexes:
+            schema_editor.remove_index(PredictionEvent, index)
+        for index in OLD_INDEXES:
+            schema_editor.add_index(PredictionEvent, index)
+
+
+def _insert(alias, rows, batch):
+    rng = random.Random(0)
+    model_versions = [
+        ModelVersion.objects.using(alias).create(model_name=f"model_{i}", version="1")
+        for i in range(8)
+    ]
+    actors = [
+        RequestingActor.objects.using(alias).create(
+            actor_type="user", actor_id=f"user-{i}", tenant_id=f"tenant-{i % 20}"
+        )
+        for i in range(500)
+    ]
+    statuses = [PredictionStatus.SUCCESS] * 98 + [PredictionStatus.FAILED] * 2
+    elapsed = 0.0
+    for offset in range(0, rows, batch):
+        events = []
+        for i in range(offset, min(offset + batch, rows)):
+            model, actor = rng.choice(model_versions), rng.choice(actors)
+            events.append(
+                PredictionEvent(
+                    prediction_id=str(uuid.uuid4()),
+                    timestamp=START + timedelta(seconds=i),
+                    model=model,
+                    model_name=model.model_name,
+                    model_version=model.version,
+                    actor=actor,
+                    actor_type=actor.actor_type,
+                    actor_external_id=actor.actor_id,
+                    tenant_id=actor.tenant_id,
+                    environment=rng.choice(["production", "staging"]),
+                    trace_id=uuid.uuid4().hex if rng.random() < 0.1 else "",
+                    input_fingerprint=f"blake2b:{rng.getrandbits(64):016x}",
+                    output={"score": rng.random()},
+                    confidence=rng.random(),
+                    decision_outcome=rng.choice(["approved", "denied"]),
+                    status=rng.choice(statuses),
+                )
+            )
+        started = time.perf_counter()
+        PredictionEvent.objects.using(alias).bulk_create(events)
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def _queries(alias, rows):
+    events = PredictionEvent.objects.using(alias).order_by("-timestamp")
+    window = START + timedelta(seconds=rows * 3 // 4)
+    if alias == "old":
+        model, tenant = "model__model_name", "actor__tenant_id"
+    else:
+        model, tenant = "model_name", "tenant_id"
+    return {
+        "latest page": events,
+        "model + time range": events.filter(**{model: "model_3"}, timestamp__gte=window),
+        "tenant + time range": events.filter(**{tenant: "tenant-7"}, timestamp__gte=window),
+        "failed + time range": events.filter(
+            status=PredictionStatus.FAILED, timestamp__gte=window
+        ),
+        "environment": events.filter(environment="staging"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    reads = {}
+    for label, alias in DATABASES.items():
+        _migrate(alias)
+        elapsed = _insert(alias, args.rows, args.batch)
+        print(f"{label:12s} insert {elapsed * 1e6 / args.rows:8.2f} us/row")
+        for name, queryset in _queries(alias, args.rows).items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                list(queryset[:50])
+                timings.append(time.perf_counter() - started)
+            reads.setdefault(name, {})[label] = min(timings)
+
+    print()
+    print(f"{'first page of 50':24s}" + "".join(f"{label:>14s}" for label in DATABASES))
+    for name, timings in reads.items():
+        print(f"{name:24s}" + "".join(f"{timings[label] * 1e3:11.2f} ms" for label in DATABASES))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,34 @@ from __future__ import annotations
 from django.contrib import admin
 from django.http import HttpRequest
 
-from ml_audit.models import Explanation, ModelVersion, PredictionEvent, RequestingActor
+from ml_audit.models import (
+    Explanation,
+    FeatureSnapshot,
+    ModelVersion,
+    PredictionEvent,
+    QuantileSketch,
+    RequestingActor,
+)
+from ml_audit.routers import read_database
+from ml_audit.sketches import DDSketch
+
+
+class ReplicaReadAdmin(admin.ModelAdmin):
+    """
+    Read GET pages from a `ML_AUDIT_DATABASES["READ"]` replica, if any.
+
+    Saves, deletes and actions (POST) work on the write database.
+    """
+
+    def get_queryset(self, request: HttpRequest):
+        qs = super().get_queryset(request)
+        if request.method in ("GET", "HEAD"):
+            qs = qs.using(read_database())
+        return qs
 
 
 @admin.register(ModelVersion)
-class ModelVersionAdmin(admin.ModelAdmin):
+class ModelVersionAdmin(ReplicaReadAdmin):
     list_display = (
         "id",
         "model_name",
@@ -34,7 +57,7 @@ class ModelVersionAdmin(admin.ModelAdmin):
 
 
 @admin.register(RequestingActor)
-class RequestingActorAdmin(admin.ModelAdmin):
+class RequestingActorAdmin(ReplicaReadAdmin):
     list_display = (
         "id",
         "actor_type",
@@ -59,7 +82,7 @@ class RequestingActorAdmin(admin.ModelAdmin):
 
 
 @admin.register(PredictionEvent)
-class PredictionEventAdmin(admin.ModelAdmin):
+class PredictionEventAdmin(ReplicaReadAdmin):
     list_display = (
         "id",
         "prediction_id",
@@ -74,19 +97,21 @@ class PredictionEventAdmin(admin.ModelAdmin):
         "environment",
         "status",
         "decision_outcome",
-        "model__model_name",
-        "model__version",
+        "model_name",
+        "model_version",
     )
     search_fields = (
         "id",
         "prediction_id",
         "trace_id",
-        "model__model_name",
-        "model__version",
-        "actor__actor_id",
-        "actor__tenant_id",
+        "model_name",
+        "model_version",
+        "actor_external_id",
+        "tenant_id",
     )
-    readonly_fields = [field for field in PredictionEvent._meta.fields]
+    readonly_fields = [field for field in PredictionEvent._meta.fields] + [
+        "resolved_features"
+    ]
     date_hierarchy = "timestamp"
     ordering = ("-timestamp",)
 
@@ -96,9 +121,34 @@ class PredictionEventAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj = None) -> bool:
         return False
 
+    @admin.display(description="Resolved features")
+    def resolved_features(self, obj: PredictionEvent):
+        return obj.resolved_features
+
+
+@admin.register(FeatureSnapshot)
+class FeatureSnapshotAdmin(ReplicaReadAdmin):
+    list_display = (
+        "id",
+        "fingerprint",
+        "created_at",
+    )
+    search_fields = (
+        "id",
+        "fingerprint",
+    )
+    readonly_fields = ("id", "fingerprint", "features", "created_at")
+    ordering = ("-created_at",)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
+
 
 @admin.register(Explanation)
-class explanationnAdmin(admin.ModelAdmin):
+class explanationnAdmin(ReplicaReadAdmin):
     list_display = (
         "id",
         "prediction",
@@ -120,5 +170,88 @@ class explanationnAdmin(admin.ModelAdmin):
         "id",
         "created_at",
         "generated_at",
+        "attributions",
     )
+    exclude = ("packed_attributions",)
     ordering = ("-generated_at",)
+
+    @admin.display(description="Attributions")
+    def attributions(self, obj: Explanation):
+        return obj.attributions
+
+
+@admin.register(QuantileSketch)
+class QuantileSketchAdmin(ReplicaReadAdmin):
+    list_display = (
+        "bucket",
+        "model_name",
+        "model_version",
+        "metric",
+        "count",
+        "p50",
+        "p95",
+        "p99",
+    )
+    list_filter = (
+        "metric",
+        "model_name",
+        "model_version",
+    )
+    search_fields = (
+        "model_name",
+        "model_version",
+    )
+    readonly_fields = (
+        "id",
+        "bucket",
+        "model_name",
+        "model_version",
+        "metric",
+        "count",
+        "updated_at",
+    )
+    exclude = ("sketch",)
+    date_hierarchy = "bucket"
+    ordering = ("-bucket",)
+    actions = ["merge_quantiles"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
+
+    @admin.display(description="p50")
+    def p50(self, obj: QuantileSketch):
+        return obj.to_sketch().quantile(0.5)
+
+    @admin.display(description="p95")
+    def p95(self, obj: QuantileSketch):
+        return obj.to_sketch().quantile(0.95)
+
+    @admin.display(description="p99")
+    def p99(self, obj: QuantileSketch):
+        return obj.to_sketch().quantile(0.99)
+
+    @admin.action(description="Merge selected buckets and show quantiles")
+    def merge_quantiles(self, request, queryset):
+        merged: dict = {}
+        for row in queryset.order_by("bucket"):
+            key = (row.model_name, row.model_version, row.metric)
+            first, last, sketch = merged.get(key, (row.bucket, row.bucket, None))
+            if sketch is None:
+                sketch = DDSketch.from_dict(row.sketch)
+            else:
+                sketch.merge(row.to_sketch())
+            merged[key] = (first, row.bucket, sketch)
+        for (model_name, model_version, metric), (first, last, sketch) in sorted(merged.items()):
+            self.message_user(
+                request,
+                f"{model_name} v{model_version} {metric}, {first:%Y-%m-%d %H:00} to "
+                f"{last:%Y-%m-%d %H:00} (n={sketch.count}): "
+                f"p50={sketch.quantile(0.5):.4g} p95={sketch.quantile(0.95):.4g} "
+                f"p99={sketch.quantile(0.99):.4g}",
+            )
@@ -1,6 +1,14 @@
 from rest_framework import serializers
 
-from ml_audit.models import Explanation, ModelVersion, PredictionEvent, RequestingActor
+from ml_audit.models import (
+    Explanation,
+    ModelVersion,
+    PredictionEvent,
+    PredictionRollup,
+    QuantileSketch,
+    RequestingActor,
+)
+from ml_audit.services.sketches import DEFAULT_QUANTILES, quantiles
 
 
 class ModelVersionSerializer(serializers.ModelSerializer):
@@ -39,6 +47,7 @@ class RequestingActorSerializer(serializers.ModelSerializer):
 
 class ExplanationSerializer(serializers.ModelSerializer):
     prediction_id = serializers.UUIDField(source="prediction.prediction_id", read_only=True)
+    attributions = serializers.JSONField(read_only=True)
 
     class Meta:
         model = Explanation
@@ -48,6 +57,7 @@ class ExplanationSerializer(serializers.ModelSerializer):
             "method",
             "method_version",
             "payload",
+            "attributions",
             "summary_text",
             "status",
             "generated_at",
@@ -61,6 +71,7 @@ class PredictionEventSerializer(serializers.ModelSerializer):
     model = ModelVersionSerializer(read_only=True)
     actor = RequestingActorSerializer(read_only=True)
     explanation = ExplanationSerializer(read_only=True)
+    features = serializers.JSONField(source="resolved_features", read_only=True)
 
     class Meta:
         model = PredictionEvent
@@ -83,3 +94,51 @@ class PredictionEventSerializer(serializers.ModelSerializer):
             "explanation",
         ]
         read_only_fields = fields
+
+
+class PredictionRollupSerializer(serializers.ModelSerializer):
+    success_count = serializers.IntegerField(read_only=True)
+    failure_rate = serializers.FloatField(read_only=True)
+    avg_latency_ms = serializers.FloatField(read_only=True)
+    avg_confidence = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = PredictionRollup
+        fields = [
+            "bucket",
+            "model_name",
+            "model_version",
+            "environment",
+            "tenant_id",
+            "event_count",
+            "success_count",
+            "failed_count",
+            "partial_count",
+            "failure_rate",
+            "outcome_counts",
+            "avg_latency_ms",
+            "latency_max",
+            "avg_confidence",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class QuantileSketchSerializer(serializers.ModelSerializer):
+    quantiles = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuantileSketch
+        fields = [
+            "bucket",
+            "model_name",
+            "model_version",
+            "metric",
+            "count",
+            "quantiles",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_quantiles(self, obj: QuantileSketch):
+        return quantiles(obj.to_sketch(), DEFAULT_QUANTILES)
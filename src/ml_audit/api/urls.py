@@ -5,11 +5,18 @@ from __future__ import annotations
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from ml_audit.api.views import ModelVersionViewSet, PredictionEventViewSet
+from ml_audit.api.views import (
+    ModelVersionViewSet,
+    PredictionEventViewSet,
+    PredictionRollupViewSet,
+    QuantileSketchViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"predictions", PredictionEventViewSet, basename="ml-audit-prediction")
 router.register(r"models", ModelVersionViewSet, basename="ml-audit-model")
+router.register(r"rollups", PredictionRollupViewSet, basename="ml-audit-rollup")
+router.register(r"quantiles", QuantileSketchViewSet, basename="ml-audit-quantile")
 
 app_name = "ml_audit_api"
 
@@ -1,16 +1,77 @@
 # src/ml_audit/api/views.py
 
 from __future__ import annotations
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max, Sum
 from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-from ml_audit.api.serializers import ModelVersionSerializer, PredictionEventSerializer
-from ml_audit.models import ModelVersion, PredictionEvent
+from ml_audit.api.serializers import (
+    ModelVersionSerializer,
+    PredictionEventSerializer,
+    PredictionRollupSerializer,
+    QuantileSketchSerializer,
+)
+from ml_audit.archive import query_archive
+from ml_audit.conf import get_partitioning_config
+from ml_audit.models import (
+    ModelVersion,
+    PredictionEvent,
+    PredictionRollup,
+    QuantileSketch,
+    SketchMetric,
+)
+from ml_audit.services.sketches import DEFAULT_QUANTILES, quantiles, window_sketch
+from ml_audit.partitioning import is_partitioned
+from ml_audit.routers import read_database
 
 
-class PredictionEventViewSet(viewsets.ReadOnlyModelViewSet):
+ARCHIVE_PAGE_SIZE = 100
+ARCHIVE_MAX_PAGE_SIZE = 1000
+
+
+def _int_param(
+    params, name: str, default: int, *, minimum: int = 0, maximum: int | None = None
+) -> int:
+    value = params.get(name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+    if number < minimum:
+        raise ValidationError({name: f"Must be at least {minimum}."})
+    return min(number, maximum) if maximum is not None else number
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = timezone.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+class ReplicaReadMixin:
+    """Serve the view's queryset from a `ML_AUDIT_DATABASES["READ"]` replica, if any."""
+
+    def get_queryset(self):
+        return super().get_queryset().using(read_database())
+
+
+class PredictionEventViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only access to prediction events.
 
@@ -23,12 +84,24 @@ class PredictionEventViewSet(viewsets.ReadOnlyModelViewSet):
     - has_explanation (true/false)
     - status
     - min_confidence, max_confidence
+
+    Model and actor filters use the columns copied onto each event, so they
+    need no join.
+
+    `GET .../archived/` queries archived events (see `ml_audit_archive`).
+
+    Time bounds are applied as plain range conditions on `timestamp`, so a
+    partitioned table only scans the partitions they overlap. Without
+    `time_from`, `ML_AUDIT_PARTITIONING["API_DEFAULT_WINDOW"]` (days) bounds
+    queries on a partitioned table to recent partitions.
     """
 
     serializer_class = PredictionEventSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = (
         PredictionEvent.objects.select_related("model", "actor", "explanation")
+        # One IN query per page; shared snapshots are fetched once, not per row.
+        .prefetch_related("feature_snapshot")
         .order_by("-timestamp")
     )
 
@@ -38,23 +111,23 @@ class PredictionEventViewSet(viewsets.ReadOnlyModelViewSet):
 
         model_name = params.get("model_name")
         if model_name:
-            qs = qs.filter(model__model_name=model_name)
+            qs = qs.filter(model_name=model_name)
 
         model_version = params.get("model_version")
         if model_version:
-            qs = qs.filter(model__version=model_version)
+            qs = qs.filter(model_version=model_version)
 
         actor_type = params.get("actor_type")
         if actor_type:
-            qs = qs.filter(actor__actor_type=actor_type)
+            qs = qs.filter(actor_type=actor_type)
 
         actor_id = params.get("actor_id")
         if actor_id:
-            qs = qs.filter(actor__actor_id=actor_id)
+            qs = qs.filter(actor_external_id=actor_id)
 
         tenant_id = params.get("tenant_id")
         if tenant_id:
-            qs = qs.filter(actor__tenant_id=tenant_id)
+            qs = qs.filter(tenant_id=tenant_id)
 
         environment = params.get("environment")
         if environment:
@@ -90,30 +163,72 @@ class PredictionEventViewSet(viewsets.ReadOnlyModelViewSet):
             except ValueError:
                 pass
 
-        time_from = params.get("time_from")
-        if time_from:
-            try:
-                dt_from = timezone.datetime.fromisoformat(time_from)
-                if timezone.is_naive(dt_from):
-                    dt_from = timezone.make_aware(dt_from, timezone.utc)
-                qs = qs.filter(timestamp__gte=dt_from)
-            except ValueError:
-                pass
+        dt_from = _parse_time(params.get("time_from"))
+        if dt_from is None:
+            window = get_partitioning_config().api_default_window
+            if window and is_partitioned(qs.db):
+                dt_from = timezone.now() - timedelta(days=window)
+        if dt_from is not None:
+            qs = qs.filter(timestamp__gte=dt_from)
 
-        time_to = params.get("time_to")
-        if time_to:
-            try:
-                dt_to = timezone.datetime.fromisoformat(time_to)
-                if timezone.is_naive(dt_to):
-                    dt_to = timezone.make_aware(dt_to, timezone.utc)
-                qs = qs.filter(timestamp__lte=dt_to)
-            except ValueError:
-                pass
+        dt_to = _parse_time(params.get("time_to"))
+        if dt_to is not None:
+            qs = qs.filter(timestamp__lte=dt_to)
 
         return qs
 
+    @action(detail=False, methods=["get"])
+    def archived(self, request):
+        """
+        Archived events (see `ml_audit_archive`), filtered by `time_from`,
+        `time_to`, `model_name`, `model_version` and `prediction_id`.
+
+        Either `prediction_id` or both `time_from` and `time_to` are required.
+        Pages are selected with `limit` and `offset`; only the archive
+        segments needed for the page are read, so there is no total count.
+        """
+        params = request.query_params
+        time_from = _parse_time(params.get("time_from"))
+        time_to = _parse_time(params.get("time_to"))
+        prediction_id = params.get("prediction_id") or None
+        if prediction_id is None and (time_from is None or time_to is None):
+            raise ValidationError(
+                {"detail": "Pass prediction_id, or both time_from and time_to."}
+            )
+        limit = _int_param(
+            params, "limit", ARCHIVE_PAGE_SIZE, minimum=1, maximum=ARCHIVE_MAX_PAGE_SIZE
+        )
+        offset = _int_param(params, "offset", 0)
+
+        try:
+            records = list(
+                query_archive(
+                    time_from=time_from,
+                    time_to=time_to,
+                    model_name=params.get("model_name") or None,
+                    model_version=params.get("model_version") or None,
+                    prediction_id=prediction_id,
+                    # One extra record tells whether there is a next page.
+                    limit=limit + 1,
+                    offset=offset,
+                )
+            )
+        except ImproperlyConfigured:
+            raise NotFound("The ml-audit archive is not configured.")
 
-class ModelVersionViewSet(viewsets.ReadOnlyModelViewSet):
+        url = request.build_absolute_uri()
+        next_url = None
+        if len(records) > limit:
+            next_url = replace_query_param(url, "offset", offset + limit)
+        previous_url = None
+        if offset > 0:
+            previous_url = replace_query_param(url, "offset", max(offset - limit, 0))
+        return Response(
+            {"next": next_url, "previous": previous_url, "results": records[:limit]}
+        )
+
+
+class ModelVersionViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read-only access to model versions.
     """
@@ -121,3 +236,161 @@ class ModelVersionViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ModelVersionSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = ModelVersion.objects.all().order_by("model_name", "version")
+
+
+class PredictionRollupViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only access to hourly prediction rollups (see `ml_audit_rollup`).
+
+    Supports filtering via query params:
+    - model_name, model_version
+    - environment, tenant_id
+    - time_from, time_to (ISO datetime, compared with the bucket start)
+
+    `GET .../summary/` combines the matching buckets into one set of totals,
+    reading one row per bucket rather than one per event.
+    """
+
+    serializer_class = PredictionRollupSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    queryset = PredictionRollup.objects.order_by("-bucket", "model_name", "model_version")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        params = self.request.query_params
+
+        for name in ("model_name", "model_version", "environment", "tenant_id"):
+            value = params.get(name)
+            if value:
+                qs = qs.filter(**{name: value})
+
+        dt_from = _parse_time(params.get("time_from"))
+        if dt_from is not None:
+            qs = qs.filter(bucket__gte=dt_from)
+
+        dt_to = _parse_time(params.get("time_to"))
+        if dt_to is not None:
+            qs = qs.filter(bucket__lte=dt_to)
+
+        return qs
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        qs = self.get_queryset().order_by()
+        totals = qs.aggregate(
+            buckets=Count("id"),
+            event_count=Sum("event_count"),
+            failed_count=Sum("failed_count"),
+            partial_count=Sum("partial_count"),
+            latency_sum=Sum("latency_sum"),
+            latency_count=Sum("latency_count"),
+            latency_max=Max("latency_max"),
+            confidence_sum=Sum("confidence_sum"),
+            confidence_count=Sum("confidence_count"),
+        )
+        outcomes = Counter()
+        for counts in qs.values_list("outcome_counts", flat=True):
+            outcomes.update(counts)
+
+        events = totals["event_count"] or 0
+        failed = totals["failed_count"] or 0
+        partial = totals["partial_count"] or 0
+        return Response(
+            {
+                "buckets": totals["buckets"],
+                "event_count": events,
+                "success_count": events - failed - partial,
+                "failed_count": failed,
+                "partial_count": partial,
+                "failure_rate": failed / events if events else None,
+                "outcome_counts": dict(outcomes),
+                "avg_latency_ms": totals["latency_sum"] / totals["latency_count"]
+                if totals["latency_count"]
+                else None,
+                "latency_max": totals["latency_max"],
+                "avg_confidence": totals["confidence_sum"] / totals["confidence_count"]
+                if totals["confidence_count"]
+                else None,
+            }
+        )
+
+
+class QuantileSketchViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only access to hourly `latency_ms` / `confidence` quantile sketches.
+
+    Supports filtering via query params:
+    - model_name, model_version
+    - metric (latency_ms, confidence)
+    - time_from, time_to (ISO datetime, compared with the bucket start)
+
+    `GET .../window/?model_name=...` merges the hourly sketches overlapping
+    `time_from`..`time_to` and returns the quantiles listed in `q`
+    (comma-separated, default 0.5,0.95,0.99) for `metric` (default latency_ms).
+    """
+
+    serializer_class = QuantileSketchSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    queryset = QuantileSketch.objects.order_by("-bucket", "model_name", "model_version", "metric")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        params = self.request.query_params
+
+        for name in ("model_name", "model_version", "metric"):
+            value = params.get(name)
+            if value:
+                qs = qs.filter(**{name: value})
+
+        dt_from = _parse_time(params.get("time_from"))
+        if dt_from is not None:
+            qs = qs.filter(bucket__gte=dt_from)
+
+        dt_to = _parse_time(params.get("time_to"))
+        if dt_to is not None:
+            qs = qs.filter(bucket__lte=dt_to)
+
+        return qs
+
+    @action(detail=False, methods=["get"])
+    def window(self, request):
+        params = request.query_params
+        model_name = params.get("model_name")
+        if not model_name:
+            raise ValidationError({"model_name": "This parameter is required."})
+        metric = params.get("metric") or SketchMetric.LATENCY_MS
+        if metric not in SketchMetric.values:
+            raise ValidationError(
+                {"metric": f"Must be one of {', '.join(SketchMetric.values)}."}
+            )
+        try:
+            levels = (
+                [float(q) for q in params["q"].split(",")]
+                if params.get("q")
+                else DEFAULT_QUANTILES
+            )
+            if not all(0 <= q <= 1 for q in levels):
+                raise ValueError
+        except ValueError:
+            raise ValidationError({"q": "Comma-separated quantiles between 0 and 1."})
+
+        sketch = window_sketch(
+            model_name=model_name,
+            model_version=params.get("model_version") or None,
+            metric=metric,
+            time_from=_parse_time(params.get("time_from")),
+            time_to=_parse_time(params.get("time_to")),
+            using=read_database(),
+        )
+        return Response(
+            {
+                "model_name": model_name,
+                "model_version": params.get("model_version") or None,
+                "metric": metric,
+                "count": sketch.count if sketch else 0,
+                "min": sketch.min if sketch else None,
+                "max": sketch.max if sketch else None,
+                "avg": sketch.avg if sketch else None,
+                "quantiles": quantiles(sketch, levels),
+            }
+        )
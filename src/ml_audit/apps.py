@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class MLAuditConfig(AppConfig):
     name = "ml_audit"
     verbose_name = "ML Audit"
+
+    def ready(self):
+        from ml_audit import checks, signals  # noqa: F401
+        from ml_audit.conf import get_model_version_cache_config
+
+        if get_model_version_cache_config().warm_on_ready:
+            from ml_audit.services.recording import warm_model_version_cache
+
+            warm_model_version_cache()
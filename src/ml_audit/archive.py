@@ -0,0 +1,392 @@
+"""
+Columnar segment files for archived prediction events.
+
+A segment holds up to `ML_AUDIT_ARCHIVE["SEGMENT_ROWS"]` events stored column
+by column, either as Parquet (when `pyarrow` is installed) or in a compact
+native format: a small JSON header followed by one zlib-compressed JSON
+array per column. `manifest.json` lists every segment with its SHA-256
+checksum and min/max timestamp, min/max `prediction_id` and model versions,
+so queries only open the segments that can match.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ml_audit.conf import get_archive_config
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+NATIVE_MAGIC = b"MLAS1\n"
+SUFFIXES = {"native": ".mlas", "parquet": ".parquet"}
+
+COLUMNS: Tuple[str, ...] = (
+    "id",
+    "prediction_id",
+    "timestamp",
+    "model_name",
+    "model_version",
+    "environment",
+    "trace_id",
+    "status",
+    "confidence",
+    "latency_ms",
+    "decision_outcome",
+    "input_fingerprint",
+    "actor_type",
+    "actor_id",
+    "tenant_id",
+    "features",
+    "output",
+    "metadata",
+    "explanation",
+    "created_at",
+)
+JSON_COLUMNS = frozenset({"features", "output", "metadata", "explanation"})
+FLOAT_COLUMNS = frozenset({"confidence", "latency_ms"})
+FILTER_COLUMNS = ("prediction_id", "timestamp", "model_name", "model_version")
+
+
+def format_timestamp(value: datetime) -> str:
+    """Fixed-width UTC ISO format, so archived timestamps compare as strings."""
+    return value.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def resolve_format(archive_format: str) -> str:
+    if archive_format == "auto":
+        return "parquet" if pyarrow is not None else "native"
+    if archive_format == "parquet" and pyarrow is None:
+        raise ImproperlyConfigured(
+            "The 'parquet' archive format requires the `pyarrow` package."
+        )
+    return archive_format
+
+
+@dataclass
+class SegmentInfo:
+    """Manifest entry for one segment file."""
+
+    file: str
+    format: str
+    rows: int
+    bytes: int
+    sha256: str
+    min_timestamp: str
+    max_timestamp: str
+    min_prediction_id: str
+    max_prediction_id: str
+    models: List[List[str]]
+    source: Optional[str] = None
+    created_at: str = ""
+    # When the rows were read from the database; explanations attached
+    # later are re-exported to a newer segment.
+    read_at: str = ""
+    # Ids of rows that a newer segment holds a more complete copy of.
+    superseded: List[str] = field(default_factory=list)
+
+    def may_contain(
+        self,
+        *,
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+        model_name: Optional[str] = None,
+        model_version: Optional[str] = None,
+        prediction_id: Optional[str] = None,
+    ) -> bool:
+        if time_from is not None and self.max_timestamp < time_from:
+            return False
+        if time_to is not None and self.min_timestamp > time_to:
+            return False
+        if prediction_id is not None and not (
+            self.min_prediction_id <= prediction_id <= self.max_prediction_id
+        ):
+            return False
+        if model_name is not None or model_version is not None:
+            return any(
+                (model_name is None or name == model_name)
+                and (model_version is None or version == model_version)
+                for name, version in self.models
+            )
+        return True
+
+
+@dataclass
+class Manifest:
+    segments: List[SegmentInfo] = field(default_factory=list)
+    # `created_at` up to which an unpartitioned table has been exported.
+    archived_until: Optional[str] = None
+
+    def sources(self) -> set:
+        return {segment.source for segment in self.segments if segment.source}
+
+
+def archive_directory(directory: Optional[str | os.PathLike] = None) -> Path:
+    directory = directory or get_archive_config().directory
+    if not directory:
+        raise ImproperlyConfigured("Set ML_AUDIT_ARCHIVE['DIRECTORY'] to use the archive.")
+    return Path(directory)
+
+
+def load_manifest(directory: Optional[str | os.PathLike] = None) -> Manifest:
+    path = archive_directory(directory) / MANIFEST_NAME
+    if not path.exists():
+        return Manifest()
+    data = json.loads(path.read_text("utf-8"))
+    if data.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported archive manifest version: {data.get('version')!r}")
+    return Manifest(
+        segments=[SegmentInfo(**segment) for segment in data["segments"]],
+        archived_until=data.get("archived_until"),
+    )
+
+
+def save_manifest(manifest: Manifest, directory: Optional[str | os.PathLike] = None) -> None:
+    """Write the manifest atomically (temporary file + rename)."""
+    path = archive_directory(directory) / MANIFEST_NAME
+    data = {
+        "version": MANIFEST_VERSION,
+        "archived_until": manifest.archived_until,
+        "segments": [asdict(segment) for segment in manifest.segments],
+    }
+    _write_atomic(path, json.dumps(data, indent=1).encode("utf-8"))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+# -- segment encoding --------------------------------------------------------
+
+
+def _encode_native(columns: Dict[str, List[Any]], level: int) -> bytes:
+    blobs = []
+    offsets: Dict[str, List[int]] = {}
+    position = 0
+    for name in COLUMNS:
+        blob = zlib.compress(
+            json.dumps(columns[name], cls=DjangoJSONEncoder, separators=(",", ":")).encode(
+                "utf-8"
+            ),
+            level,
+        )
+        offsets[name] = [position, len(blob)]
+        position += len(blob)
+        blobs.append(blob)
+    rows = len(columns[COLUMNS[0]])
+    header = json.dumps({"rows": rows, "columns": offsets}).encode("utf-8")
+    return NATIVE_MAGIC + struct.pack("<I", len(header)) + header + b"".join(blobs)
+
+
+def _decode_native(data: bytes, names: Sequence[str]) -> Dict[str, List[Any]]:
+    if not data.startswith(NATIVE_MAGIC):
+        raise ValueError("Not an ml-audit archive segment.")
+    start = len(NATIVE_MAGIC)
+    (header_length,) = struct.unpack_from("<I", data, start)
+    start += 4
+    header = json.loads(data[start : start + header_length])
+    base = start + header_length
+    columns = {}
+    for name in names:
+        offset, length = header["columns"][name]
+        blob = data[base + offset : base + offset + length]
+        columns[name] = json.loads(zlib.decompress(blob))
+    return columns
+
+
+def _encode_parquet(columns: Dict[str, List[Any]], path: Path) -> None:
+    arrays = {}
+    for name in COLUMNS:
+        values = columns[name]
+        if name in JSON_COLUMNS:
+            values = [
+                None if value is None else json.dumps(value, cls=DjangoJSONEncoder)
+                for value in values
+            ]
+            arrays[name] = pyarrow.array(values, type=pyarrow.string())
+        elif name in FLOAT_COLUMNS:
+            arrays[name] = pyarrow.array(values, type=pyarrow.float64())
+        else:
+            arrays[name] = pyarrow.array(values, type=pyarrow.string())
+    pyarrow.parquet.write_table(pyarrow.table(arrays), path, compression="zstd")
+
+
+def _decode_parquet(path: Path, names: Sequence[str]) -> Dict[str, List[Any]]:
+    table = pyarrow.parquet.read_table(path, columns=list(names))
+    columns = table.to_pydict()
+    for name in names:
+        if name in JSON_COLUMNS:
+            columns[name] = [None if v is None else json.loads(v) for v in columns[name]]
+    return columns
+
+
+def write_segment(
+    records: Sequence[Dict[str, Any]],
+    *,
+    name: str,
+    directory: Optional[str | os.PathLike] = None,
+    archive_format: Optional[str] = None,
+    source: Optional[str] = None,
+) -> SegmentInfo:
+    """
+    Write `records` (dicts keyed by `COLUMNS`) as one segment file.
+
+    The file is written under a temporary name, synced and renamed, then its
+    checksum is taken from the bytes on disk. The caller adds the returned
+    entry to the manifest.
+    """
+    if not records:
+        raise ValueError("Cannot write an empty archive segment.")
+    config = get_archive_config()
+    archive_format = resolve_format(archive_format or config.format)
+    directory = archive_directory(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / (name + SUFFIXES[archive_format])
+
+    columns = {column: [record[column] for record in records] for column in COLUMNS}
+    if archive_format == "parquet":
+        tmp = path.with_name(path.name + ".tmp")
+        _encode_parquet(columns, tmp)
+        with open(tmp, "rb+") as fh:
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    else:
+        _write_atomic(path, _encode_native(columns, config.compression_level))
+
+    data = path.read_bytes()
+    timestamps = columns["timestamp"]
+    prediction_ids = columns["prediction_id"]
+    return SegmentInfo(
+        file=path.name,
+        format=archive_format,
+        rows=len(records),
+        bytes=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        min_timestamp=min(timestamps),
+        max_timestamp=max(timestamps),
+        min_prediction_id=min(prediction_ids),
+        max_prediction_id=max(prediction_ids),
+        models=sorted({(r["model_name"], r["model_version"]) for r in records}),
+        source=source,
+        created_at=format_timestamp(datetime.now(dt_timezone.utc)),
+    )
+
+
+def read_segment(
+    segment: SegmentInfo,
+    columns: Optional[Sequence[str]] = None,
+    directory: Optional[str | os.PathLike] = None,
+) -> Dict[str, List[Any]]:
+    """Read `columns` (default: all) of a segment as `{column: values}`."""
+    names = list(columns or COLUMNS)
+    path = archive_directory(directory) / segment.file
+    if segment.format == "parquet":
+        resolve_format("parquet")
+        return _decode_parquet(path, names)
+    return _decode_native(path.read_bytes(), names)
+
+
+def verify_archive(directory: Optional[str | os.PathLike] = None) -> List[str]:
+    """Return a description of every segment that is missing or fails its checksum."""
+    base = archive_directory(directory)
+    problems = []
+    for segment in load_manifest(base).segments:
+        path = base / segment.file
+        if not path.exists():
+            problems.append(f"{segment.file}: missing")
+        elif hashlib.sha256(path.read_bytes()).hexdigest() != segment.sha256:
+            problems.append(f"{segment.file}: checksum mismatch")
+    return problems
+
+
+# -- querying --------------------------------------------------------------
+
+
+def query_archive(
+    *,
+    time_from: Optional[datetime] = None,
+    time_to: Optional[datetime] = None,
+    model_name: Optional[str] = None,
+    model_version: Optional[str] = None,
+    prediction_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    directory: Optional[str | os.PathLike] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield archived events matching the filters, oldest segment first.
+
+    Segments are skipped using the manifest's min/max indexes; in candidate
+    segments only the filter columns are decoded until a row matches. Rows
+    superseded by a re-exported copy are skipped. The
+    first `offset` matches are skipped without decoding their segments'
+    remaining columns, and reading stops after `limit` records.
+    """
+    bounds = {
+        "time_from": format_timestamp(time_from) if time_from else None,
+        "time_to": format_timestamp(time_to) if time_to else None,
+        "model_name": model_name,
+        "model_version": model_version,
+        "prediction_id": prediction_id,
+    }
+    filters = [(name, value) for name, value in bounds.items() if value is not None]
+    manifest = load_manifest(directory)
+    segments = sorted(manifest.segments, key=lambda segment: segment.min_timestamp)
+    yielded = 0
+    for segment in segments:
+        if not segment.may_contain(**bounds):
+            continue
+        if segment.superseded:
+            keys = read_segment(segment, FILTER_COLUMNS + ("id",), directory)
+            superseded = set(segment.superseded)
+            live = [row for row in range(segment.rows) if keys["id"][row] not in superseded]
+        else:
+            keys = read_segment(segment, FILTER_COLUMNS, directory)
+            live = range(segment.rows)
+        matches = [row for row in live if _row_matches(keys, row, filters)]
+        if offset >= len(matches):
+            offset -= len(matches)
+            continue
+        matches, offset = matches[offset:], 0
+        columns = read_segment(segment, None, directory)
+        for row in matches:
+            yield {name: columns[name][row] for name in COLUMNS}
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+
+def _row_matches(
+    keys: Dict[str, List[Any]], row: int, filters: Iterable[Tuple[str, Any]]
+) -> bool:
+    for name, value in filters:
+        if name == "time_from":
+            if keys["timestamp"][row] < value:
+                return False
+        elif name == "time_to":
+            if keys["timestamp"][row] > value:
+                return False
+        elif keys[name][row] != value:
+            return False
+    return True
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import heapq
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Packed layout (little-endian):
+#   magic b"MLA1" | dtype code (b"e" float16, b"f" float32) | flags (1 = top-k)
+#   | uint32 feature count | uint32 stored count
+#   | [uint32 index] * stored (top-k only) | [value] * stored
+_MAGIC = b"MLA1"
+_HEADER = struct.Struct("<4sccII")
+_DTYPE_CODES = {"float16": b"e", "float32": b"f"}
+_DTYPE_SIZES = {b"e": 2, b"f": 4}
+_FLAG_TOP_K = 1
+
+
+def _top_k_indices(values: Any, top_k: int, is_array: bool) -> List[int]:
+    if is_array:
+        top = numpy.argpartition(numpy.abs(values), -top_k)[-top_k:]
+        return sorted(top.tolist())
+    return sorted(heapq.nlargest(top_k, range(len(values)), key=lambda i: abs(values[i])))
+
+
+def pack_attributions(
+    values: Any, *, dtype: str = "float32", top_k: Optional[int] = None
+) -> bytes:
+    """
+    Pack an attribution vector (sequence or NumPy array) into compact bytes.
+
+    With `top_k` only the k largest-magnitude values and their indices are
+    kept. `dtype` is "float32" or "float16".
+    """
+    if dtype not in _DTYPE_CODES:
+        raise ValueError("dtype must be 'float32' or 'float16'.")
+    code = _DTYPE_CODES[dtype]
+    fmt = code.decode()
+
+    is_array = numpy is not None and isinstance(values, numpy.ndarray)
+    values = values.ravel() if is_array else [float(value) for value in values]
+    count = len(values)
+
+    indices: Optional[List[int]] = None
+    if top_k is not None and 0 < top_k < count:
+        indices = _top_k_indices(values, top_k, is_array)
+        values = values[indices] if is_array else [values[i] for i in indices]
+
+    if is_array:
+        body = values.astype("<" + fmt).tobytes()
+    else:
+        try:
+            body = struct.pack(f"<{len(values)}{fmt}", *values)
+        except (OverflowError, struct.error) as exc:
+            raise ValueError(f"Attribution value out of range for {dtype}.") from exc
+
+    header = _HEADER.pack(
+        _MAGIC,
+        code,
+        bytes([_FLAG_TOP_K if indices is not None else 0]),
+        count,
+        len(values),
+    )
+    if indices is None:
+        return header + body
+    return header + struct.pack(f"<{len(indices)}I", *indices) + body
+
+
+def unpack_attributions(data: bytes) -> Tuple[int, Optional[List[int]], List[float]]:
+    """Return `(feature_count, indices or None, values)` from `pack_attributions` output."""
+    data = bytes(data)
+    magic, code, flags, count, stored = _HEADER.unpack_from(data)
+    if magic != _MAGIC or code not in _DTYPE_SIZES:
+        raise ValueError("Not a packed attribution vector.")
+    offset = _HEADER.size
+    indices: Optional[List[int]] = None
+    if flags[0] & _FLAG_TOP_K:
+        indices = list(struct.unpack_from(f"<{stored}I", data, offset))
+        offset += 4 * stored
+    # Values come back exactly as stored (e.g. float32 0.1 is 0.10000000149011612).
+    values = list(struct.unpack_from(f"<{stored}{code.decode()}", data, offset))
+    return count, indices, values
+
+
+def expand_attributions(
+    data: bytes, feature_names: Optional[Sequence[str]] = None
+) -> Dict[str, float]:
+    """
+    Expand packed attributions to `{feature name: value}`.
+
+    Features are named by position when `feature_names` is not available.
+    Top-k vectors only contain the stored features.
+    """
+    count, indices, values = unpack_attributions(data)
+    if feature_names is None or len(feature_names) != count:
+        feature_names = [str(i) for i in range(count)]
+    positions = indices if indices is not None else range(count)
+    return {feature_names[i]: value for i, value in zip(positions, values)}
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import abc
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+from asgiref.sync import sync_to_async
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class _Flight:
+    """A load in progress that concurrent callers for the same key wait on."""
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def resolve(self, value: Any) -> None:
+        self._value = value
+        self._done.set()
+
+    def fail(self, error: BaseException) -> None:
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class LRUCache:
+    """
+    Small thread-safe, process-local LRU cache with hit/miss counters.
+
+    A `maxsize` of 0 disables caching: lookups always miss and nothing is stored.
+    When `ttl` (seconds) is set, entries older than `ttl` are treated as misses.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds or None.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._expires: Dict[Hashable, float] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            if self.ttl is not None and self._expires[key] <= time.monotonic():
+                del self._data[key]
+                del self._expires[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        *,
+        defer: Optional[Callable[[Callable[[], None]], None]] = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `loader()` on a miss.
+
+        Concurrent misses for the same key are collapsed: one caller runs
+        `loader()` and the others wait for its result (or its exception).
+        If `defer` is given, storing the loaded value is handed to it
+        (e.g. `transaction.on_commit`) instead of happening immediately; a
+        value that is not stored by the time the load finishes is not shared
+        either, and the waiting callers run `loader()` themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            value = flight.wait()
+            if value is _MISSING:
+                # The leader's value is not committed yet and may be rolled back.
+                return loader()
+            return value
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.fail(exc)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+        stored = []
+
+        def store() -> None:
+            stored.append(True)
+            self.set(key, value)
+
+        if defer is not None:
+            defer(store)
+        else:
+            store()
+        flight.resolve(value if stored else _MISSING)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self._expires.pop(evicted, None)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def remove_if(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry for which `predicate(key, value)` is true."""
+        with self._lock:
+            for key in [k for k, v in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+                self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self.maxsize,
+                currsize=len(self._data),
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Optional[Hashable]) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            return self.ttl is None or self._expires[key] > time.monotonic()
+
+
+class MemoCacheInfo(NamedTuple):
+    hits: int
+    database_hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.database_hits + self.misses
+        return (self.hits + self.database_hits) / lookups if lookups else 0.0
+
+
+class MemoCache(abc.ABC):
+    """
+    Bounded in-memory LRU with a fallback to values already in the audit log.
+
+    `lookup` checks memory first and, when `_use_database()` is true, calls
+    `_query(key)`; a value found there is kept in memory and counted as a
+    database hit. Subclasses define the key, `_query` and how callers
+    `remember` new values. Values are shared between callers, so they must
+    not be mutated.
+    """
+
+    def __init__(
+        self, *, maxsize: int = 1024, ttl: Optional[float] = None, database: bool = True
+    ) -> None:
+        self.ttl = ttl
+        self.database = database
+        self._memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._database_hits = 0
+
+    def lookup(self, key: Hashable) -> Any:
+        value = self._memory.get(key)
+        if value is None and self._use_database():
+            value = self._load(key)
+        return value
+
+    async def alookup(self, key: Hashable) -> Any:
+        """Async counterpart of `lookup` (the database fallback runs in a worker thread)."""
+        value = self._memory.get(key)
+        if value is None and self._use_database():
+            value = await sync_to_async(self._load)(key)
+        return value
+
+    def _use_database(self) -> bool:
+        return self.database
+
+    @abc.abstractmethod
+    def _query(self, key: Hashable) -> Any:
+        """Return the stored value for `key`, or None."""
+
+    def _load(self, key: Hashable) -> Any:
+        value = self._query(key)
+        if value is None:
+            return None
+        self._memory.set(key, value)
+        with self._lock:
+            self._database_hits += 1
+        return value
+
+    def remove_if(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        self._memory.remove_if(predicate)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._memory.clear()
+        with self._lock:
+            self._database_hits = 0
+
+    def info(self) -> MemoCacheInfo:
+        memory = self._memory.info()
+        with self._lock:
+            database_hits = self._database_hits
+        return MemoCacheInfo(
+            hits=memory.hits,
+            database_hits=database_hits,
+            misses=memory.misses - database_hits,
+            evictions=memory.evictions,
+            maxsize=memory.maxsize,
+            currsize=memory.currsize,
+        )
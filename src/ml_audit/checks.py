@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import List
+
+from django.apps import apps
+from django.core import checks
+from django.db import connections, router
+from django.db.migrations.executor import MigrationExecutor
+
+from ml_audit.db import json_column_is_binary
+from ml_audit.fields import CompressedJSONField
+
+
+@checks.register(checks.Tags.database)
+def check_json_column_types(databases=None, **kwargs) -> List[checks.CheckMessage]:
+    """
+    Refuse to run when `ML_AUDIT_COMPRESSION["ENABLED"]` disagrees with the JSON columns.
+
+    `CompressedJSONField` picks its column type, lookups and write format
+    from the setting, so flipping it without converting the columns would
+    write bytes into native JSON columns (or JSON into binary ones). Runs
+    with `manage.py check --database <alias>` and before `migrate`;
+    databases with unapplied ml-audit migrations are skipped, since
+    migrating creates the columns to match the setting.
+    """
+    errors: List[checks.CheckMessage] = []
+    for alias in databases or ():
+        connection = connections[alias]
+        models = [
+            model
+            for model in apps.get_app_config("ml_audit").get_models()
+            if router.allow_migrate_model(alias, model)
+        ]
+        if not models or _has_unapplied_migrations(connection):
+            continue
+        tables = set(connection.introspection.table_names())
+        for model in models:
+            if model._meta.db_table not in tables:
+                continue
+            for field in model._meta.local_concrete_fields:
+                if not isinstance(field, CompressedJSONField):
+                    continue
+                binary = field.stores_binary()
+                try:
+                    if json_column_is_binary(connection, model, field) == binary:
+                        continue
+                except LookupError:
+                    continue
+                errors.append(
+                    checks.Error(
+                        f"The {field.column!r} column on database {alias!r} is a "
+                        f"{'native JSON' if binary else 'binary'} column, but "
+                        f"ML_AUDIT_COMPRESSION['ENABLED'] is {binary}.",
+                        hint="Run `manage.py ml_audit_convert_json_columns` after "
+                        "changing ML_AUDIT_COMPRESSION['ENABLED'].",
+                        obj=field,
+                        id="ml_audit.E001",
+                    )
+                )
+    return errors
+
+
+def _has_unapplied_migrations(connection) -> bool:
+    executor = MigrationExecutor(connection)
+    targets = executor.loader.graph.leaf_nodes("ml_audit")
+    return bool(executor.migration_plan(targets))
@@ -1,9 +1,30 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from typing import Iterable, Set
+from functools import cached_property
+from typing import Any, Dict, Iterable, Optional, Pattern, Set, Tuple, Type, TypeVar
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from ml_audit.cache import LRUCache
+
+# Feature key sets repeat across requests, so per-key verdicts are memoized;
+# the memo is reset rather than grown without bound on unusual payloads.
+_MAX_MEMOIZED_VERDICTS = 10_000
+
+
+def parse_path_pattern(pattern: str) -> Tuple[str, ...]:
+    """
+    Split a dotted path rule into segments.
+
+    `*` matches exactly one segment (a dict key or a list index) and `**`
+    matches any number of segments, e.g. `customer.*.email` or `**.ssn`.
+    """
+    return tuple(segment for segment in pattern.split(".") if segment)
 
 
 @dataclass(frozen=True)
@@ -14,11 +35,18 @@ class RedactionConfig:
     - Fields in `allowlist` are stored as-is.
     - Fields in `denylist` are always masked.
     - Fields matching `default_sensitive_names` are masked unless explicitly allowed.
+
+    Name rules apply to keys at every nesting level. `path_denylist` and
+    `path_allowlist` hold dotted path rules (see `ml_audit.redaction`) that
+    mask, or keep, values at specific locations in nested payloads.
     """
 
     allowlist: Set[str] = field(default_factory=set)
     denylist: Set[str] = field(default_factory=set)
     mask_value: str = "*****"
+    path_denylist: Tuple[Tuple[str, ...], ...] = ()
+    path_allowlist: Tuple[Tuple[str, ...], ...] = ()
+    plan_cache_size: int = 256
     default_sensitive_names: Set[str] = field(
         default_factory=lambda: {
             "password",
@@ -39,14 +67,40 @@ class RedactionConfig:
         }
     )
 
+    _verdicts: Dict[str, bool] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @cached_property
+    def _sensitive_pattern(self) -> Optional[Pattern[str]]:
+        # One alternation over all names replaces a Python-level substring scan;
+        # longest names first so overlapping names still match.
+        if not self.default_sensitive_names:
+            return None
+        names = sorted(self.default_sensitive_names, key=len, reverse=True)
+        return re.compile("|".join(re.escape(name) for name in names))
+
+    @cached_property
+    def plan_cache(self) -> LRUCache:
+        """Redaction plans keyed by payload shape; see `ml_audit.redaction`."""
+        return LRUCache(maxsize=self.plan_cache_size)
+
     def is_sensitive(self, field_name: str) -> bool:
+        verdict = self._verdicts.get(field_name)
+        if verdict is None:
+            verdict = self._evaluate(field_name)
+            if len(self._verdicts) >= _MAX_MEMOIZED_VERDICTS:
+                self._verdicts.clear()
+            self._verdicts[field_name] = verdict
+        return verdict
+
+    def _evaluate(self, field_name: str) -> bool:
         if field_name in self.allowlist:
             return False
         if field_name in self.denylist:
             return True
-        if any(sensitive in field_name for sensitive in self.default_sensitive_names):
-            return True
-        return False
+        pattern = self._sensitive_pattern
+        return pattern is not None and pattern.search(field_name) is not None
 
     @classmethod
     def from_django_settings(cls) -> RedactionConfig:
@@ -56,12 +110,632 @@ class RedactionConfig:
             values: Iterable[str] = conf.get(key, [])
             return {str(v) for v in values}
 
+        def _as_paths(key: str) -> Tuple[Tuple[str, ...], ...]:
+            return tuple(parse_path_pattern(str(v)) for v in conf.get(key, []))
+
         return cls(
             allowlist=_as_set("ALLOWLIST"),
             denylist=_as_set("DENYLIST"),
             mask_value=str(conf.get("MASK_VALUE", "*****")),
+            path_denylist=_as_paths("PATH_DENYLIST"),
+            path_allowlist=_as_paths("PATH_ALLOWLIST"),
+            plan_cache_size=int(conf.get("PLAN_CACHE_SIZE", 256)),
         )
 
 
+_redaction_config: Optional[RedactionConfig] = None
+
+
 def get_redaction_config() -> RedactionConfig:
-    return RedactionConfig.from_django_settings()
+    """Return the redaction config, built once from settings and reused."""
+    global _redaction_config
+    config = _redaction_config
+    if config is None:
+        config = _redaction_config = RedactionConfig.from_django_settings()
+    return config
+
+
+@receiver(setting_changed, dispatch_uid="ml_audit_redaction_setting_changed")
+def _reset_redaction_config(*, setting: str, **kwargs) -> None:
+    global _redaction_config
+    if setting == "ML_AUDIT_REDACTION":
+        _redaction_config = None
+
+
+_Config = TypeVar("_Config")
+_configs: Dict[type, Any] = {}
+
+
+def _memoized(config_class: Type[_Config]) -> _Config:
+    """Return `config_class.from_django_settings()`, built once and reused."""
+    config = _configs.get(config_class)
+    if config is None:
+        config = _configs[config_class] = config_class.from_django_settings()
+    return config
+
+
+@receiver(setting_changed, dispatch_uid="ml_audit_config_setting_changed")
+def _reset_configs(*, setting: str, **kwargs) -> None:
+    # DatabaseConfig validates its aliases against DATABASES.
+    if setting.startswith("ML_AUDIT_") or setting == "DATABASES":
+        _configs.clear()
+
+
+@dataclass(frozen=True)
+class ModelVersionCacheConfig:
+    """
+    Process-local cache mapping `(model_name, version)` to ModelVersion primary keys.
+
+    - `max_size` bounds the number of cached entries (0 disables the cache).
+    - `warm_on_ready` preloads active model versions when the app is ready.
+    """
+
+    max_size: int = 128
+    warm_on_ready: bool = False
+
+    @classmethod
+    def from_django_settings(cls) -> ModelVersionCacheConfig:
+        conf = getattr(settings, "ML_AUDIT_MODEL_VERSION_CACHE", {})
+        return cls(
+            max_size=int(conf.get("MAX_SIZE", 128)),
+            warm_on_ready=bool(conf.get("WARM_ON_READY", False)),
+        )
+
+
+def get_model_version_cache_config() -> ModelVersionCacheConfig:
+    return _memoized(ModelVersionCacheConfig)
+
+
+@dataclass(frozen=True)
+class ActorCacheConfig:
+    """
+    Process-local cache mapping `(actor_type, actor_id, tenant_id)` to RequestingActor primary keys.
+
+    - `max_size` bounds the number of cached entries (0 disables the cache).
+    - `ttl` is the lifetime of an entry in seconds (None keeps entries until evicted).
+    """
+
+    max_size: int = 1024
+    ttl: Optional[float] = 300.0
+
+    @classmethod
+    def from_django_settings(cls) -> ActorCacheConfig:
+        conf = getattr(settings, "ML_AUDIT_ACTOR_CACHE", {})
+        ttl = conf.get("TTL", 300.0)
+        return cls(
+            max_size=int(conf.get("MAX_SIZE", 1024)),
+            ttl=float(ttl) if ttl else None,
+        )
+
+
+def get_actor_cache_config() -> ActorCacheConfig:
+    return _memoized(ActorCacheConfig)
+
+
+@dataclass(frozen=True)
+class AsyncRecordingConfig:
+    """
+    Buffered, off-request recording used by `audited_prediction`.
+
+    - `enabled` turns the mode on for decorators that do not set `async_recording`.
+    - `queue_size` bounds the number of records held in memory.
+    - `batch_size` / `flush_interval` (seconds) control when the writer thread flushes.
+    - `on_full` decides what happens when the queue is full:
+      "sync" records in the caller's thread, "block" waits for space, "drop" discards.
+    """
+
+    enabled: bool = False
+    queue_size: int = 10_000
+    batch_size: int = 500
+    flush_interval: float = 1.0
+    on_full: str = "sync"
+
+    @classmethod
+    def from_django_settings(cls) -> AsyncRecordingConfig:
+        conf = getattr(settings, "ML_AUDIT_ASYNC_RECORDING", {})
+        on_full = str(conf.get("ON_FULL", "sync"))
+        if on_full not in {"sync", "block", "drop"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_ASYNC_RECORDING['ON_FULL'] must be 'sync', 'block' or 'drop'."
+            )
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            queue_size=int(conf.get("QUEUE_SIZE", 10_000)),
+            batch_size=int(conf.get("BATCH_SIZE", 500)),
+            flush_interval=float(conf.get("FLUSH_INTERVAL", 1.0)),
+            on_full=on_full,
+        )
+
+
+def get_async_recording_config() -> AsyncRecordingConfig:
+    return _memoized(AsyncRecordingConfig)
+
+
+@dataclass(frozen=True)
+class ExplanationWorkersConfig:
+    """
+    Off-request explanation generation used by `audited_prediction`.
+
+    - `enabled` turns the mode on for decorators that do not set `explanation_workers`.
+    - `executor` is "thread" (default) or "process"; process pools need a
+      picklable (module-level) `explanation_builder`.
+    - `max_workers` sizes the pool (None uses the executor default).
+    - `queue_size` bounds explanations queued or running at once.
+    - `timeout` (seconds) marks an explanation as failed if it has not finished.
+    - `on_full` is "inline" (build on the request thread) or "drop".
+    """
+
+    enabled: bool = False
+    executor: str = "thread"
+    max_workers: Optional[int] = None
+    queue_size: int = 1000
+    timeout: Optional[float] = 30.0
+    on_full: str = "inline"
+
+    @classmethod
+    def from_django_settings(cls) -> ExplanationWorkersConfig:
+        conf = getattr(settings, "ML_AUDIT_EXPLANATION_WORKERS", {})
+        executor = str(conf.get("EXECUTOR", "thread"))
+        if executor not in {"thread", "process"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_EXPLANATION_WORKERS['EXECUTOR'] must be 'thread' or 'process'."
+            )
+        on_full = str(conf.get("ON_FULL", "inline"))
+        if on_full not in {"inline", "drop"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_EXPLANATION_WORKERS['ON_FULL'] must be 'inline' or 'drop'."
+            )
+        max_workers = conf.get("MAX_WORKERS")
+        timeout = conf.get("TIMEOUT", 30.0)
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            executor=executor,
+            max_workers=int(max_workers) if max_workers else None,
+            queue_size=int(conf.get("QUEUE_SIZE", 1000)),
+            timeout=float(timeout) if timeout else None,
+            on_full=on_full,
+        )
+
+
+def get_explanation_workers_config() -> ExplanationWorkersConfig:
+    return _memoized(ExplanationWorkersConfig)
+
+
+@dataclass(frozen=True)
+class ExplanationCacheConfig:
+    """
+    Memoization of explanations by model version, input fingerprint and method.
+
+    - `enabled` turns the cache on for decorators that do not set `explanation_cache`.
+    - `max_size` bounds the in-memory LRU (0 disables it).
+    - `ttl` (seconds) expires in-memory entries and ignores older stored
+      explanations (None keeps them until evicted).
+    - `database` also looks up a matching stored Explanation on an in-memory miss.
+    """
+
+    enabled: bool = False
+    max_size: int = 1024
+    ttl: Optional[float] = None
+    database: bool = True
+
+    @classmethod
+    def from_django_settings(cls) -> ExplanationCacheConfig:
+        conf = getattr(settings, "ML_AUDIT_EXPLANATION_CACHE", {})
+        ttl = conf.get("TTL")
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            max_size=int(conf.get("MAX_SIZE", 1024)),
+            ttl=float(ttl) if ttl else None,
+            database=bool(conf.get("DATABASE", True)),
+        )
+
+
+def get_explanation_cache_config() -> ExplanationCacheConfig:
+    return _memoized(ExplanationCacheConfig)
+
+
+@dataclass(frozen=True)
+class PredictionCacheConfig:
+    """
+    Serving repeated inputs from recorded outputs in `audited_prediction`.
+
+    Only suitable for deterministic model versions.
+
+    - `enabled` turns the cache on for decorators that do not set `cache_predictions`.
+    - `max_size` bounds the in-memory LRU (0 disables it).
+    - `ttl` (seconds) expires in-memory entries and ignores older recorded
+      events (None keeps them until evicted).
+    - `database` also looks up a recorded event by `input_fingerprint` on an
+      in-memory miss; this requires `ML_AUDIT_FINGERPRINT["SOURCE"] = "raw"`.
+    """
+
+    enabled: bool = False
+    max_size: int = 1024
+    ttl: Optional[float] = None
+    database: bool = True
+
+    @classmethod
+    def from_django_settings(cls) -> PredictionCacheConfig:
+        conf = getattr(settings, "ML_AUDIT_PREDICTION_CACHE", {})
+        ttl = conf.get("TTL")
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            max_size=int(conf.get("MAX_SIZE", 1024)),
+            ttl=float(ttl) if ttl else None,
+            database=bool(conf.get("DATABASE", True)),
+        )
+
+
+def get_prediction_cache_config() -> PredictionCacheConfig:
+    return _memoized(PredictionCacheConfig)
+
+
+@dataclass(frozen=True)
+class SpoolConfig:
+    """
+    Local write-ahead spool used when the audit database is unavailable.
+
+    - `directory` enables the spool (None disables it).
+    - `mode` is "fallback" (spool only when the database is unreachable)
+      or "always" (never write events inline; replay them later).
+    - `segment_max_bytes` / `segment_max_age` (seconds) rotate to a new segment file.
+    - `fsync_every` / `fsync_interval` batch fsync calls by record count / seconds.
+    """
+
+    directory: Optional[str] = None
+    mode: str = "fallback"
+    segment_max_bytes: int = 64 * 1024 * 1024
+    segment_max_age: float = 60.0
+    fsync_every: int = 100
+    fsync_interval: float = 1.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @classmethod
+    def from_django_settings(cls) -> SpoolConfig:
+        conf = getattr(settings, "ML_AUDIT_SPOOL", {})
+        mode = str(conf.get("MODE", "fallback"))
+        if mode not in {"fallback", "always"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_SPOOL['MODE'] must be 'fallback' or 'always'."
+            )
+        directory = conf.get("DIRECTORY")
+        return cls(
+            directory=str(directory) if directory else None,
+            mode=mode,
+            segment_max_bytes=int(conf.get("SEGMENT_MAX_BYTES", 64 * 1024 * 1024)),
+            segment_max_age=float(conf.get("SEGMENT_MAX_AGE", 60.0)),
+            fsync_every=int(conf.get("FSYNC_EVERY", 100)),
+            fsync_interval=float(conf.get("FSYNC_INTERVAL", 1.0)),
+        )
+
+
+def get_spool_config() -> SpoolConfig:
+    return _memoized(SpoolConfig)
+
+
+@dataclass(frozen=True)
+class PartitioningConfig:
+    """
+    Range partitioning of PredictionEvent by `timestamp` (PostgreSQL only).
+
+    - `enabled` makes the ml-audit migration create the partitioned table.
+    - `interval` is the partition width: "month" (default), "week" or "day".
+    - `premake` is the number of future partitions `ml_audit_partitions create` keeps ready.
+    - `api_default_window` (days) bounds PredictionEvent API queries without
+      `time_from` so they only scan recent partitions (None scans all).
+    """
+
+    enabled: bool = False
+    interval: str = "month"
+    premake: int = 3
+    api_default_window: Optional[int] = None
+
+    @classmethod
+    def from_django_settings(cls) -> PartitioningConfig:
+        conf = getattr(settings, "ML_AUDIT_PARTITIONING", {})
+        interval = str(conf.get("INTERVAL", "month"))
+        if interval not in {"month", "week", "day"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_PARTITIONING['INTERVAL'] must be 'month', 'week' or 'day'."
+            )
+        window = conf.get("API_DEFAULT_WINDOW")
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            interval=interval,
+            premake=int(conf.get("PREMAKE", 3)),
+            api_default_window=int(window) if window else None,
+        )
+
+
+def get_partitioning_config() -> PartitioningConfig:
+    return _memoized(PartitioningConfig)
+
+
+@dataclass(frozen=True)
+class ArchiveConfig:
+    """
+    Archival of old prediction events to columnar segment files.
+
+    - `directory` holds the segments and `manifest.json` (None disables archiving).
+    - `format` is "auto" (Parquet when `pyarrow` is installed), "parquet" or "native".
+    - `segment_rows` caps the number of events per segment file.
+    - `compression_level` is the zlib level of native segments.
+    """
+
+    directory: Optional[str] = None
+    format: str = "auto"
+    segment_rows: int = 100_000
+    compression_level: int = 6
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @classmethod
+    def from_django_settings(cls) -> ArchiveConfig:
+        conf = getattr(settings, "ML_AUDIT_ARCHIVE", {})
+        archive_format = str(conf.get("FORMAT", "auto"))
+        if archive_format not in {"auto", "parquet", "native"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_ARCHIVE['FORMAT'] must be 'auto', 'parquet' or 'native'."
+            )
+        directory = conf.get("DIRECTORY")
+        return cls(
+            directory=str(directory) if directory else None,
+            format=archive_format,
+            segment_rows=int(conf.get("SEGMENT_ROWS", 100_000)),
+            compression_level=int(conf.get("COMPRESSION_LEVEL", 6)),
+        )
+
+
+def get_archive_config() -> ArchiveConfig:
+    return _memoized(ArchiveConfig)
+
+
+@dataclass(frozen=True)
+class FingerprintConfig:
+    """
+    Automatic `input_fingerprint` computation for recorded events.
+
+    - `enabled` computes a fingerprint when the caller does not pass one.
+    - `algorithm` is "blake2b" (default) or "xxh3" (requires the `xxhash` package).
+    - `source` hashes the "redacted" (default) or "raw" features.
+    - `float_precision` is the number of significant digits floats are normalized to.
+    """
+
+    enabled: bool = False
+    algorithm: str = "blake2b"
+    source: str = "redacted"
+    float_precision: int = 12
+
+    @classmethod
+    def from_django_settings(cls) -> FingerprintConfig:
+        conf = getattr(settings, "ML_AUDIT_FINGERPRINT", {})
+        algorithm = str(conf.get("ALGORITHM", "blake2b"))
+        if algorithm not in {"blake2b", "xxh3"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_FINGERPRINT['ALGORITHM'] must be 'blake2b' or 'xxh3'."
+            )
+        source = str(conf.get("SOURCE", "redacted"))
+        if source not in {"redacted", "raw"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_FINGERPRINT['SOURCE'] must be 'redacted' or 'raw'."
+            )
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            algorithm=algorithm,
+            source=source,
+            float_precision=int(conf.get("FLOAT_PRECISION", 12)),
+        )
+
+
+def get_fingerprint_config() -> FingerprintConfig:
+    return _memoized(FingerprintConfig)
+
+
+@dataclass(frozen=True)
+class FeatureStorageConfig:
+    """
+    Where redacted features are stored.
+
+    - "inline" (default) keeps them on each `PredictionEvent`.
+    - "snapshot" writes each distinct payload once to `FeatureSnapshot`
+      and references it from the event.
+
+    `cache_size` bounds the process-local `fingerprint -> FeatureSnapshot.pk`
+    cache (0 disables it).
+    """
+
+    mode: str = "inline"
+    cache_size: int = 4096
+
+    @property
+    def use_snapshots(self) -> bool:
+        return self.mode == "snapshot"
+
+    @classmethod
+    def from_django_settings(cls) -> FeatureStorageConfig:
+        conf = getattr(settings, "ML_AUDIT_FEATURE_STORAGE", {})
+        mode = str(conf.get("MODE", "inline"))
+        if mode not in {"inline", "snapshot"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_FEATURE_STORAGE['MODE'] must be 'inline' or 'snapshot'."
+            )
+        return cls(mode=mode, cache_size=int(conf.get("CACHE_SIZE", 4096)))
+
+
+def get_feature_storage_config() -> FeatureStorageConfig:
+    return _memoized(FeatureStorageConfig)
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """
+    Compression of large JSON columns (`features`, `output`, `metadata`, explanation `payload`).
+
+    - `enabled` turns compression on for newly written values.
+    - `codec` is "zlib" (default) or "zstd" (requires the `zstandard` package).
+    - `threshold` is the encoded size in bytes from which values are compressed.
+    - `level` is the codec's compression level (None uses the codec default).
+    """
+
+    enabled: bool = False
+    codec: str = "zlib"
+    threshold: int = 1024
+    level: Optional[int] = None
+
+    @classmethod
+    def from_django_settings(cls) -> CompressionConfig:
+        conf = getattr(settings, "ML_AUDIT_COMPRESSION", {})
+        codec = str(conf.get("CODEC", "zlib"))
+        if codec not in {"zlib", "zstd"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_COMPRESSION['CODEC'] must be 'zlib' or 'zstd'."
+            )
+        level = conf.get("LEVEL")
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            codec=codec,
+            threshold=int(conf.get("THRESHOLD", 1024)),
+            level=int(level) if level is not None else None,
+        )
+
+
+def get_compression_config() -> CompressionConfig:
+    return _memoized(CompressionConfig)
+
+
+@dataclass(frozen=True)
+class IdGeneratorConfig:
+    """
+    How new primary keys and default `prediction_id`s are generated.
+
+    - "uuid4" (default): random UUIDs.
+    - "uuid7": time-ordered UUIDs (RFC 9562), so new keys land at the end of
+      the primary key index instead of on random pages.
+    """
+
+    algorithm: str = "uuid4"
+
+    @classmethod
+    def from_django_settings(cls) -> IdGeneratorConfig:
+        conf = getattr(settings, "ML_AUDIT_ID_GENERATOR", {})
+        algorithm = str(conf.get("ALGORITHM", "uuid4"))
+        if algorithm not in {"uuid4", "uuid7"}:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_ID_GENERATOR['ALGORITHM'] must be 'uuid4' or 'uuid7'."
+            )
+        return cls(algorithm=algorithm)
+
+
+def get_id_generator_config() -> IdGeneratorConfig:
+    return _memoized(IdGeneratorConfig)
+
+
+@dataclass(frozen=True)
+class RollupConfig:
+    """
+    Hourly `PredictionRollup` maintenance.
+
+    - `inline` updates the rollups in the recording transaction. Otherwise
+      `ml_audit_rollup` folds new events in periodically.
+    - `lag` (seconds) keeps `ml_audit_rollup` away from events whose
+      transactions may still be in flight; it must exceed the longest
+      recording transaction.
+    """
+
+    inline: bool = False
+    lag: int = 60
+
+    @classmethod
+    def from_django_settings(cls) -> RollupConfig:
+        conf = getattr(settings, "ML_AUDIT_ROLLUP", {})
+        lag = int(conf.get("LAG", 60))
+        if lag < 0:
+            raise ImproperlyConfigured("ML_AUDIT_ROLLUP['LAG'] must not be negative.")
+        return cls(inline=bool(conf.get("INLINE", False)), lag=lag)
+
+
+def get_rollup_config() -> RollupConfig:
+    return _memoized(RollupConfig)
+
+
+@dataclass(frozen=True)
+class SketchConfig:
+    """
+    Hourly `latency_ms` / `confidence` quantile sketches per model version.
+
+    - `enabled` feeds newly recorded events into the process-local sketches.
+    - `relative_accuracy` is the DDSketch relative error of every quantile.
+    - `max_bins` bounds the bins per sketch (the lowest bins collapse beyond it).
+    - `flush_interval` (seconds) is how often the in-memory sketches are
+      merged into `QuantileSketch` rows.
+    """
+
+    enabled: bool = False
+    relative_accuracy: float = 0.01
+    max_bins: int = 2048
+    flush_interval: float = 10.0
+
+    @classmethod
+    def from_django_settings(cls) -> SketchConfig:
+        conf = getattr(settings, "ML_AUDIT_SKETCHES", {})
+        accuracy = float(conf.get("RELATIVE_ACCURACY", 0.01))
+        if not 0 < accuracy < 1:
+            raise ImproperlyConfigured(
+                "ML_AUDIT_SKETCHES['RELATIVE_ACCURACY'] must be between 0 and 1."
+            )
+        return cls(
+            enabled=bool(conf.get("ENABLED", False)),
+            relative_accuracy=accuracy,
+            max_bins=int(conf.get("MAX_BINS", 2048)),
+            flush_interval=float(conf.get("FLUSH_INTERVAL", 10.0)),
+        )
+
+
+def get_sketch_config() -> SketchConfig:
+    return _memoized(SketchConfig)
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """
+    Database aliases used by `ml_audit.routers.AuditRouter`.
+
+    - `write` is the alias every ml-audit model is written to (and migrated
+      on); None leaves ml-audit on the project's default routing.
+    - `read` lists replicas of `write` that the read API and the admin
+      query; empty means they read from `write`.
+    - `sticky` (seconds) sends reads to `write` for that long after a write
+      in the same request (or, with `AuditReadStickinessMiddleware`, the
+      same client), so replica lag never hides a client's own writes.
+    """
+
+    write: Optional[str] = None
+    read: Tuple[str, ...] = ()
+    sticky: float = 0.0
+
+    @classmethod
+    def from_django_settings(cls) -> DatabaseConfig:
+        conf = getattr(settings, "ML_AUDIT_DATABASES", {})
+        write = conf.get("WRITE") or None
+        read = conf.get("READ") or ()
+        if isinstance(read, str):
+            read = (read,)
+        read = tuple(read)
+        for alias in ((write,) if write else ()) + read:
+            if alias not in settings.DATABASES:
+                raise ImproperlyConfigured(
+                    f"ML_AUDIT_DATABASES refers to unknown database alias {alias!r}."
+                )
+        sticky = float(conf.get("STICKY", 0.0))
+        if sticky < 0:
+            raise ImproperlyConfigured("ML_AUDIT_DATABASES['STICKY'] must not be negative.")
+        return cls(write=write, read=read, sticky=sticky)
+
+
+def get_database_config() -> DatabaseConfig:
+    return _memoized(DatabaseConfig)
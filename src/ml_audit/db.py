@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import List
+
+from django.apps import apps
+from django.db import connections, migrations, models, router
+
+from ml_audit.conf import get_compression_config
+from ml_audit.fields import MAGIC, CompressedJSONField, decompress
+
+# Backends where `bulk_create(ignore_conflicts=True)` only skips
+# unique/primary key conflicts.
+_INSERT_IGNORE_VENDORS = frozenset({"postgresql", "sqlite"})
+
+
+def audit_database() -> str:
+    """
+    The alias ml-audit writes to (`ML_AUDIT_DATABASES["WRITE"]` under `AuditRouter`).
+
+    All ml-audit models share it, so it is the alias for the services'
+    `transaction.atomic` and `transaction.on_commit` calls.
+    """
+    return router.db_for_write(apps.get_model("ml_audit", "PredictionEvent"))
+
+
+def supports_insert_ignore(using: str) -> bool:
+    connection = connections[using]
+    return (
+        connection.vendor in _INSERT_IGNORE_VENDORS
+        and connection.features.supports_ignore_conflicts
+    )
+
+
+def json_column_is_binary(connection, model: type[models.Model], field: models.Field) -> bool:
+    """Whether `field` is currently stored in a binary column (see `CompressedJSONField`)."""
+    with connection.cursor() as cursor:
+        description = connection.introspection.get_table_description(
+            cursor, model._meta.db_table
+        )
+    for column in description:
+        if column.name == field.column:
+            field_type = connection.introspection.get_field_type(column.type_code, column)
+            return field_type == "BinaryField"
+    raise LookupError(f"Column {field.column!r} not found in {model._meta.db_table!r}.")
+
+
+def convert_json_columns(schema_editor, model: type[models.Model], *, binary: bool) -> List[str]:
+    """
+    Convert `model`'s `CompressedJSONField` columns to binary or native JSON columns.
+
+    Returns the names of the converted fields; columns that already have the
+    requested type are left alone. Compressed values are decompressed before
+    a column goes back to JSON. On SQLite the table is rebuilt, which gives
+    every `CompressedJSONField` of the model the type matching
+    `ML_AUDIT_COMPRESSION["ENABLED"]`, so pass `binary` accordingly there.
+    """
+    connection = schema_editor.connection
+    fields = [
+        field
+        for field in model._meta.local_concrete_fields
+        if isinstance(field, CompressedJSONField)
+        and json_column_is_binary(connection, model, field) != binary
+    ]
+    if not fields:
+        return []
+
+    quote = schema_editor.quote_name
+    table = quote(model._meta.db_table)
+    if not binary:
+        for field in fields:
+            _decompress_column(connection, model, field)
+    if connection.vendor == "postgresql":
+        for field in fields:
+            column = quote(field.column)
+            if binary:
+                db_type, using = "bytea", f"convert_to({column}::text, 'UTF8')"
+            else:
+                db_type, using = "jsonb", f"convert_from({column}, 'UTF8')::jsonb"
+            schema_editor.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {db_type} USING {using}"
+            )
+    else:
+        if not binary:
+            # Native JSON columns validate their values as text.
+            for field in fields:
+                column = quote(field.column)
+                schema_editor.execute(
+                    f"UPDATE {table} SET {column} = CAST({column} AS TEXT) "
+                    f"WHERE {column} IS NOT NULL"
+                )
+        for field in fields:
+            schema_editor.alter_field(
+                model,
+                _storage_field(field, binary=not binary),
+                _storage_field(field, binary=binary),
+            )
+    return [field.name for field in fields]
+
+
+def _storage_field(field: models.Field, *, binary: bool) -> models.Field:
+    storage = (models.BinaryField if binary else models.JSONField)(
+        null=field.null, db_index=field.db_index
+    )
+    storage.set_attributes_from_name(field.name)
+    storage.model = field.model
+    return storage
+
+
+def _decompress_column(connection, model: type[models.Model], field: models.Field) -> None:
+    """Rewrite the compressed values of a binary `field` column as plain JSON bytes."""
+    quote = connection.ops.quote_name
+    table, column = quote(model._meta.db_table), quote(field.column)
+    pk = quote(model._meta.pk.column)
+    last = None
+    with connection.cursor() as cursor:
+        while True:
+            sql = f"SELECT {pk}, {column} FROM {table} WHERE substr({column}, 1, %s) = %s"
+            params = [len(MAGIC), connection.Database.Binary(MAGIC)]
+            if last is not None:
+                sql += f" AND {pk} > %s"
+                params.append(last)
+            cursor.execute(sql + f" ORDER BY {pk} LIMIT 500", params)
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            for key, value in rows:
+                cursor.execute(
+                    f"UPDATE {table} SET {column} = %s WHERE {pk} = %s",
+                    [connection.Database.Binary(decompress(bytes(value))), key],
+                )
+            last = rows[-1][0]
+
+
+class AlterFieldToCompressedJSON(migrations.AlterField):
+    """
+    AlterField from a `JSONField` to a `CompressedJSONField`.
+
+    The column only becomes binary if `ML_AUDIT_COMPRESSION["ENABLED"]` is on
+    when the migration runs; otherwise it stays a native JSON column. Switch
+    later with `manage.py ml_audit_convert_json_columns`.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            convert_json_columns(
+                schema_editor, model, binary=get_compression_config().enabled
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            convert_json_columns(schema_editor, model, binary=False)
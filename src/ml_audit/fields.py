@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+from ml_audit.conf import CompressionConfig, get_compression_config
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Compressed values start with this header followed by a one-byte codec id.
+# JSON text never starts with a NUL byte, so anything else is plain JSON
+# (values under the threshold, or rows written before compression).
+MAGIC = b"\x00mlz"
+_CODEC_IDS = {"zlib": b"z", "zstd": b"s"}
+_CODEC_NAMES = {codec_id: name for name, codec_id in _CODEC_IDS.items()}
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImproperlyConfigured(
+            "The 'zstd' compression codec requires the `zstandard` package."
+        )
+
+
+def compress(data: bytes, config: CompressionConfig) -> bytes:
+    """Return `data` framed and compressed with `config.codec`, or unchanged if below the threshold."""
+    if not config.enabled or len(data) < config.threshold:
+        return data
+    if config.codec == "zstd":
+        _require_zstandard()
+        body = zstandard.ZstdCompressor(level=config.level or 3).compress(data)
+    else:
+        body = zlib.compress(data, config.level or 6)
+    if len(body) + len(MAGIC) + 1 >= len(data):
+        return data
+    return MAGIC + _CODEC_IDS[config.codec] + body
+
+
+def decompress(data: bytes) -> bytes:
+    """Inverse of `compress`; plain (uncompressed) data is returned unchanged."""
+    if not data.startswith(MAGIC):
+        return data
+    codec = _CODEC_NAMES.get(data[len(MAGIC) : len(MAGIC) + 1])
+    body = data[len(MAGIC) + 1 :]
+    if codec == "zlib":
+        return zlib.decompress(body)
+    if codec == "zstd":
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError("Unknown compressed JSON codec.")
+
+
+def is_compressed(data: bytes) -> bool:
+    return bytes(data[: len(MAGIC)]) == MAGIC
+
+
+class CompressedJSONField(models.JSONField):
+    """
+    JSONField that can be stored as compact, optionally compressed JSON bytes.
+
+    With `ML_AUDIT_COMPRESSION["ENABLED"]` off (the default) this is a plain
+    JSONField: a native JSON column with every JSON lookup. With it on, the
+    column is binary (run `ml_audit_convert_json_columns` after switching),
+    values whose encoded size reaches `THRESHOLD` are compressed, and reads
+    decompress transparently. A binary column is opaque to the database, so
+    JSON key lookups (`features__amount=...`) are then unavailable; only
+    `isnull` is.
+
+    The setting must match the columns; the `ml_audit.E001` system check
+    (`ml_audit.checks`) reports a mismatch.
+    """
+
+    _BINARY_LOOKUPS = frozenset({"isnull"})
+
+    @staticmethod
+    def stores_binary() -> bool:
+        return get_compression_config().enabled
+
+    def get_internal_type(self) -> str:
+        return "BinaryField" if self.stores_binary() else "JSONField"
+
+    def _check_supported(self, databases):
+        return []
+
+    def get_lookup(self, lookup_name):
+        if self.stores_binary() and lookup_name not in self._BINARY_LOOKUPS:
+            return None
+        return super().get_lookup(lookup_name)
+
+    def get_transform(self, name):
+        if self.stores_binary():
+            return None
+        return super().get_transform(name)
+
+    def from_db_value(self, value: Any, expression, connection) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return json.loads(decompress(bytes(value)), cls=self.decoder)
+        return super().from_db_value(value, expression, connection)
+
+    def get_db_prep_value(self, value: Any, connection, prepared: bool = False) -> Any:
+        if not self.stores_binary():
+            return super().get_db_prep_value(value, connection, prepared)
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return None
+        data = json.dumps(
+            value, cls=self.encoder, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        return connection.Database.Binary(compress(data, get_compression_config()))
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+
+from ml_audit.conf import get_fingerprint_config
+
+try:  # pragma: no cover - optional dependency
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None
+
+# Sorted key order per distinct key tuple; reset rather than grown without bound.
+_MAX_KEY_ORDERS = 1024
+_key_orders: Dict[Tuple[Any, ...], Tuple[Tuple[Any, str], ...]] = {}
+
+
+def _hash_blake2b(data: bytes) -> str:
+    return "blake2b:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _hash_xxh3(data: bytes) -> str:
+    return "xxh3:" + xxhash.xxh3_128_hexdigest(data)
+
+
+def _get_hasher(algorithm: str) -> Callable[[bytes], str]:
+    if algorithm == "xxh3":
+        if xxhash is None:
+            raise ImproperlyConfigured(
+                "The 'xxh3' fingerprint algorithm requires the `xxhash` package."
+            )
+        return _hash_xxh3
+    return _hash_blake2b
+
+
+def _float_token(value: float, float_format: str) -> str:
+    # "%g" drops the fractional part of integral values, so `1.0` encodes
+    # like the int `1` (up to `float_precision` digits); nan/inf format as-is.
+    return "d" + format(value, float_format)
+
+
+def _key_order(keys: Tuple[Any, ...]) -> Tuple[Tuple[Any, str], ...]:
+    """Return `(key, encoded key prefix)` pairs in canonical (sorted) order."""
+    order = _key_orders.get(keys)
+    if order is None:
+        names = sorted(keys, key=str)
+        order = tuple((key, "k" + str(len(str(key))) + ":" + str(key)) for key in names)
+        if len(_key_orders) >= _MAX_KEY_ORDERS:
+            _key_orders.clear()
+        _key_orders[keys] = order
+    return order
+
+
+def _encode(value: Any, parts: List[str], float_format: str) -> None:
+    """
+    Append a canonical, unambiguous token stream for `value` to `parts`.
+
+    Strings are length-prefixed, dict keys are sorted, and floats are
+    normalized to `float_format`; the tokens are joined and hashed once,
+    which avoids building a `json.dumps(sort_keys=True)` document.
+    """
+    kind = type(value)
+    if kind is str:
+        parts.append("s" + str(len(value)) + ":" + value)
+    elif kind is float:
+        parts.append(_float_token(value, float_format))
+    elif kind is bool:
+        parts.append("T" if value else "F")
+    elif kind is int:
+        parts.append("d" + str(value))
+    elif value is None:
+        parts.append("n")
+    elif isinstance(value, Mapping):
+        parts.append("{")
+        for key, prefix in _key_order(tuple(value)):
+            parts.append(prefix)
+            _encode(value[key], parts, float_format)
+        parts.append("}")
+    elif isinstance(value, (list, tuple)):
+        parts.append("[")
+        for item in value:
+            _encode(item, parts, float_format)
+        parts.append("]")
+    elif isinstance(value, float):
+        parts.append(_float_token(float(value), float_format))
+    elif isinstance(value, int):
+        parts.append("d" + str(int(value)))
+    else:
+        text = str(value)
+        parts.append("o" + str(len(text)) + ":" + text)
+
+
+def _encode_column(values: List[Any], float_format: str) -> List[str]:
+    """Encode one feature across many rows, with fast paths for uniform columns."""
+    kinds = {type(value) for value in values}
+    if kinds == {float}:
+        return ["d" + token for token in map(format, values, repeat(float_format))]
+    if kinds == {str}:
+        return [f"s{len(value)}:{value}" for value in values]
+    if kinds == {int}:
+        return ["d" + token for token in map(str, values)]
+    encoded = []
+    for value in values:
+        parts: List[str] = []
+        _encode(value, parts, float_format)
+        encoded.append("".join(parts))
+    return encoded
+
+
+def compute_fingerprint(
+    features: Mapping[str, Any],
+    *,
+    algorithm: Optional[str] = None,
+    float_precision: Optional[int] = None,
+) -> str:
+    """
+    Return a stable fingerprint of `features`, e.g. `"blake2b:3f9c..."`.
+
+    Key order does not matter, floats are normalized to `float_precision`
+    significant digits, and integral floats hash like ints. Defaults come
+    from `ML_AUDIT_FINGERPRINT`.
+    """
+    config = get_fingerprint_config()
+    if float_precision is None:
+        float_precision = config.float_precision
+    float_format = f".{float_precision}g"
+    parts: List[str] = []
+    _encode(features, parts, float_format)
+    return _get_hasher(algorithm or config.algorithm)("".join(parts).encode("utf-8"))
+
+
+def fingerprint_many(
+    feature_dicts: Iterable[Mapping[str, Any]],
+    *,
+    algorithm: Optional[str] = None,
+    float_precision: Optional[int] = None,
+) -> List[str]:
+    """
+    Fingerprint many feature dicts at once; equivalent to `compute_fingerprint` per item.
+
+    Rows are grouped by key set and encoded column by column, so key sorting
+    and key encoding happen once per group and uniform columns (all floats,
+    all strings, ...) take a single comprehension instead of a call per value.
+    """
+    config = get_fingerprint_config()
+    if float_precision is None:
+        float_precision = config.float_precision
+    float_format = f".{float_precision}g"
+    hasher = _get_hasher(algorithm or config.algorithm)
+
+    rows = list(feature_dicts)
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for index, row in enumerate(rows):
+        groups.setdefault(tuple(row), []).append(index)
+
+    fingerprints: List[str] = [""] * len(rows)
+    for keys, indexes in groups.items():
+        if not keys:
+            # No columns to zip over; every empty dict encodes as "{}".
+            empty = hasher(b"{}")
+            for index in indexes:
+                fingerprints[index] = empty
+            continue
+        order = _key_order(keys)
+        columns = [
+            _encode_column([rows[i][key] for i in indexes], float_format)
+            for key, _ in order
+        ]
+        # Interleave each row's tokens with the shared key prefixes.
+        template = "{{%s}}" % "".join(
+            prefix.replace("{", "{{").replace("}", "}}") + "{}" for _, prefix in order
+        )
+        for index, tokens in zip(indexes, zip(*columns)):
+            fingerprints[index] = hasher(template.format(*tokens).encode("utf-8"))
+    return fingerprints
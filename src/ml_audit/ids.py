@@ -0,0 +1,74 @@
+"""
+Identifier generation for ml-audit rows.
+
+`new_id()` is the default for every ml-audit primary key and for generated
+`prediction_id`s. It returns random UUIDv4s unless
+`ML_AUDIT_ID_GENERATOR["ALGORITHM"]` is "uuid7", in which case keys are
+time-ordered UUIDv7s: consecutive inserts append to the right edge of the
+B-tree instead of splitting random pages.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from ml_audit.conf import get_id_generator_config
+
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Return a UUIDv7 (RFC 9562): a 48-bit Unix millisecond timestamp, a 12-bit
+    counter and 62 random bits.
+
+    Within a process the values are strictly increasing. The counter starts
+    at a random value in its lower half each millisecond; when it runs out,
+    or the clock steps back, the timestamp is carried forward by a
+    millisecond instead.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") >> 5  # 11 bits
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_ms += 1
+            _counter = 0
+        unix_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (unix_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_time(value: uuid.UUID) -> datetime:
+    """The creation time embedded in a UUIDv7."""
+    if value.version != 7:
+        raise ValueError(f"{value} is not a version 7 UUID.")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=dt_timezone.utc)
+
+
+def new_id() -> uuid.UUID:
+    """A new identifier from the configured `ML_AUDIT_ID_GENERATOR` algorithm."""
+    if get_id_generator_config().algorithm == "uuid7":
+        return uuid7()
+    return uuid.uuid4()
@@ -1,6 +1,8 @@
-from functools import wraps
+import inspect
+from functools import partial, wraps
 from typing import Any, Callable, Dict, Optional, Union
 from time import perf_counter
+from asgiref.sync import sync_to_async
 from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
@@ -17,8 +19,116 @@ except ImportError:  # pragma: no cover
     )
 
 
+from ml_audit.conf import (
+    get_async_recording_config,
+    get_explanation_cache_config,
+    get_explanation_workers_config,
+    get_fingerprint_config,
+    get_prediction_cache_config,
+)
+from ml_audit.fingerprint import compute_fingerprint
 from ml_audit.models import PredictionEvent, PredictionStatus
-from ml_audit.services import ActorPayload, attach_explanation, record_prediction_event
+from ml_audit.services import (
+    ActorPayload,
+    ExplanationKey,
+    aattach_explanation,
+    arecord_prediction_event,
+    attach_explanation,
+    explanation_key,
+    get_explanation_cache,
+    record_prediction_event,
+)
+from ml_audit.services.buffering import (
+    asubmit_explanation,
+    asubmit_prediction_event,
+    submit_explanation,
+    submit_prediction_event,
+)
+from ml_audit.services.explanation_pool import get_explanation_pool
+from ml_audit.services.prediction_cache import (
+    CachedPrediction,
+    PredictionKey,
+    get_prediction_cache,
+)
+
+
+def _queue_event(**event_kwargs: Any) -> PredictionEvent:
+    """
+    Queue an event for the background writer.
+
+    The returned event is an unsaved instance carrying the client-generated
+    `prediction_id`; it is written later by the writer thread.
+    """
+    return _queued_event(submit_prediction_event(**event_kwargs), event_kwargs)
+
+
+async def _aqueue_event(**event_kwargs: Any) -> PredictionEvent:
+    return _queued_event(await asubmit_prediction_event(**event_kwargs), event_kwargs)
+
+
+def _queued_event(prediction_id: str, event_kwargs: Dict[str, Any]) -> PredictionEvent:
+    return PredictionEvent(
+        prediction_id=prediction_id,
+        features=event_kwargs["features"],
+        output=event_kwargs["output"],
+        status=event_kwargs.get("status", PredictionStatus.SUCCESS),
+        environment=event_kwargs.get("environment") or "",
+    )
+
+
+def _record(use_buffer: bool, **event_kwargs: Any) -> PredictionEvent:
+    """Record synchronously, or queue for the background writer."""
+    if use_buffer:
+        return _queue_event(**event_kwargs)
+    return record_prediction_event(**event_kwargs)
+
+
+async def _arecord(use_buffer: bool, **event_kwargs: Any) -> PredictionEvent:
+    if use_buffer:
+        return await _aqueue_event(**event_kwargs)
+    return await arecord_prediction_event(**event_kwargs)
+
+
+def _attach(
+    use_buffer: bool, prediction_event: PredictionEvent, explanation_kwargs: Dict[str, Any]
+) -> None:
+    if use_buffer:
+        submit_explanation(
+            prediction_id=prediction_event.prediction_id, **explanation_kwargs
+        )
+    else:
+        attach_explanation(prediction=prediction_event, **explanation_kwargs)
+
+
+async def _aattach(
+    use_buffer: bool, prediction_event: PredictionEvent, explanation_kwargs: Dict[str, Any]
+) -> None:
+    if use_buffer:
+        await asubmit_explanation(
+            prediction_id=prediction_event.prediction_id, **explanation_kwargs
+        )
+    else:
+        await aattach_explanation(prediction=prediction_event, **explanation_kwargs)
+
+
+def _spooled(use_buffer: bool, prediction_event: PredictionEvent) -> bool:
+    # A direct write that returns an unsaved event was spooled (see
+    # `ML_AUDIT_SPOOL`); there is no row to attach an explanation to until
+    # the spool is replayed, so the explanation is skipped.
+    return not use_buffer and prediction_event._state.adding
+
+
+def _request_actor(request: Request) -> Optional[ActorPayload]:
+    user = getattr(request, "user", None)
+    if not (user and user.is_authenticated):
+        return None
+    return ActorPayload(
+        actor_type="user",
+        actor_id=str(user.id),
+        tenant_id=getattr(user, "tenant_id", None),
+        ip_address=request.META.get("REMOTE_ADDR"),
+        user_agent=request.META.get("HTTP_USER_AGENT"),
+    )
 
 
 def audited_prediction(
@@ -29,10 +139,41 @@ def audited_prediction(
     confidence_field: Optional[str] = None,
     explanation_builder: Optional[Callable] = None,
     decision_outcome_field: Optional[str] = None,
+    async_recording: Optional[bool] = None,
+    explanation_workers: Optional[bool] = None,
+    explanation_cache: Optional[bool] = None,
+    cache_predictions: Optional[bool] = None,
 ) -> Callable:
     """
     Decorator for DRF views that automatically records prediction events.
 
+    With `async_recording=True` (or `ML_AUDIT_ASYNC_RECORDING["ENABLED"]`)
+    events are queued for a background writer thread instead of being
+    written before the response is returned; the `prediction_id` in the
+    response is generated up front.
+
+    `async def` views are wrapped in an `async def` wrapper that records
+    through `arecord_prediction_event` / `aattach_explanation`; the
+    `explanation_builder` may then also be a coroutine function (a sync one
+    runs in a worker thread).
+
+    With `explanation_workers=True` (or `ML_AUDIT_EXPLANATION_WORKERS["ENABLED"]`)
+    the `explanation_builder` runs on a worker pool instead of the request
+    thread: a PENDING explanation is recorded and later replaced by the
+    result (SUCCESS) or the error/timeout (FAILED).
+
+    With `explanation_cache=True` (or `ML_AUDIT_EXPLANATION_CACHE["ENABLED"]`)
+    the builder is skipped when an explanation for the same model version
+    and input fingerprint is cached, and the cached payload is attached.
+
+    With `cache_predictions=True` (or `ML_AUDIT_PREDICTION_CACHE["ENABLED"]`)
+    an input already seen for this (deterministic) model version is answered
+    with the recorded output without calling the view; the hit is still
+    recorded as a new event with `metadata={"cached": True, "cached_from": ...}`.
+
+    Events that are spooled (`ML_AUDIT_SPOOL`) instead of written get no
+    explanation: the `explanation_builder` is not called for them.
+
     Usage:
 
     @audited_prediction(
@@ -46,80 +187,264 @@ def audited_prediction(
         return {"fraud_probability": 0.75, "is_fraud": True}
     """
 
+    def _use_buffer() -> bool:
+        if async_recording is not None:
+            return async_recording
+        return get_async_recording_config().enabled
+
+    def _use_workers() -> bool:
+        if explanation_workers is not None:
+            return explanation_workers
+        return get_explanation_workers_config().enabled
+
+    def _rejected_explanation_dropped() -> bool:
+        # A full worker queue either drops the explanation or builds it inline.
+        return get_explanation_workers_config().on_full == "drop"
+
+    def _failure_kwargs(request: Request, features, actor, latency) -> Dict[str, Any]:
+        return {
+            "model_name": model_name,
+            "model_version": model_version,
+            "environment": environment,
+            "features": features,
+            "status": PredictionStatus.FAILED,
+            "actor": actor,
+            "output": {"error": "exception"},
+            "trace_id": request.headers.get("X-Request-ID"),
+            "latency_ms": latency,
+        }
+
+    def _success_kwargs(
+        request: Request,
+        features,
+        actor,
+        output,
+        latency,
+        prediction_key: Optional[PredictionKey] = None,
+        cached: Optional[CachedPrediction] = None,
+    ) -> Dict[str, Any]:
+        confidence = output.get(confidence_field) if confidence_field else None
+        decision_outcome = (
+            output.get(decision_outcome_field) if decision_outcome_field else None
+        )
+        extra: Dict[str, Any] = {}
+        if prediction_key is not None and get_fingerprint_config().source == "raw":
+            extra["input_fingerprint"] = prediction_key[2]
+        if cached is not None:
+            extra["metadata"] = {"cached": True, "cached_from": cached.prediction_id}
+        return {
+            "model_name": model_name,
+            "model_version": model_version,
+            "environment": environment,
+            "features": features,
+            "confidence": confidence,
+            "decision_outcome": decision_outcome,
+            "status": PredictionStatus.SUCCESS,
+            "actor": actor,
+            "output": output,
+            "trace_id": request.headers.get("X-Request-ID"),
+            "latency_ms": latency,
+            **extra,
+        }
+
+    def _use_prediction_cache() -> bool:
+        if cache_predictions is not None:
+            return cache_predictions
+        return get_prediction_cache_config().enabled
+
+    def _prediction_cache_key(features) -> Optional[PredictionKey]:
+        if not _use_prediction_cache():
+            return None
+        return (model_name, model_version, compute_fingerprint(features))
+
+    def _explanation_kwargs(explanation_data) -> Dict[str, Any]:
+        return {
+            "method": "auto",
+            "payload": explanation_data["payload"],
+            "summary_text": explanation_data["summary"],
+        }
+
+    def _use_explanation_cache() -> bool:
+        if explanation_cache is not None:
+            return explanation_cache
+        return get_explanation_cache_config().enabled
+
+    def _explanation_cache_key(features, prediction_event) -> Optional[ExplanationKey]:
+        if not _use_explanation_cache():
+            return None
+        # Explanations depend on the raw inputs, so a stored fingerprint is
+        # only reused when it was computed from them.
+        fingerprint = ""
+        if get_fingerprint_config().source == "raw":
+            fingerprint = prediction_event.input_fingerprint
+        return explanation_key(
+            model_name=model_name,
+            model_version=model_version,
+            input_fingerprint=fingerprint or compute_fingerprint(features),
+            method="auto",
+        )
+
+    def _remembered_explanation_kwargs(cache_key, explanation_data) -> Dict[str, Any]:
+        explanation_kwargs = _explanation_kwargs(explanation_data)
+        get_explanation_cache().remember(cache_key, explanation_kwargs)
+        return explanation_kwargs
+
+    def _explain(features, output, prediction_event, use_buffer: bool) -> None:
+        if _spooled(use_buffer, prediction_event):
+            return
+        to_kwargs = _explanation_kwargs
+        cache_key = _explanation_cache_key(features, prediction_event)
+        if cache_key is not None:
+            cached = get_explanation_cache().lookup(cache_key)
+            if cached is not None:
+                _attach(use_buffer, prediction_event, {"method": "auto", **cached})
+                return
+            to_kwargs = partial(_remembered_explanation_kwargs, cache_key)
+
+        if _use_workers():
+            offloaded = get_explanation_pool().submit(
+                explanation_builder,
+                features,
+                output,
+                prediction_event,
+                to_kwargs=to_kwargs,
+                use_buffer=use_buffer,
+            ) or _rejected_explanation_dropped()
+            if offloaded:
+                return
+
+        explanation_data = explanation_builder(features, output, prediction_event)
+        _attach(use_buffer, prediction_event, to_kwargs(explanation_data))
+
+    async def _aexplain(features, output, prediction_event, use_buffer: bool) -> None:
+        if _spooled(use_buffer, prediction_event):
+            return
+        to_kwargs = _explanation_kwargs
+        cache_key = _explanation_cache_key(features, prediction_event)
+        if cache_key is not None:
+            cached = await get_explanation_cache().alookup(cache_key)
+            if cached is not None:
+                await _aattach(use_buffer, prediction_event, {"method": "auto", **cached})
+                return
+            to_kwargs = partial(_remembered_explanation_kwargs, cache_key)
+
+        if _use_workers():
+            offloaded = await get_explanation_pool().asubmit(
+                explanation_builder,
+                features,
+                output,
+                prediction_event,
+                to_kwargs=to_kwargs,
+                use_buffer=use_buffer,
+            ) or _rejected_explanation_dropped()
+            if offloaded:
+                return
+
+        if inspect.iscoroutinefunction(explanation_builder):
+            explanation_data = await explanation_builder(features, output, prediction_event)
+        else:
+            # A sync builder may block (model inference, ORM queries), so it
+            # runs in a worker thread rather than on the event loop.
+            explanation_data = await sync_to_async(explanation_builder)(
+                features, output, prediction_event
+            )
+            if inspect.isawaitable(explanation_data):
+                explanation_data = await explanation_data
+        await _aattach(use_buffer, prediction_event, to_kwargs(explanation_data))
+
     def decorator(view_func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(view_func):
+            return _async_decorator(view_func)
+
         @wraps(view_func)
         def wrapper(self, request: Request, *args: Any, **kwargs: Any) -> Response:
             features = getattr(request, "validated_data", request.data)
-
-            actor = None
-            user = getattr(request, "user", None)
-            if user and user.is_authenticated:
-                actor = ActorPayload(
-                    actor_type="user",
-                    actor_id=str(user.id),
-                    tenant_id=getattr(user, "tenant_id", None),
-                    ip_address=request.META.get("REMOTE_ADDR"),
-                    user_agent=request.META.get("HTTP_USER_AGENT"),
-                )
+            use_buffer = _use_buffer()
+            actor = _request_actor(request)
+            prediction_key = _prediction_cache_key(features)
 
             start = perf_counter()
 
-            try:
-                output = view_func(self, request, *args, **kwargs)
-                status_code = PredictionStatus.SUCCESS
-            except Exception:
-                latency = (perf_counter() - start) * 1000
-
-                record_prediction_event(
-                    model_name=model_name,
-                    model_version=model_version,
-                    environment=environment,
-                    features=features,
-                    status=PredictionStatus.FAILED,
-                    actor=actor,
-                    output={"error": "exception"},
-                    trace_id=request.headers.get("X-Request-ID"),
-                    latency_ms=latency,
-                )
-
-                raise  # Preserve original API behavior
+            cached = None
+            if prediction_key is not None:
+                cached = get_prediction_cache().lookup(prediction_key)
+            if cached is not None:
+                output = cached.output
+            else:
+                try:
+                    output = view_func(self, request, *args, **kwargs)
+                except Exception:
+                    latency = (perf_counter() - start) * 1000
+                    _record(
+                        use_buffer, **_failure_kwargs(request, features, actor, latency)
+                    )
+                    raise  # Preserve original API behavior
 
             latency = (perf_counter() - start) * 1000
 
-            decision = output.get(decision_field) if decision_field else None
-            confidence = output.get(confidence_field) if confidence_field else None
-            decision_outcome = (
-                output.get(decision_outcome_field) if decision_outcome_field else None
+            prediction_event = _record(
+                use_buffer,
+                **_success_kwargs(
+                    request, features, actor, output, latency, prediction_key, cached
+                ),
             )
+            if prediction_key is not None and cached is None:
+                get_prediction_cache().remember(
+                    prediction_key, output, prediction_event.prediction_id
+                )
 
-            prediction_event = record_prediction_event(
-                model_name=model_name,
-                model_version=model_version,
-                environment=environment,
-                features=features,
-                confidence=confidence,
-                decision_outcome=decision_outcome,
-                status=status_code,
-                actor=actor,
-                output=output,
-                trace_id=request.headers.get("X-Request-ID"),
-                latency_ms=latency,
-            )
+            if explanation_builder:
+                _explain(features, output, prediction_event, use_buffer)
 
-            if explanation_builder and status_code == PredictionStatus.SUCCESS:
-                explanation_data = explanation_builder(
-                    features, output, prediction_event
-                )
+            response_data = {**output, "prediction_id": prediction_event.prediction_id}
+
+            return Response(response_data, status=status.HTTP_200_OK)
+        return wrapper
+
+    def _async_decorator(view_func: Callable) -> Callable:
+        @wraps(view_func)
+        async def wrapper(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+            features = getattr(request, "validated_data", request.data)
+            use_buffer = _use_buffer()
+            actor = _request_actor(request)
+            prediction_key = _prediction_cache_key(features)
 
-                attach_explanation(
-                    prediction=prediction_event,
-                    method="auto",
-                    payload=explanation_data["payload"],
-                    summary_text=explanation_data["summary"],
+            start = perf_counter()
+
+            cached = None
+            if prediction_key is not None:
+                cached = await get_prediction_cache().alookup(prediction_key)
+            if cached is not None:
+                output = cached.output
+            else:
+                try:
+                    output = await view_func(self, request, *args, **kwargs)
+                except Exception:
+                    latency = (perf_counter() - start) * 1000
+                    await _arecord(
+                        use_buffer, **_failure_kwargs(request, features, actor, latency)
+                    )
+                    raise  # Preserve original API behavior
+
+            latency = (perf_counter() - start) * 1000
+
+            prediction_event = await _arecord(
+                use_buffer,
+                **_success_kwargs(
+                    request, features, actor, output, latency, prediction_key, cached
+                ),
+            )
+            if prediction_key is not None and cached is None:
+                get_prediction_cache().remember(
+                    prediction_key, output, prediction_event.prediction_id
                 )
 
+            if explanation_builder:
+                await _aexplain(features, output, prediction_event, use_buffer)
+
             response_data = {**output, "prediction_id": prediction_event.prediction_id}
 
             return Response(response_data, status=status.HTTP_200_OK)
         return wrapper
-    return decorator
\ No newline at end of file
+
+    return decorator
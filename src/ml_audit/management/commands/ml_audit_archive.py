@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ml_audit.archive import verify_archive
+from ml_audit.services.archiving import archive_events
+
+
+class Command(BaseCommand):
+    help = "Export old prediction events to archive segments and detach their partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            help="Archive events older than N days (whole partitions on a partitioned table).",
+        )
+        parser.add_argument(
+            "--directory",
+            help="Archive directory (defaults to ML_AUDIT_ARCHIVE['DIRECTORY']).",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["auto", "parquet", "native"],
+            help="Segment format (defaults to ML_AUDIT_ARCHIVE['FORMAT']).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep archived partitions attached.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop archived partitions instead of only detaching them.",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Check every segment in the manifest against its checksum and exit.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["verify"]:
+                problems = verify_archive(options["directory"])
+                for problem in problems:
+                    self.stderr.write(problem)
+                if problems:
+                    raise CommandError(f"{len(problems)} archive segment(s) failed verification.")
+                self.stdout.write(self.style.SUCCESS("All archive segments verified."))
+                return
+
+            if options["older_than"] is None:
+                raise CommandError("--older-than DAYS is required.")
+            stats = archive_events(
+                timezone.now() - timedelta(days=options["older_than"]),
+                detach=not options["keep"],
+                drop=options["drop"],
+                directory=options["directory"],
+                archive_format=options["format"],
+            )
+        except (ImproperlyConfigured, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {stats.events} event(s) into {stats.segments} segment(s)"
+                + (f"; partitions: {', '.join(stats.partitions)}." if stats.partitions else ".")
+            )
+        )
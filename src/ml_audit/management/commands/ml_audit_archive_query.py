@@ -0,0 +1,47 @@
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
+
+from ml_audit.archive import query_archive
+
+
+def _datetime(value: str):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Invalid ISO datetime: {value!r}")
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Query archived prediction events; prints one JSON object per line."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="time_from", type=_datetime)
+        parser.add_argument("--to", dest="time_to", type=_datetime)
+        parser.add_argument("--model-name")
+        parser.add_argument("--model-version")
+        parser.add_argument("--prediction-id")
+        parser.add_argument("--limit", type=int)
+        parser.add_argument(
+            "--directory",
+            help="Archive directory (defaults to ML_AUDIT_ARCHIVE['DIRECTORY']).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            records = query_archive(
+                time_from=options["time_from"],
+                time_to=options["time_to"],
+                model_name=options["model_name"],
+                model_version=options["model_version"],
+                prediction_id=options["prediction_id"],
+                limit=options["limit"],
+                directory=options["directory"],
+            )
+            for record in records:
+                self.stdout.write(json.dumps(record, cls=DjangoJSONEncoder))
+        except (ImproperlyConfigured, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
@@ -0,0 +1,63 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+from django.db.models import BinaryField
+from django.db.models.functions import Cast
+
+from ml_audit.db import json_column_is_binary
+from ml_audit.fields import CompressedJSONField, decompress, is_compressed
+
+
+class Command(BaseCommand):
+    help = "Report the compression ratio achieved on ml-audit's compressed JSON columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=None,
+            help="Only inspect the most recent N rows per model.",
+        )
+
+    def handle(self, *args, **options):
+        for model in apps.get_app_config("ml_audit").get_models():
+            fields = [
+                field
+                for field in model._meta.get_fields()
+                if isinstance(field, CompressedJSONField)
+            ]
+            if not fields:
+                continue
+            connection = connections[router.db_for_read(model)]
+            if not all(json_column_is_binary(connection, model, field) for field in fields):
+                self.stdout.write(
+                    f"{model._meta.label}: native JSON columns, not compressed "
+                    "(see ml_audit_convert_json_columns)."
+                )
+                continue
+            fields = [field.name for field in fields]
+
+            # Cast to a plain binary field so rows come back as stored, not decoded.
+            qs = model._default_manager.order_by("-created_at").values_list(
+                *(Cast(name, BinaryField()) for name in fields)
+            )
+            if options["sample"]:
+                qs = qs[: options["sample"]]
+
+            rows = compressed = stored = raw = 0
+            for values in qs.iterator(chunk_size=500):
+                rows += 1
+                for value in values:
+                    if value is None:
+                        continue
+                    data = bytes(value)
+                    stored += len(data)
+                    raw += len(decompress(data))
+                    compressed += is_compressed(data)
+
+            ratio = raw / stored if stored else 1.0
+            self.stdout.write(
+                f"{model._meta.label} ({', '.join(fields)}): {rows} row(s), "
+                f"{compressed} compressed value(s), {raw} -> {stored} bytes, "
+                f"ratio {ratio:.2f}x"
+            )
@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections, router
+
+from ml_audit.conf import get_compression_config
+from ml_audit.db import convert_json_columns
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert ml-audit's JSON columns to match ML_AUDIT_COMPRESSION['ENABLED']: "
+        "binary columns when compression is on, native JSON columns when it is off."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Database alias (defaults to the router's write database for each model).",
+        )
+
+    def handle(self, *args, **options):
+        binary = get_compression_config().enabled
+        kind = "binary" if binary else "native JSON"
+        converted = 0
+        for model in apps.get_app_config("ml_audit").get_models():
+            using = options["database"] or router.db_for_write(model)
+            if not router.allow_migrate_model(using, model):
+                continue
+            with connections[using].schema_editor() as schema_editor:
+                fields = convert_json_columns(schema_editor, model, binary=binary)
+            if fields:
+                converted += len(fields)
+                self.stdout.write(
+                    f"{model._meta.label}: converted {', '.join(fields)} to {kind} columns."
+                )
+        if not converted:
+            self.stdout.write(f"All JSON columns are already {kind} columns.")
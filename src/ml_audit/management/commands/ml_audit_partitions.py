@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from ml_audit.archive import load_manifest
+from ml_audit.conf import get_partitioning_config
+from ml_audit.models import PredictionEvent
+from ml_audit.partitioning import (
+    create_partitions,
+    expired_partitions,
+    is_partitioned,
+    list_partitions,
+    next_period,
+    partition_prediction_events,
+    partition_ranges,
+    period_start,
+)
+from ml_audit.services.archiving import remove_partition
+
+
+class Command(BaseCommand):
+    help = "Manage the PostgreSQL range partitions of the PredictionEvent table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "operation",
+            nargs="?",
+            default="list",
+            choices=["list", "create", "detach", "convert"],
+            help="list partitions (default), create upcoming ones, detach old "
+            "ones, or convert an existing single table.",
+        )
+        parser.add_argument(
+            "--database",
+            help="Database alias (defaults to the router's write database for PredictionEvent).",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=None,
+            help="create: number of future periods to pre-create "
+            "(defaults to ML_AUDIT_PARTITIONING['PREMAKE']).",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=None,
+            help="detach: detach archived partitions whose range ended more than N days ago.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="detach: also drop the detached partition tables.",
+        )
+        parser.add_argument(
+            "--directory",
+            help="detach: archive directory whose manifest must list the partitions "
+            "(defaults to ML_AUDIT_ARCHIVE['DIRECTORY']).",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"] or router.db_for_write(PredictionEvent)
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            raise CommandError("PredictionEvent partitioning requires PostgreSQL.")
+
+        operation = options["operation"]
+        config = get_partitioning_config()
+        if operation == "convert":
+            with transaction.atomic(using=using):
+                converted = partition_prediction_events(
+                    connection, interval=config.interval, premake=config.premake
+                )
+            self.stdout.write(
+                self.style.SUCCESS("Converted PredictionEvent to a partitioned table.")
+                if converted
+                else "PredictionEvent is already partitioned."
+            )
+            return
+
+        if not is_partitioned(using):
+            raise CommandError(
+                "PredictionEvent is not partitioned; run `ml_audit_partitions convert` first."
+            )
+
+        if operation == "create":
+            ahead = config.premake if options["ahead"] is None else options["ahead"]
+            last = period_start(timezone.now().date(), config.interval)
+            for _ in range(ahead):
+                last = next_period(last, config.interval)
+            with transaction.atomic(using=using):
+                created = create_partitions(
+                    connection,
+                    partition_ranges(timezone.now().date(), last, config.interval),
+                )
+            for name in created:
+                self.stdout.write(f"Created {name}")
+            self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partition(s)."))
+        elif operation == "detach":
+            if options["older_than"] is None:
+                raise CommandError("detach requires --older-than DAYS.")
+            before = timezone.now() - timedelta(days=options["older_than"])
+            try:
+                manifest = load_manifest(options["directory"])
+            except (ImproperlyConfigured, ValueError) as exc:
+                raise CommandError(str(exc)) from exc
+            with connection.cursor() as cursor:
+                expired = expired_partitions(cursor, before)
+            archived = manifest.sources()
+            unarchived = [
+                partition.name for partition in expired if partition.name not in archived
+            ]
+            if unarchived:
+                # Detaching removes the events' explanations, and dropping the events.
+                raise CommandError(
+                    f"Partitions not in the archive manifest: {', '.join(unarchived)}. "
+                    "Export them with `ml_audit_archive` first."
+                )
+            for partition in expired:
+                remove_partition(
+                    connection,
+                    partition,
+                    drop=options["drop"],
+                    manifest=manifest,
+                    directory=options["directory"],
+                )
+                self.stdout.write(
+                    f"{'Dropped' if options['drop'] else 'Detached'} {partition.name}"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Detached {len(expired)} partition(s)."))
+        else:
+            with connection.cursor() as cursor:
+                partitions = list_partitions(cursor)
+            for partition in partitions:
+                if partition.is_default:
+                    self.stdout.write(f"{partition.name}: DEFAULT")
+                else:
+                    self.stdout.write(
+                        f"{partition.name}: {partition.start.isoformat()} -> "
+                        f"{partition.end.isoformat()}"
+                    )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_audit.services.replay import replay_spool
+
+
+class Command(BaseCommand):
+    help = "Write events from the local ml-audit spool into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory",
+            help="Spool directory (defaults to ML_AUDIT_SPOOL['DIRECTORY']).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--include-open",
+            action="store_true",
+            help="Also replay unsealed segments left behind by processes that are no longer running.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep segment files after replaying them.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            stats = replay_spool(
+                options["directory"],
+                batch_size=options["batch_size"],
+                include_open=options["include_open"],
+                keep_segments=options["keep"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {stats.segments} segment(s): "
+                f"{stats.created} created, {stats.duplicates} duplicate(s)."
+            )
+        )
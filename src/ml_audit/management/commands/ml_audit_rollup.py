@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_audit.conf import get_rollup_config
+from ml_audit.services.rollups import rebuild_rollups, update_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold newly recorded prediction events into the hourly PredictionRollup table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Delete all rollups and recompute them from the stored events.",
+        )
+        parser.add_argument(
+            "--lag",
+            type=int,
+            default=None,
+            help="Skip events written in the last N seconds "
+            "(defaults to ML_AUDIT_ROLLUP['LAG']).",
+        )
+        parser.add_argument(
+            "--step-hours",
+            type=int,
+            default=24,
+            help="Hours of recorded events aggregated per transaction (default: 24).",
+        )
+        parser.add_argument(
+            "--database",
+            help="Database alias (defaults to the router's write database for PredictionRollup).",
+        )
+
+    def handle(self, *args, **options):
+        if options["step_hours"] < 1:
+            raise CommandError("--step-hours must be a positive integer.")
+        kwargs = {
+            "lag": options["lag"],
+            "step": timedelta(hours=options["step_hours"]),
+            "using": options["database"],
+        }
+        if get_rollup_config().inline:
+            if not options["rebuild"]:
+                raise CommandError(
+                    "Rollups are maintained inline (ML_AUDIT_ROLLUP['INLINE']); "
+                    "use --rebuild to recompute them."
+                )
+
+        run = (rebuild_rollups if options["rebuild"] else update_rollups)(**kwargs)
+
+        if run.position is None:
+            self.stdout.write("No prediction events to roll up.")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {run.windows} window(s) into {run.buckets} bucket update(s); "
+                f"watermark at {run.position.isoformat()}."
+            )
+        )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import math
+
+from ml_audit.conf import get_database_config
+from ml_audit.routers import last_write
+
+
+class AuditReadStickinessMiddleware:
+    """
+    Carry read-your-writes stickiness (`ML_AUDIT_DATABASES["STICKY"]`) across requests.
+
+    A request that writes ml-audit rows sets a short-lived cookie; the
+    client's following requests read from the write database until it
+    expires, instead of from a replica that may not have caught up. Each
+    request starts from its own cookie, never from an earlier request
+    served by the same thread.
+    """
+
+    cookie_name = "ml_audit_last_write"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            previous = float(request.COOKIES.get(self.cookie_name, 0.0))
+        except ValueError:
+            previous = 0.0
+        token = last_write.set(previous)
+        try:
+            response = self.get_response(request)
+            written = last_write.get()
+        finally:
+            last_write.reset(token)
+
+        sticky = get_database_config().sticky
+        if sticky and written > previous:
+            response.set_cookie(
+                self.cookie_name,
+                repr(written),
+                max_age=math.ceil(sticky),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
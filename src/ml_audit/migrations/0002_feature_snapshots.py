@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(help_text='Content fingerprint of the redacted features.', max_length=255, unique=True)),
+                ('features', models.JSONField(help_text='Redacted snapshot of model-ready features.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='features',
+            field=models.JSONField(blank=True, help_text='Redacted snapshot of model-ready features used for this prediction. Empty when the features are stored in `feature_snapshot`.', null=True),
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='feature_snapshot',
+            field=models.ForeignKey(blank=True, help_text='Shared feature payload, when ML_AUDIT_FEATURE_STORAGE uses snapshots.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='prediction_events', to='ml_audit.featuresnapshot'),
+        ),
+    ]
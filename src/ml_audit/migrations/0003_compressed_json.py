@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:02
+
+import ml_audit.db
+import ml_audit.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0002_feature_snapshots'),
+    ]
+
+    operations = [
+        ml_audit.db.AlterFieldToCompressedJSON(
+            model_name='explanation',
+            name='payload',
+            field=ml_audit.fields.CompressedJSONField(help_text='Structured explanation payload (feature attributions etc.).'),
+        ),
+        ml_audit.db.AlterFieldToCompressedJSON(
+            model_name='featuresnapshot',
+            name='features',
+            field=ml_audit.fields.CompressedJSONField(help_text='Redacted snapshot of model-ready features.'),
+        ),
+        ml_audit.db.AlterFieldToCompressedJSON(
+            model_name='predictionevent',
+            name='features',
+            field=ml_audit.fields.CompressedJSONField(blank=True, help_text='Redacted snapshot of model-ready features used for this prediction. Empty when the features are stored in `feature_snapshot`.', null=True),
+        ),
+        ml_audit.db.AlterFieldToCompressedJSON(
+            model_name='predictionevent',
+            name='metadata',
+            field=ml_audit.fields.CompressedJSONField(blank=True, help_text='Additional metadata about the prediction.', null=True),
+        ),
+        ml_audit.db.AlterFieldToCompressedJSON(
+            model_name='predictionevent',
+            name='output',
+            field=ml_audit.fields.CompressedJSONField(blank=True, db_index=True, help_text='Model output (e.g. prediction, score, probabilities).', null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:04
+
+import ml_audit.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0003_compressed_json'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='explanation',
+            name='packed_attributions',
+            field=models.BinaryField(blank=True, help_text='Per-feature attribution values packed as float32/float16 (see ml_audit.attributions).', null=True),
+        ),
+        migrations.AddField(
+            model_name='modelversion',
+            name='feature_names',
+            field=ml_audit.fields.CompressedJSONField(blank=True, help_text='Ordered feature names, used to expand packed explanation attributions.', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0004_packed_attributions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='explanation',
+            name='status',
+            field=models.CharField(choices=[('success', 'Success'), ('failed', 'Failed'), ('partial', 'Partial'), ('pending', 'Pending')], default='success', help_text='Status of the explanation generation.', max_length=32),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+from ml_audit.conf import get_partitioning_config
+from ml_audit.partitioning import (
+    partition_prediction_events,
+    unpartition_prediction_events,
+)
+
+
+def _partitioning_enabled(schema_editor) -> bool:
+    return (
+        schema_editor.connection.vendor == "postgresql"
+        and get_partitioning_config().enabled
+    )
+
+
+def partition(apps, schema_editor):
+    if not _partitioning_enabled(schema_editor):
+        return
+    config = get_partitioning_config()
+    partition_prediction_events(
+        schema_editor.connection, interval=config.interval, premake=config.premake
+    )
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    PredictionEvent = apps.get_model("ml_audit", "PredictionEvent")
+    referencing = [
+        (field.model._meta.db_table, field.column)
+        for field in (rel.field for rel in PredictionEvent._meta.related_objects)
+        if not field.many_to_many and field.db_constraint
+    ]
+    unpartition_prediction_events(schema_editor.connection, referencing)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0005_explanation_pending_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
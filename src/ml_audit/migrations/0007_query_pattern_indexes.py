@@ -0,0 +1,171 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:20
+
+import django.db.models.deletion
+import django.utils.timezone
+import ml_audit.fields
+from django.db import migrations, models
+
+BRIN_INDEX = "ml_audit_pe_ts_brin"
+
+
+def create_brin_index(apps, schema_editor):
+    # Events are appended roughly in timestamp order, so a BRIN index covers
+    # time-range scans at a fraction of a B-tree's size and insert cost.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("ml_audit", "PredictionEvent")._meta.db_table
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {BRIN_INDEX} ON {schema_editor.quote_name(table)} '
+        'USING brin ("timestamp")'
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {BRIN_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0006_partitioned_prediction_events'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='explanation',
+            name='ml_audit_ex_status_f07b79_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='modelversion',
+            name='ml_audit_mo_model_n_4bf050_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pr_timesta_3b52b1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pr_decisio_c16462_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pr_status_acb91b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pr_environ_30af0b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='requestingactor',
+            name='ml_audit_re_tenant__f6ee55_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='predictionevent',
+            new_name='ml_audit_pe_confidence',
+            old_name='ml_audit_pr_confide_d075b1_idx',
+        ),
+        migrations.AlterField(
+            model_name='modelversion',
+            name='model_name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='modelversion',
+            name='version',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='actor',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='prediction_events', to='ml_audit.requestingactor'),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='confidence',
+            field=models.FloatField(blank=True, help_text='Optional canonical confidence / probability score for the main outcome.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='environment',
+            field=models.CharField(blank=True, default='', help_text="Environment where the prediction was made (e.g. 'production', 'staging').", max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='input_fingerprint',
+            field=models.CharField(blank=True, default='', help_text='Fingerprint of the input features (e.g. hash) for detecting data drift.', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='model',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='prediction_events', to='ml_audit.modelversion'),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='output',
+            field=ml_audit.fields.CompressedJSONField(blank=True, help_text='Model output (e.g. prediction, score, probabilities).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='prediction_id',
+            field=models.CharField(help_text='Stable external identifier for this prediction event.', max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='status',
+            field=models.CharField(choices=[('success', 'Success'), ('failed', 'Failed'), ('partial', 'Partial')], default='success', help_text='Overall status of the prediction attempt.', max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the prediction was made (UTC).'),
+        ),
+        migrations.AlterField(
+            model_name='predictionevent',
+            name='trace_id',
+            field=models.CharField(blank=True, default='', help_text='Optional correlation ID for tracing across services.', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='requestingactor',
+            name='actor_type',
+            field=models.CharField(choices=[('user', 'User'), ('service', 'Service'), ('api_key', 'Api Key'), ('job', 'Job'), ('other', 'Other')], max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='explanation',
+            index=models.Index(condition=models.Q(('status', 'success'), _negated=True), fields=['status'], name='ml_audit_expl_unsuccessful'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['-timestamp'], name='ml_audit_pe_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['model', '-timestamp'], name='ml_audit_pe_model_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['actor', '-timestamp'], name='ml_audit_pe_actor_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['environment', '-timestamp'], name='ml_audit_pe_env_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['decision_outcome', '-timestamp'], name='ml_audit_pe_outcome_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('status', 'success'), _negated=True), fields=['status', '-timestamp'], name='ml_audit_pe_unsuccessful_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('trace_id', ''), _negated=True), fields=['trace_id'], name='ml_audit_pe_trace_id'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('input_fingerprint', ''), _negated=True), fields=['model', 'input_fingerprint'], name='ml_audit_pe_model_fp'),
+        ),
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0007_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pe_model_ts',
+        ),
+        migrations.RemoveIndex(
+            model_name='predictionevent',
+            name='ml_audit_pe_actor_ts',
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='actor_external_id',
+            field=models.CharField(blank=True, default='', help_text="The requesting actor's `actor_id` (the `actor_id` column is the foreign key).", max_length=255),
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='actor_type',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='model_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='model_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='predictionevent',
+            name='tenant_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
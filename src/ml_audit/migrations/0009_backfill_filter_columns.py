@@ -0,0 +1,64 @@
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def backfill(apps, schema_editor):
+    """Copy model and actor identity onto existing events, one transaction per batch."""
+    using = schema_editor.connection.alias
+    PredictionEvent = apps.get_model("ml_audit", "PredictionEvent")
+    model = apps.get_model("ml_audit", "ModelVersion").objects.using(using).filter(
+        pk=OuterRef("model_id")
+    )
+    actor = apps.get_model("ml_audit", "RequestingActor").objects.using(using).filter(
+        pk=OuterRef("actor_id")
+    )
+    events = PredictionEvent.objects.using(using)
+    pending = events.filter(model_name="").order_by("pk")
+    while True:
+        ids = list(pending.values_list("pk", flat=True)[:BATCH_SIZE])
+        if not ids:
+            break
+        with transaction.atomic(using=using):
+            events.filter(pk__in=ids).update(
+                model_name=Subquery(model.values("model_name")[:1]),
+                model_version=Subquery(model.values("version")[:1]),
+            )
+            events.filter(pk__in=ids, actor__isnull=False).update(
+                actor_type=Subquery(actor.values("actor_type")[:1]),
+                actor_external_id=Subquery(actor.values("actor_id")[:1]),
+                tenant_id=Subquery(actor.values("tenant_id")[:1]),
+            )
+        pending = pending.filter(pk__gt=ids[-1])
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch commits on its own instead of holding one long
+    # transaction over the whole table.
+    atomic = False
+
+    dependencies = [
+        ('ml_audit', '0008_denormalized_filter_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        # Built after the backfill so it is not slowed by index maintenance.
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['model_name', '-timestamp'], name='ml_audit_pe_model_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['model_name', 'model_version', '-timestamp'], name='ml_audit_pe_model_version_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('tenant_id', ''), _negated=True), fields=['tenant_id', '-timestamp'], name='ml_audit_pe_tenant_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('actor_external_id', ''), _negated=True), fields=['actor_external_id', '-timestamp'], name='ml_audit_pe_actor_ts'),
+        ),
+    ]
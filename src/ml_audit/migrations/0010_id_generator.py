@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:24
+
+import ml_audit.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0009_backfill_filter_columns'),
+    ]
+
+    # Only the Python-side default changes; skip SQLite's table rebuilds.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='explanation',
+                    name='id',
+                    field=models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='featuresnapshot',
+                    name='id',
+                    field=models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='modelversion',
+                    name='id',
+                    field=models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='predictionevent',
+                    name='id',
+                    field=models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='requestingactor',
+                    name='id',
+                    field=models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:27
+
+import ml_audit.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0010_id_generator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionRollup',
+            fields=[
+                ('id', models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField(help_text='Start of the hour (UTC).')),
+                ('model_name', models.CharField(max_length=255)),
+                ('model_version', models.CharField(max_length=64)),
+                ('environment', models.CharField(blank=True, default='', max_length=64)),
+                ('tenant_id', models.CharField(blank=True, default='', max_length=255)),
+                ('event_count', models.BigIntegerField(default=0)),
+                ('failed_count', models.BigIntegerField(default=0)),
+                ('partial_count', models.BigIntegerField(default=0)),
+                ('outcome_counts', models.JSONField(default=dict, help_text='Event count per `decision_outcome`.')),
+                ('latency_sum', models.FloatField(default=0.0)),
+                ('latency_count', models.BigIntegerField(default=0)),
+                ('latency_max', models.FloatField(blank=True, null=True)),
+                ('confidence_sum', models.FloatField(default=0.0)),
+                ('confidence_count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('position', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['created_at'], name='ml_audit_pe_created'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionrollup',
+            index=models.Index(fields=['model_name', 'model_version', '-bucket'], name='ml_audit_rollup_model'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionrollup',
+            index=models.Index(condition=models.Q(('tenant_id', ''), _negated=True), fields=['tenant_id', '-bucket'], name='ml_audit_rollup_tenant'),
+        ),
+        migrations.AddConstraint(
+            model_name='predictionrollup',
+            constraint=models.UniqueConstraint(fields=('bucket', 'model_name', 'model_version', 'environment', 'tenant_id'), name='ml_audit_rollup_key'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:29
+
+import ml_audit.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0011_prediction_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuantileSketch',
+            fields=[
+                ('id', models.UUIDField(default=ml_audit.ids.new_id, editable=False, primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField(help_text='Start of the hour (UTC).')),
+                ('model_name', models.CharField(max_length=255)),
+                ('model_version', models.CharField(max_length=64)),
+                ('metric', models.CharField(choices=[('latency_ms', 'Latency Ms'), ('confidence', 'Confidence')], max_length=32)),
+                ('count', models.BigIntegerField(default=0)),
+                ('sketch', models.JSONField(help_text='Serialized DDSketch (`DDSketch.to_dict()`).')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model_name', 'model_version', 'metric', 'bucket'), name='ml_audit_sketch_key')],
+            },
+        ),
+    ]
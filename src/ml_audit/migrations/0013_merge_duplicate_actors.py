@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:59
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def merge_duplicate_actors(apps, schema_editor):
+    """Point events at the oldest of each set of identical actors and delete the rest."""
+    using = schema_editor.connection.alias
+    RequestingActor = apps.get_model("ml_audit", "RequestingActor")
+    PredictionEvent = apps.get_model("ml_audit", "PredictionEvent")
+    actors = RequestingActor.objects.using(using)
+    duplicated = (
+        actors.values("actor_type", "actor_id", "tenant_id")
+        .annotate(copies=Count("pk"))
+        .filter(copies__gt=1)
+        .order_by()
+    )
+    for identity in duplicated.iterator():
+        del identity["copies"]
+        keep, *extra = actors.filter(**identity).order_by("created_at", "pk").values_list(
+            "pk", flat=True
+        )
+        PredictionEvent.objects.using(using).filter(actor_id__in=extra).update(actor_id=keep)
+        actors.filter(pk__in=extra).delete()
+
+
+class Migration(migrations.Migration):
+    # The constraint is added by 0014: on PostgreSQL the foreign key triggers
+    # fired by these updates and deletes must be committed before the
+    # actor table can be altered.
+
+    dependencies = [
+        ('ml_audit', '0012_quantile_sketches'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_actors, migrations.RunPython.noop),
+    ]
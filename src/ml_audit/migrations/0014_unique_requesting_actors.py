@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0013_merge_duplicate_actors'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='requestingactor',
+            constraint=models.UniqueConstraint(fields=('actor_type', 'actor_id', 'tenant_id'), name='ml_audit_actor_key'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_audit', '0014_unique_requesting_actors'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(fields=['model', '-timestamp'], name='ml_audit_pe_model_fk_ts'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionevent',
+            index=models.Index(condition=models.Q(('actor__isnull', False)), fields=['actor', '-timestamp'], name='ml_audit_pe_actor_fk_ts'),
+        ),
+    ]
@@ -1,9 +1,14 @@
-import uuid
+from typing import Optional
 
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from ml_audit.attributions import expand_attributions
+from ml_audit.fields import CompressedJSONField
+from ml_audit.ids import new_id
+from ml_audit.sketches import DDSketch
+
 
 class FrameworkChoice(models.TextChoices):
     SKLEARN = "sklearn"
@@ -26,14 +31,21 @@ class PredictionStatus(models.TextChoices):
     PARTIAL = "partial"
 
 
+class ExplanationStatus(models.TextChoices):
+    SUCCESS = "success"
+    FAILED = "failed"
+    PARTIAL = "partial"
+    PENDING = "pending"
+
+
 class ModelVersion(models.Model):
     """
     Logical Model + Specific version used for prediction.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    model_name = models.CharField(max_length=255, db_index=True)
-    version = models.CharField(max_length=64, db_index=True)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
+    model_name = models.CharField(max_length=255)
+    version = models.CharField(max_length=64)
     framework = models.CharField(
         max_length=32, choices=FrameworkChoice.choices, default=FrameworkChoice.SKLEARN
     )
@@ -54,15 +66,18 @@ class ModelVersion(models.Model):
         null=True,
         help_text="Optional JSON snapshot of key model configuration.",
     )
+    feature_names = CompressedJSONField(
+        blank=True,
+        null=True,
+        help_text="Ordered feature names, used to expand packed explanation attributions.",
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        # The unique constraint's index also serves lookups by model_name alone.
         unique_together = ("model_name", "version")
-        indexes = [
-            models.Index(fields=["model_name", "version"]),
-        ]
 
     def __str__(self):
         return f"{self.model_name}: v{self.version}"
@@ -73,11 +88,10 @@ class RequestingActor(models.Model):
     Who/what requested a prediction (user, service, API client, etc.).
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     actor_type = models.CharField(
         max_length=32,
         choices=ActorTypeChoice.choices,
-        db_index=True,
     )
     actor_id = models.CharField(
         max_length=255,
@@ -102,9 +116,14 @@ class RequestingActor(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["actor_type", "actor_id", "tenant_id"],
+                name="ml_audit_actor_key",
+            ),
+        ]
         indexes = [
             models.Index(fields=["actor_type", "actor_id"]),
-            models.Index(fields=["tenant_id"]),
         ]
 
     def __str__(self) -> str:
@@ -113,41 +132,66 @@ class RequestingActor(models.Model):
         return f"{self.actor_type}:{self.actor_id}"
 
 
+class FeatureSnapshot(models.Model):
+    """
+    Redacted feature payload stored once and shared by every event with the same content.
+    """
+
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
+    fingerprint = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Content fingerprint of the redacted features.",
+    )
+    features = CompressedJSONField(
+        help_text="Redacted snapshot of model-ready features."
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.fingerprint
+
+    def save(self, *args, **kwargs):
+        if self.pk and not kwargs.get('force_insert', False):
+            raise ValidationError("FeatureSnapshot updates are not allowed.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("FeatureSnapshot deletion is not allowed.")
+
+
 class PredictionEvent(models.Model):
     """
     One prediction call to a model: inputs (redacted), outputs, metadata.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     prediction_id = models.CharField(
         max_length=255,
         unique=True,
-        db_index=True,
         help_text="Stable external identifier for this prediction event.",
     )
     timestamp = models.DateTimeField(
         default=timezone.now,
-        db_index=True,
         help_text="When the prediction was made (UTC).",
     )
     trace_id = models.CharField(
         max_length=255,
         blank=True,
         default="",
-        db_index=True,
         help_text="Optional correlation ID for tracing across services.",
     )
     environment = models.CharField(
         max_length=64,
         blank=True,
         default="",
-        db_index=True,
         help_text="Environment where the prediction was made (e.g. 'production', 'staging').",
     )
     model = models.ForeignKey(
         ModelVersion,
         on_delete=models.PROTECT,
         related_name="prediction_events",
+        db_index=False,
     )
     actor = models.ForeignKey(
         RequestingActor,
@@ -155,27 +199,48 @@ class PredictionEvent(models.Model):
         blank=True,
         null=True,
         related_name="prediction_events",
+        db_index=False,
+    )
+    # Copies of the model and actor identity, set when the event is written,
+    # so list filters need no join. Events are immutable, so they never drift.
+    model_name = models.CharField(max_length=255, blank=True, default="")
+    model_version = models.CharField(max_length=64, blank=True, default="")
+    actor_type = models.CharField(max_length=32, blank=True, default="")
+    actor_external_id = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="The requesting actor's `actor_id` (the `actor_id` column is the foreign key).",
     )
-    features = models.JSONField(
-        help_text="Redacted snapshot of model-ready features used for this prediction."
+    tenant_id = models.CharField(max_length=255, blank=True, default="")
+    features = CompressedJSONField(
+        blank=True,
+        null=True,
+        help_text="Redacted snapshot of model-ready features used for this prediction. "
+        "Empty when the features are stored in `feature_snapshot`.",
+    )
+    feature_snapshot = models.ForeignKey(
+        FeatureSnapshot,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True,
+        related_name="prediction_events",
+        help_text="Shared feature payload, when ML_AUDIT_FEATURE_STORAGE uses snapshots.",
     )
     input_fingerprint = models.CharField(
         max_length=255,
         blank=True,
         default="",
-        db_index=True,
         help_text="Fingerprint of the input features (e.g. hash) for detecting data drift.",
     )
-    output = models.JSONField(
+    output = CompressedJSONField(
         blank=True,
         null=True,
-        db_index=True,
         help_text="Model output (e.g. prediction, score, probabilities).",
     )
     confidence = models.FloatField(
         null=True,
         blank=True,
-        db_index=True,
         help_text="Optional canonical confidence / probability score for the main outcome.",
     )
     decision_outcome = models.CharField(
@@ -188,7 +253,6 @@ class PredictionEvent(models.Model):
         max_length=32,
         choices=PredictionStatus.choices,
         default=PredictionStatus.SUCCESS,
-        db_index=True,
         help_text="Overall status of the prediction attempt.",
     )
     latency_ms = models.FloatField(
@@ -196,27 +260,89 @@ class PredictionEvent(models.Model):
         blank=True,
         help_text="Time taken for the prediction in milliseconds.",
     )
-    metadata = models.JSONField(
+    metadata = CompressedJSONField(
         blank=True, null=True, help_text="Additional metadata about the prediction."
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        # Indexes follow the PredictionEventViewSet filters, newest first, on
+        # the denormalized columns. PostgreSQL additionally gets a BRIN index
+        # on timestamp (migration 0007).
         indexes = [
-            models.Index(fields=["timestamp"]),
-            models.Index(fields=["confidence"]),
-            models.Index(fields=["decision_outcome"]),
-            models.Index(fields=["status"]),
-            models.Index(fields=["environment"]),
+            models.Index(fields=["-timestamp"], name="ml_audit_pe_ts"),
+            models.Index(fields=["model_name", "-timestamp"], name="ml_audit_pe_model_ts"),
+            models.Index(
+                fields=["model_name", "model_version", "-timestamp"],
+                name="ml_audit_pe_model_version_ts",
+            ),
+            models.Index(
+                fields=["tenant_id", "-timestamp"],
+                name="ml_audit_pe_tenant_ts",
+                condition=~models.Q(tenant_id=""),
+            ),
+            models.Index(
+                fields=["actor_external_id", "-timestamp"],
+                name="ml_audit_pe_actor_ts",
+                condition=~models.Q(actor_external_id=""),
+            ),
+            models.Index(fields=["environment", "-timestamp"], name="ml_audit_pe_env_ts"),
+            models.Index(
+                fields=["decision_outcome", "-timestamp"], name="ml_audit_pe_outcome_ts"
+            ),
+            models.Index(
+                fields=["status", "-timestamp"],
+                name="ml_audit_pe_unsuccessful_ts",
+                condition=~models.Q(status=PredictionStatus.SUCCESS),
+            ),
+            models.Index(fields=["confidence"], name="ml_audit_pe_confidence"),
+            models.Index(
+                fields=["trace_id"],
+                name="ml_audit_pe_trace_id",
+                condition=~models.Q(trace_id=""),
+            ),
+            # Foreign key indexes: deleting a ModelVersion (PROTECT) or a
+            # RequestingActor (SET_NULL) looks events up by these columns.
+            models.Index(fields=["model", "-timestamp"], name="ml_audit_pe_model_fk_ts"),
+            models.Index(
+                fields=["actor", "-timestamp"],
+                name="ml_audit_pe_actor_fk_ts",
+                condition=models.Q(actor__isnull=False),
+            ),
+            models.Index(
+                fields=["model", "input_fingerprint"],
+                name="ml_audit_pe_model_fp",
+                condition=~models.Q(input_fingerprint=""),
+            ),
+            # Lets `ml_audit_rollup` read only the events written since its watermark.
+            models.Index(fields=["created_at"], name="ml_audit_pe_created"),
         ]
 
     def __str__(self):
         return f"{self.model} - {self.prediction_id}"
 
+    @property
+    def resolved_features(self):
+        """Inline features, or the referenced snapshot's features."""
+        if self.features is None and self.feature_snapshot_id is not None:
+            return self.feature_snapshot.features
+        return self.features
+
+    def copy_related_fields(self) -> None:
+        """Fill the denormalized model/actor columns from the related rows."""
+        if not self.model_name and self.model_id is not None:
+            self.model_name = self.model.model_name
+            self.model_version = self.model.version
+        if not self.actor_type and self.actor_id is not None:
+            self.actor_type = self.actor.actor_type
+            self.actor_external_id = self.actor.actor_id
+            self.tenant_id = self.actor.tenant_id
+
     def save(self, *args, **kwargs):
         if self.pk and not kwargs.get('force_insert', False):
             raise ValidationError("PredictionEvent updates are not allowed.")
+        self.copy_related_fields()
         super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
@@ -227,7 +353,7 @@ class Explanation(models.Model):
     Explanation attached to a specific prediction event.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     prediction = models.OneToOneField(
         PredictionEvent,
         on_delete=models.CASCADE,
@@ -245,9 +371,14 @@ class Explanation(models.Model):
         default="",
         help_text="Version of the explanation method.",
     )
-    payload = models.JSONField(
+    payload = CompressedJSONField(
         help_text="Structured explanation payload (feature attributions etc.)."
     )
+    packed_attributions = models.BinaryField(
+        blank=True,
+        null=True,
+        help_text="Per-feature attribution values packed as float32/float16 (see ml_audit.attributions).",
+    )
     summary_text = models.TextField(
         blank=True,
         default="",
@@ -255,8 +386,8 @@ class Explanation(models.Model):
     )
     status = models.CharField(
         max_length=32,
-        choices=PredictionStatus.choices,
-        default=PredictionStatus.SUCCESS,
+        choices=ExplanationStatus.choices,
+        default=ExplanationStatus.SUCCESS,
         help_text="Status of the explanation generation.",
     )
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -265,7 +396,11 @@ class Explanation(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["method"]),
-            models.Index(fields=["status"]),
+            models.Index(
+                fields=["status"],
+                name="ml_audit_expl_unsuccessful",
+                condition=~models.Q(status=ExplanationStatus.SUCCESS),
+            ),
         ]
 
     def __str__(self):
@@ -274,3 +409,131 @@ class Explanation(models.Model):
     @property
     def prediction_id(self) -> str:
         return self.prediction.prediction_id
+
+    @property
+    def attributions(self):
+        """Packed attributions expanded to `{feature name: value}`, or None."""
+        if self.packed_attributions is None:
+            return None
+        return expand_attributions(
+            self.packed_attributions, self.prediction.model.feature_names
+        )
+
+
+class PredictionRollup(models.Model):
+    """
+    Aggregates of the prediction events in one hour for one model version,
+    environment and tenant.
+
+    Rows are maintained by `ml_audit_rollup` or inline by the recording path
+    (`ML_AUDIT_ROLLUP`); sums and counts are kept separately so buckets can be
+    combined exactly.
+    """
+
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
+    bucket = models.DateTimeField(help_text="Start of the hour (UTC).")
+    model_name = models.CharField(max_length=255)
+    model_version = models.CharField(max_length=64)
+    environment = models.CharField(max_length=64, blank=True, default="")
+    tenant_id = models.CharField(max_length=255, blank=True, default="")
+    event_count = models.BigIntegerField(default=0)
+    failed_count = models.BigIntegerField(default=0)
+    partial_count = models.BigIntegerField(default=0)
+    outcome_counts = models.JSONField(
+        default=dict, help_text="Event count per `decision_outcome`."
+    )
+    latency_sum = models.FloatField(default=0.0)
+    latency_count = models.BigIntegerField(default=0)
+    latency_max = models.FloatField(null=True, blank=True)
+    confidence_sum = models.FloatField(default=0.0)
+    confidence_count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "model_name", "model_version", "environment", "tenant_id"],
+                name="ml_audit_rollup_key",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["model_name", "model_version", "-bucket"],
+                name="ml_audit_rollup_model",
+            ),
+            models.Index(
+                fields=["tenant_id", "-bucket"],
+                name="ml_audit_rollup_tenant",
+                condition=~models.Q(tenant_id=""),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name}: v{self.model_version} @ {self.bucket:%Y-%m-%d %H:00}"
+
+    @property
+    def success_count(self) -> int:
+        return self.event_count - self.failed_count - self.partial_count
+
+    @property
+    def failure_rate(self) -> Optional[float]:
+        return self.failed_count / self.event_count if self.event_count else None
+
+    @property
+    def avg_latency_ms(self) -> Optional[float]:
+        return self.latency_sum / self.latency_count if self.latency_count else None
+
+    @property
+    def avg_confidence(self) -> Optional[float]:
+        return self.confidence_sum / self.confidence_count if self.confidence_count else None
+
+
+class RollupWatermark(models.Model):
+    """How far (by `PredictionEvent.created_at`) a periodic aggregation has read."""
+
+    name = models.CharField(max_length=64, primary_key=True)
+    position = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+
+class SketchMetric(models.TextChoices):
+    LATENCY_MS = "latency_ms"
+    CONFIDENCE = "confidence"
+
+
+class QuantileSketch(models.Model):
+    """
+    DDSketch of one metric over one hour of a model version's predictions.
+
+    Workers merge their in-memory sketches into these rows; any window's
+    quantiles come from merging its hourly rows (see `ml_audit.sketches`).
+    """
+
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
+    bucket = models.DateTimeField(help_text="Start of the hour (UTC).")
+    model_name = models.CharField(max_length=255)
+    model_version = models.CharField(max_length=64)
+    metric = models.CharField(max_length=32, choices=SketchMetric.choices)
+    count = models.BigIntegerField(default=0)
+    sketch = models.JSONField(help_text="Serialized DDSketch (`DDSketch.to_dict()`).")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_name", "model_version", "metric", "bucket"],
+                name="ml_audit_sketch_key",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.model_name}: v{self.model_version} {self.metric} "
+            f"@ {self.bucket:%Y-%m-%d %H:00}"
+        )
+
+    def to_sketch(self) -> DDSketch:
+        return DDSketch.from_dict(self.sketch)
@@ -0,0 +1,355 @@
+"""
+Range partitioning of the PredictionEvent table by `timestamp` on PostgreSQL.
+
+A partitioned table's primary key and unique constraints must include the
+partition key, so the converted table has `PRIMARY KEY (id, timestamp)` and
+`UNIQUE (prediction_id, timestamp)`, and foreign keys *to* prediction events
+(`Explanation.prediction`) are kept at the ORM level only. Recording keeps
+`prediction_id` idempotent by taking a transaction-scoped advisory lock per
+`prediction_id` before checking for an existing event (see
+`lock_prediction_ids`). Rows outside every range land in a DEFAULT partition.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connections
+
+TABLE = "ml_audit_predictionevent"
+PARTITION_KEY = "timestamp"
+
+_partitioned: Dict[str, bool] = {}
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+
+# -- period arithmetic -----------------------------------------------------
+
+
+def period_start(day: date, interval: str) -> date:
+    """Return the first day of the partition period containing `day`."""
+    if interval == "day":
+        return day
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_period(start: date, interval: str) -> date:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_ranges(first: date, last: date, interval: str) -> List[Tuple[date, date]]:
+    """Return `[start, end)` ranges covering every period from `first` to `last`."""
+    ranges = []
+    start = period_start(first, interval)
+    while start <= last:
+        end = next_period(start, interval)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def partition_name(start: date, table: str = TABLE) -> str:
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def _bound(day: date) -> str:
+    return f"{day:%Y-%m-%d} 00:00:00+00"
+
+
+# -- introspection ---------------------------------------------------------
+
+
+def is_partitioned(using: str = "default", table: str = TABLE) -> bool:
+    """Whether `table` is a partitioned table on the `using` connection (cached)."""
+    if using not in _partitioned:
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            _partitioned[using] = False
+        else:
+            with connection.cursor() as cursor:
+                _partitioned[using] = _is_partitioned_table(cursor, table)
+    return _partitioned[using]
+
+
+def _is_partitioned_table(cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.oid = to_regclass(%s))",
+        [table],
+    )
+    return cursor.fetchone()[0]
+
+
+def list_partitions(cursor, table: str = TABLE) -> List[Partition]:
+    cursor.execute(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+        [table],
+    )
+    partitions = []
+    for name, bound in cursor.fetchall():
+        match = _BOUND_RE.search(bound or "")
+        if match is None:
+            partitions.append(Partition(name=name, start=None, end=None))
+            continue
+        start, end = (_parse_bound(value) for value in match.groups())
+        partitions.append(Partition(name=name, start=start, end=end))
+    return partitions
+
+
+def _parse_bound(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace(" ", "T"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+# -- maintenance -----------------------------------------------------------
+
+
+def create_partitions(
+    connection, ranges: Iterable[Tuple[date, date]], table: str = TABLE
+) -> List[str]:
+    """
+    Create the partitions for `ranges` that do not exist yet.
+
+    Rows already in the DEFAULT partition for a new range are moved into it,
+    since PostgreSQL refuses to add a partition the default one overlaps.
+    Call inside a transaction.
+    """
+    quote = connection.ops.quote_name
+    created = []
+    with connection.cursor() as cursor:
+        existing = {partition.name for partition in list_partitions(cursor, table)}
+        default = f"{table}_default"
+        for start, end in ranges:
+            name = partition_name(start, table)
+            if name in existing:
+                continue
+            bounds = "FROM ('%s') TO ('%s')" % (_bound(start), _bound(end))
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} (LIKE {quote(table)} "
+                f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+            )
+            if default in existing:
+                in_range = f"{quote(PARTITION_KEY)} >= %s AND {quote(PARTITION_KEY)} < %s"
+                params = [_bound(start), _bound(end)]
+                cursor.execute(
+                    f"INSERT INTO {quote(name)} SELECT * FROM {quote(default)} WHERE {in_range}",
+                    params,
+                )
+                cursor.execute(f"DELETE FROM {quote(default)} WHERE {in_range}", params)
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} FOR VALUES {bounds}"
+            )
+            created.append(name)
+    return created
+
+
+def expired_partitions(cursor, before: datetime, table: str = TABLE) -> List[Partition]:
+    """Return the range partitions that end on or before `before`."""
+    return [
+        partition
+        for partition in list_partitions(cursor, table)
+        if not partition.is_default and partition.end <= before
+    ]
+
+
+def detach_partition(connection, name: str, *, drop: bool = False, table: str = TABLE) -> None:
+    """
+    Detach (and optionally drop) one partition.
+
+    Explanations of its events are not touched; use
+    `ml_audit.services.archiving.remove_partition` to remove those as well.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {quote(name)}")
+
+
+def lock_prediction_ids(connection, prediction_ids: Iterable[str]) -> None:
+    """
+    Serialize writers of the same `prediction_id`s until the transaction ends.
+
+    Locks are taken in a fixed order so concurrent batches cannot deadlock.
+    """
+    keys = sorted(set(prediction_ids))
+    if not keys:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(k) FROM ("
+            "SELECT DISTINCT hashtextextended(id, 0) AS k FROM unnest(%s::text[]) AS id "
+            "ORDER BY k) AS keys",
+            [keys],
+        )
+
+
+# -- conversion ------------------------------------------------------------
+
+
+def _secondary_index_defs(cursor, table: str) -> List[str]:
+    cursor.execute(
+        "SELECT pg_get_indexdef(indexrelid) FROM pg_index "
+        "WHERE indrelid = to_regclass(%s) AND NOT indisunique",
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _foreign_keys(cursor, table: str) -> List[Tuple[str, str]]:
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _referencing_foreign_keys(cursor, table: str) -> List[Tuple[str, str]]:
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+        "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def partition_prediction_events(
+    connection, *, interval: str = "month", premake: int = 3, table: str = TABLE
+) -> bool:
+    """
+    Convert the PredictionEvent table to a range-partitioned table.
+
+    Partitions cover the existing rows plus `premake` future periods, with a
+    DEFAULT partition for anything else. Returns False if it already is
+    partitioned. Runs as a sequence of DDL statements; call inside a
+    transaction so a failure leaves the original table in place.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if _is_partitioned_table(cursor, table):
+            return False
+        index_defs = _secondary_index_defs(cursor, table)
+        foreign_keys = _foreign_keys(cursor, table)
+        for other, name in _referencing_foreign_keys(cursor, table):
+            cursor.execute(f"ALTER TABLE {other} DROP CONSTRAINT {quote(name)}")
+        cursor.execute(
+            f"SELECT min({quote(PARTITION_KEY)}), max({quote(PARTITION_KEY)}) FROM {quote(table)}"
+        )
+        first, last = cursor.fetchone()
+
+        legacy = f"{table}_unpartitioned"
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) "
+            f"PARTITION BY RANGE ({quote(PARTITION_KEY)})"
+        )
+        cursor.execute(
+            f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+        )
+
+    today = datetime.now(dt_timezone.utc).date()
+    horizon = today
+    for _ in range(premake):
+        horizon = next_period(period_start(horizon, interval), interval)
+    first_day = min(first.date(), today) if first else today
+    last_day = max(last.date(), horizon) if last else horizon
+    create_partitions(connection, partition_ranges(first_day, last_day, interval), table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")
+        cursor.execute(f"DROP TABLE {quote(legacy)}")
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_pkey')} "
+            f"PRIMARY KEY (id, {quote(PARTITION_KEY)})"
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT "
+            f"{quote(table + '_prediction_id_timestamp_uniq')} "
+            f"UNIQUE (prediction_id, {quote(PARTITION_KEY)})"
+        )
+        for index_def in index_defs:
+            cursor.execute(index_def)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+
+    _partitioned.pop(connection.alias, None)
+    return True
+
+
+def unpartition_prediction_events(
+    connection, referencing: Iterable[Tuple[str, str]], table: str = TABLE
+) -> bool:
+    """
+    Convert a partitioned PredictionEvent table back to a single table.
+
+    `referencing` lists `(table, column)` pairs whose foreign keys to the
+    event primary key are restored. Returns False if it is not partitioned.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if not _is_partitioned_table(cursor, table):
+            return False
+        # Partitioned indexes are defined "ON ONLY" the parent table.
+        index_defs = [
+            index_def.replace(" ON ONLY ", " ON ", 1)
+            for index_def in _secondary_index_defs(cursor, table)
+        ]
+        foreign_keys = _foreign_keys(cursor, table)
+
+        legacy = f"{table}_partitioned"
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+        )
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")
+        # Dropping the parent drops its partitions and indexes.
+        cursor.execute(f"DROP TABLE {quote(legacy)}")
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_pkey')} PRIMARY KEY (id)"
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT "
+            f"{quote(table + '_prediction_id_key')} UNIQUE (prediction_id)"
+        )
+        for index_def in index_defs:
+            cursor.execute(index_def)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+        for other, column in referencing:
+            cursor.execute(
+                f"ALTER TABLE {quote(other)} ADD CONSTRAINT {quote(f'{other}_{column}_fk')} "
+                f"FOREIGN KEY ({quote(column)}) REFERENCES {quote(table)} (id) "
+                f"DEFERRABLE INITIALLY DEFERRED"
+            )
+
+    _partitioned.pop(connection.alias, None)
+    return True
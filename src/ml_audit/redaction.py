@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ml_audit.conf import RedactionConfig, get_redaction_config
+
+Path = Tuple[Any, ...]
+PathPattern = Tuple[str, ...]
+
+# Marks a plan node whose value is replaced by the mask value.
+_MASK = object()
+
+
+def path_matches(pattern: PathPattern, path: Path) -> bool:
+    if not pattern:
+        return not path
+    head, rest = pattern[0], pattern[1:]
+    if head == "**":
+        return any(path_matches(rest, path[i:]) for i in range(len(path) + 1))
+    if not path:
+        return False
+    if head != "*" and head != str(path[0]):
+        return False
+    return path_matches(rest, path[1:])
+
+
+def _shape(value: Any) -> Hashable:
+    """Hashable description of a payload's container structure and keys."""
+    if isinstance(value, dict):
+        return ("d",) + tuple((key, _shape(child)) for key, child in value.items())
+    if isinstance(value, list):
+        return ("l",) + tuple(_shape(child) for child in value)
+    return None
+
+
+def _build_plan(config: RedactionConfig, value: Any, path: Path) -> Optional[Dict[Any, Any]]:
+    """
+    Return a tree of `{segment: subplan | _MASK}` for the paths to mask, or None.
+
+    A key is masked when its path matches a path denylist rule, or when its
+    name is sensitive and its path is not path-allowlisted. Masking a
+    container masks its whole subtree.
+    """
+    if isinstance(value, dict):
+        children = value.items()
+    elif isinstance(value, list):
+        children = enumerate(value)
+    else:
+        return None
+
+    plan: Dict[Any, Any] = {}
+    for segment, child in children:
+        child_path = path + (segment,)
+        if _should_mask(config, child_path, is_key=isinstance(value, dict)):
+            plan[segment] = _MASK
+            continue
+        subplan = _build_plan(config, child, child_path)
+        if subplan:
+            plan[segment] = subplan
+    return plan or None
+
+
+def _should_mask(config: RedactionConfig, path: Path, *, is_key: bool) -> bool:
+    if any(path_matches(pattern, path) for pattern in config.path_denylist):
+        return True
+    if any(path_matches(pattern, path) for pattern in config.path_allowlist):
+        return False
+    return is_key and config.is_sensitive(str(path[-1]))
+
+
+def _apply_plan(value: Any, plan: Dict[Any, Any], mask_value: str) -> Any:
+    # Copy only the containers on the way to a masked value; untouched
+    # subtrees are shared with the input.
+    result = dict(value) if isinstance(value, dict) else list(value)
+    for segment, subplan in plan.items():
+        if subplan is _MASK:
+            result[segment] = mask_value
+        else:
+            result[segment] = _apply_plan(result[segment], subplan, mask_value)
+    return result
+
+
+def redact_features(
+    features: Dict[str, Any], config: Optional[RedactionConfig] = None
+) -> Dict[str, Any]:
+    """
+    Return a redacted copy of `features`, walking nested dicts and lists.
+
+    The set of paths to mask depends only on the payload's key shape, so it
+    is compiled once per distinct shape into a plan and cached (LRU) on the
+    config; repeated payloads of the same shape only apply the plan.
+    """
+    config = config or get_redaction_config()
+    if not all(type(key) is str for key in features):
+        features = {str(key): value for key, value in features.items()}
+
+    shape = _shape(features)
+    plans = config.plan_cache
+    plan = plans.get(shape)
+    if plan is None:
+        plan = _build_plan(config, features, ()) or {}
+        plans.set(shape, plan)
+
+    if not plan:
+        return dict(features)
+    return _apply_plan(features, plan, config.mask_value)
@@ -0,0 +1,90 @@
+"""
+Database routing for ml-audit (`ML_AUDIT_DATABASES`).
+
+Install the router to keep audit traffic off the project's default database::
+
+    DATABASE_ROUTERS = ["ml_audit.routers.AuditRouter", ...]
+
+Every ml-audit model is written to, migrated on, and by default read from
+the `WRITE` alias, so the recording services always see their own rows.
+The read API and the admin opt into the `READ` replicas through
+`read_database()`.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from ml_audit.conf import get_database_config
+
+APP_LABEL = "ml_audit"
+
+# Wall-clock time of the last ml-audit write in this context; 0.0 if there
+# was none. The recording and explanation services set it once their
+# transaction commits. Without `AuditReadStickinessMiddleware` nothing resets
+# it between requests, so on a WSGI worker thread a write keeps pinning the
+# reads of later requests served by that thread until `STICKY` expires.
+last_write: ContextVar[float] = ContextVar("ml_audit_last_write", default=0.0)
+
+
+def note_write() -> None:
+    """Start the read-your-writes window (`ML_AUDIT_DATABASES["STICKY"]`)."""
+    if get_database_config().sticky:
+        last_write.set(time.time())
+
+
+def read_database() -> Optional[str]:
+    """
+    The alias for a read that may be served by a replica.
+
+    Returns a random `READ` replica, or None (the routed write database)
+    when no replicas are configured or this context wrote within the last
+    `STICKY` seconds.
+    """
+    config = get_database_config()
+    if not config.read:
+        return None
+    if config.sticky and time.time() - last_write.get() < config.sticky:
+        return None
+    return random.choice(config.read)
+
+
+class AuditRouter:
+    """
+    Route ml-audit models to `ML_AUDIT_DATABASES["WRITE"]`.
+
+    Other apps are left to the remaining routers. Reads also default to the
+    write alias; replica reads are explicit (see `read_database`) so that
+    get-or-create paths never miss a row that has not replicated yet.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if model._meta.app_label == APP_LABEL:
+            # Related rows of an object read from a replica come from that replica.
+            instance = hints.get("instance")
+            if instance is not None and instance._state.db:
+                return instance._state.db
+            return get_database_config().write
+        return None
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        if model._meta.app_label == APP_LABEL:
+            return get_database_config().write
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # Rows read from a replica may be related to rows on the write alias.
+        if obj1._meta.app_label == APP_LABEL and obj2._meta.app_label == APP_LABEL:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        if app_label != APP_LABEL:
+            return None
+        write = get_database_config().write
+        if write is None:
+            return None
+        return db == write
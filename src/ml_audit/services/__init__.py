@@ -1,9 +1,37 @@
-from .explanations import attach_explanation
-from .recording import ActorPayload, record_prediction_event
+from .explanations import (
+    AttachResult,
+    ExplanationCache,
+    ExplanationKey,
+    aattach_explanation,
+    attach_attributions,
+    attach_explanation,
+    attach_explanations,
+    attach_memoized_explanation,
+    explanation_key,
+    get_explanation_cache,
+)
+from .recording import (
+    ActorPayload,
+    RecordResult,
+    arecord_prediction_event,
+    record_prediction_event,
+    record_prediction_events,
+)
 
 __all__ = [
     "record_prediction_event",
+    "record_prediction_events",
+    "arecord_prediction_event",
+    "RecordResult",
     "ActorPayload",
     "attach_explanation",
+    "aattach_explanation",
+    "attach_attributions",
+    "attach_explanations",
+    "AttachResult",
+    "attach_memoized_explanation",
+    "ExplanationCache",
+    "ExplanationKey",
+    "explanation_key",
+    "get_explanation_cache",
 ]
-
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, router, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ml_audit.archive import (
+    Manifest,
+    SegmentInfo,
+    format_timestamp,
+    load_manifest,
+    read_segment,
+    save_manifest,
+    write_segment,
+)
+from ml_audit.conf import get_archive_config
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.partitioning import (
+    Partition,
+    detach_partition,
+    expired_partitions,
+    is_partitioned,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchiveStats:
+    segments: int = 0
+    events: int = 0
+    partitions: List[str] = field(default_factory=list)
+
+
+def event_record(event: PredictionEvent) -> Dict[str, Any]:
+    """Flatten an event (with its explanation) into an archive row."""
+    try:
+        explanation = event.explanation
+    except ObjectDoesNotExist:
+        explanation = None
+    return {
+        "id": str(event.pk),
+        "prediction_id": event.prediction_id,
+        "timestamp": format_timestamp(event.timestamp),
+        "model_name": event.model_name,
+        "model_version": event.model_version,
+        "environment": event.environment,
+        "trace_id": event.trace_id,
+        "status": event.status,
+        "confidence": event.confidence,
+        "latency_ms": event.latency_ms,
+        "decision_outcome": event.decision_outcome,
+        "input_fingerprint": event.input_fingerprint,
+        "actor_type": event.actor_type or None,
+        "actor_id": event.actor_external_id or None,
+        "tenant_id": event.tenant_id if event.actor_type else None,
+        "features": event.resolved_features,
+        "output": event.output,
+        "metadata": event.metadata,
+        "explanation": None
+        if explanation is None
+        else {
+            "method": explanation.method,
+            "method_version": explanation.method_version,
+            "status": explanation.status,
+            "summary_text": explanation.summary_text,
+            "payload": explanation.payload,
+            "attributions": explanation.attributions,
+            "generated_at": format_timestamp(explanation.generated_at),
+        },
+        "created_at": format_timestamp(event.created_at),
+    }
+
+
+def _export_events(
+    events: QuerySet,
+    *,
+    source: Optional[str],
+    directory: Optional[str | os.PathLike],
+    archive_format: Optional[str],
+) -> List[SegmentInfo]:
+    """Stream `events` into segments of `SEGMENT_ROWS` events."""
+    read_at = format_timestamp(timezone.now())
+    events = events.select_related("explanation", "feature_snapshot").order_by(
+        "created_at", "id"
+    )
+
+    segment_rows = get_archive_config().segment_rows
+    segments: List[SegmentInfo] = []
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        name = f"events-{batch[0]['timestamp'][:19].replace(':', '')}-{uuid.uuid4().hex[:8]}"
+        segment = write_segment(
+            batch,
+            name=name,
+            directory=directory,
+            archive_format=archive_format,
+            source=source,
+        )
+        # Read the segment back before the source rows can be detached.
+        written = read_segment(segment, ["prediction_id"], directory)["prediction_id"]
+        if written != [record["prediction_id"] for record in batch]:
+            raise RuntimeError(f"Archive segment {segment.file} did not read back intact.")
+        segment.read_at = read_at
+        segments.append(segment)
+        batch.clear()
+
+    for event in events.iterator(chunk_size=min(segment_rows, 2000)):
+        batch.append(event_record(event))
+        if len(batch) >= segment_rows:
+            flush()
+    if batch:
+        flush()
+    return segments
+
+
+def _export_late_explanations(
+    manifest: Manifest,
+    events: QuerySet,
+    *,
+    source: Optional[str],
+    directory: Optional[str | os.PathLike],
+    archive_format: Optional[str],
+) -> List[SegmentInfo]:
+    """
+    Re-export archived `events` whose explanation was attached after they were read.
+
+    The new copies go to new segments and the older copies are marked as
+    superseded, so queries return each event once, with its explanation.
+    """
+    exported = [segment for segment in manifest.segments if segment.source == source]
+    if not exported:
+        return []
+    read_at = [segment.read_at or segment.created_at for segment in exported]
+    # Events of a partition were all read at once; an unpartitioned table's
+    # previous runs already re-exported anything attached before the last one.
+    since = min(read_at) if source is not None else max(read_at)
+    segments = _export_events(
+        events.filter(explanation__created_at__gt=parse_datetime(since)),
+        source=source,
+        directory=directory,
+        archive_format=archive_format,
+    )
+    for segment in segments:
+        ids = set(read_segment(segment, ["id"], directory)["id"])
+        for older in manifest.segments:
+            if not older.may_contain(
+                time_from=segment.min_timestamp, time_to=segment.max_timestamp
+            ):
+                continue
+            replaced = ids.intersection(read_segment(older, ["id"], directory)["id"])
+            older.superseded = sorted(replaced.union(older.superseded))
+        manifest.segments.append(segment)
+    return segments
+
+
+def remove_partition(
+    connection,
+    partition: Partition,
+    *,
+    drop: bool = False,
+    manifest: Optional[Manifest] = None,
+    directory: Optional[str | os.PathLike] = None,
+    archive_format: Optional[str] = None,
+) -> None:
+    """
+    Detach (and optionally drop) an archived `partition` together with its events' explanations.
+
+    On a partitioned table `Explanation.prediction` is an ORM-level relation
+    only, so detaching the events alone would leave their explanations
+    behind. Explanations attached since the partition was exported are
+    archived first; new ones are held off until the partition is detached.
+    """
+    using = connection.alias
+    manifest = manifest or load_manifest(directory)
+    events = PredictionEvent.objects.using(using).filter(
+        timestamp__gte=partition.start, timestamp__lt=partition.end
+    )
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "LOCK TABLE %s IN SHARE ROW EXCLUSIVE MODE"
+                % connection.ops.quote_name(Explanation._meta.db_table)
+            )
+        if _export_late_explanations(
+            manifest,
+            events,
+            source=partition.name,
+            directory=directory,
+            archive_format=archive_format,
+        ):
+            save_manifest(manifest, directory)
+        Explanation.objects.using(using).filter(
+            prediction__timestamp__gte=partition.start,
+            prediction__timestamp__lt=partition.end,
+        ).delete()
+        detach_partition(connection, partition.name, drop=drop)
+
+
+def archive_events(
+    before: datetime,
+    *,
+    detach: bool = True,
+    drop: bool = False,
+    using: Optional[str] = None,
+    directory: Optional[str | os.PathLike] = None,
+    archive_format: Optional[str] = None,
+) -> ArchiveStats:
+    """
+    Export events older than `before` to archive segments.
+
+    On a partitioned PostgreSQL table every range partition that ends on or
+    before `before` is exported whole, recorded in the manifest, and then
+    detached (and dropped with `drop=True`) together with its events'
+    explanations; a partition already in the manifest is not exported
+    again. Other backends cannot remove immutable events, so rows are only
+    exported: those recorded (`created_at`) between the manifest's
+    `archived_until` watermark and `before`, so late events with old
+    timestamps are picked up by the run after they arrive. Either way,
+    events whose explanation was attached after they were exported are
+    exported again with it.
+    """
+    using = using or router.db_for_write(PredictionEvent)
+    manifest = load_manifest(directory)
+    stats = ArchiveStats()
+
+    def add(segments: List[SegmentInfo]) -> None:
+        stats.segments += len(segments)
+        stats.events += sum(segment.rows for segment in segments)
+
+    def export(events: QuerySet, source: Optional[str]) -> None:
+        segments = _export_events(
+            events, source=source, directory=directory, archive_format=archive_format
+        )
+        manifest.segments.extend(segments)
+        add(segments)
+
+    events = PredictionEvent.objects.using(using)
+    if not is_partitioned(using):
+        start = parse_datetime(manifest.archived_until) if manifest.archived_until else None
+        if start is not None:
+            add(
+                _export_late_explanations(
+                    manifest,
+                    events.filter(created_at__lte=start),
+                    source=None,
+                    directory=directory,
+                    archive_format=archive_format,
+                )
+            )
+        if start is None or start < before:
+            window = events.filter(created_at__lte=before)
+            export(window if start is None else window.filter(created_at__gt=start), None)
+            manifest.archived_until = format_timestamp(before)
+        save_manifest(manifest, directory)
+        return stats
+
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        partitions = expired_partitions(cursor, before)
+    for partition in partitions:
+        if partition.name not in manifest.sources():
+            export(
+                events.filter(timestamp__gte=partition.start, timestamp__lt=partition.end),
+                partition.name,
+            )
+            save_manifest(manifest, directory)
+        if detach or drop:
+            remove_partition(
+                connection,
+                partition,
+                drop=drop,
+                manifest=manifest,
+                directory=directory,
+                archive_format=archive_format,
+            )
+            logger.info("ml-audit archived and detached partition %s", partition.name)
+        stats.partitions.append(partition.name)
+    return stats
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from asgiref.sync import sync_to_async
+from django.db import (
+    InterfaceError,
+    OperationalError,
+    close_old_connections,
+    connection,
+)
+from django.utils import timezone
+
+from ml_audit.conf import get_async_recording_config, get_spool_config
+from ml_audit.ids import new_id
+from ml_audit.models import PredictionStatus
+from ml_audit.services.explanations import attach_explanations
+from ml_audit.services.recording import (
+    ActorPayload,
+    _spool_event,
+    record_prediction_events,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BufferedEvent:
+    """
+    Compact in-memory record of a prediction event awaiting a flush.
+
+    Field names match the keyword arguments of `record_prediction_event`.
+    """
+
+    prediction_id: str
+    model_name: str
+    model_version: str
+    features: Dict[str, Any]
+    output: Any
+    timestamp: datetime
+    actor: Optional[ActorPayload] = None
+    decision_outcome: Optional[str] = None
+    environment: Optional[str] = None
+    trace_id: Optional[str] = None
+    latency_ms: Optional[float] = None
+    status: str = PredictionStatus.SUCCESS
+    confidence: Optional[float] = None
+    metadata: Optional[Dict[str, Any]] = None
+    input_fingerprint: Optional[str] = None
+
+    def as_payload(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class BufferedExplanation:
+    """Explanation to attach once the referenced event has been flushed."""
+
+    prediction_id: str
+    method: str
+    payload: Dict[str, Any]
+    summary_text: Optional[str] = None
+    status: str = PredictionStatus.SUCCESS
+    method_version: Optional[str] = None
+
+    def as_kwargs(self) -> Dict[str, Any]:
+        kwargs = asdict(self)
+        kwargs["prediction"] = kwargs.pop("prediction_id")
+        return kwargs
+
+
+BufferedRecord = Union[BufferedEvent, BufferedExplanation]
+
+
+class BufferedRecorder:
+    """
+    Bounded in-memory queue drained by a dedicated writer thread.
+
+    Records are flushed with `record_prediction_events` once `batch_size`
+    records are pending or `flush_interval` seconds have passed, and on
+    `stop()` (registered with atexit and, when possible, SIGTERM).
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        on_full: str = "sync",
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_full = on_full
+        self._queue: queue.Queue[BufferedRecord] = queue.Queue(maxsize=queue_size)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Reentrant so a SIGTERM handler interrupting a write on the main
+        # thread can check `_writing` instead of deadlocking (see `stop_from_signal`).
+        self._flush_lock = threading.RLock()
+        self._writing = False
+        self._after_write: Optional[Callable[[], None]] = None
+        self._pid = os.getpid()
+        self.written = 0
+        self.spooled = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # -- producer side -----------------------------------------------------
+
+    def submit(self, record: BufferedRecord) -> None:
+        """Queue `record` for the writer thread, applying the `on_full` policy."""
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._submit_to_full_queue(record)
+
+    async def asubmit(self, record: BufferedRecord) -> None:
+        """
+        `submit` for async callers.
+
+        The `on_full` policy runs in a worker thread, so a full queue never
+        blocks the event loop ("block") or touches the ORM on it ("sync").
+        """
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            await sync_to_async(self._submit_to_full_queue, thread_sensitive=False)(record)
+
+    def _submit_to_full_queue(self, record: BufferedRecord) -> None:
+        if self.on_full == "block":
+            self._queue.put(record)
+        elif self.on_full == "drop":
+            self.dropped += 1
+            logger.warning(
+                "ml-audit buffer full; dropped record for prediction %s",
+                record.prediction_id,
+            )
+        else:
+            # Write the backlog along with this record so explanations never
+            # overtake the events they refer to.
+            self._write(self._drain(limit=None) + [record])
+
+    # -- writer side -------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ml-audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the writer thread and flush everything still queued."""
+        self._stopping.set()
+        thread = self._thread
+        if (
+            thread is not None
+            and thread.is_alive()
+            and thread is not threading.current_thread()
+        ):
+            thread.join(timeout)
+        self.flush()
+
+    def stop_from_signal(self, then: Callable[[], None]) -> None:
+        """
+        `stop()`, then call `then()`; for signal handlers.
+
+        Handlers run on the main thread, which may itself be inside `_write`
+        (an `on_full="sync"` submit or a flush). The stop is then deferred
+        until that write returns rather than re-entering it mid-transaction.
+        """
+        with self._flush_lock:
+            if self._writing:
+                self._after_write = partial(self.stop_from_signal, then)
+                return
+        self.stop()
+        then()
+
+    def flush(self) -> int:
+        """Drain the queue in the calling thread. Returns the number of records taken."""
+        records = self._drain(limit=None)
+        if records:
+            self._write(records)
+        return len(records)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _drain(self, limit: Optional[int]) -> List[BufferedRecord]:
+        records: List[BufferedRecord] = []
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch: List[BufferedRecord] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stopping.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                batch.extend(self._drain(limit=self.batch_size - len(batch)))
+            if batch:
+                self._write(batch)
+                close_old_connections()
+        connection.close()
+
+    def _write(self, records: List[BufferedRecord]) -> None:
+        with self._flush_lock:
+            self._writing = True
+            try:
+                self._write_batch(records)
+            finally:
+                self._writing = False
+            after_write, self._after_write = self._after_write, None
+        if after_write is not None:
+            after_write()
+
+    def _write_batch(self, records: List[BufferedRecord]) -> None:
+        events = [r for r in records if isinstance(r, BufferedEvent)]
+        explanations = [r for r in records if isinstance(r, BufferedExplanation)]
+        if events:
+            self._write_or_split(events, self._write_events)
+        if explanations:
+            self._write_or_split(explanations, self._attach_explanations)
+
+    def _write_or_split(
+        self,
+        records: List[Any],
+        write: Callable[[List[Any]], None],
+    ) -> None:
+        """
+        Call `write(records)`, retrying record by record if it raises.
+
+        Connection errors spool (or fail) the records straight away; any other
+        error is assumed to come from a bad payload, so the batch is retried
+        one record at a time and only the records that still fail are lost.
+        Writes are idempotent on `prediction_id`, so a retry never duplicates
+        the events that did go through.
+        """
+        try:
+            write(records)
+        except (OperationalError, InterfaceError):
+            self._spool(records)
+        except Exception:
+            if len(records) == 1:
+                self._fail(records)
+                return
+            logger.warning(
+                "ml-audit could not flush %d buffered record(s); retrying one by one",
+                len(records),
+                exc_info=True,
+            )
+            for record in records:
+                self._write_or_split([record], write)
+
+    def _write_events(self, events: List[BufferedEvent]) -> None:
+        record_prediction_events(
+            [event.as_payload() for event in events],
+            batch_size=self.batch_size,
+        )
+        self.written += len(events)
+
+    def _attach_explanations(self, explanations: List[BufferedExplanation]) -> None:
+        failures = [
+            result
+            for result in attach_explanations(
+                [explanation.as_kwargs() for explanation in explanations],
+                batch_size=self.batch_size,
+            )
+            if not result.ok
+        ]
+        for result in failures:
+            logger.warning(
+                "ml-audit could not attach explanation for %s: %s",
+                result.prediction,
+                result.error,
+            )
+        self.failed += len(failures)
+
+    def _spool(self, records: List[BufferedRecord]) -> None:
+        events = [r for r in records if isinstance(r, BufferedEvent)]
+        if not events or not get_spool_config().enabled:
+            self._fail(records)
+            return
+        # The database is unreachable: keep the events in the local spool for
+        # `ml_audit_replay_spool`; explanations are lost.
+        logger.warning(
+            "ml-audit database unavailable; spooling %d buffered event(s)",
+            len(events),
+            exc_info=True,
+        )
+        for event in events:
+            _spool_event(event.as_payload())
+        self.spooled += len(events)
+
+    def _fail(self, records: List[BufferedRecord]) -> None:
+        self.failed += len(records)
+        logger.exception(
+            "ml-audit failed to flush %d buffered audit record(s)", len(records)
+        )
+
+
+_recorder: Optional[BufferedRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_buffered_recorder() -> BufferedRecorder:
+    """
+    Return the process-wide buffered recorder, creating it on first use.
+
+    A recorder inherited across `fork()` is replaced, since its writer
+    thread does not survive in the child process.
+    """
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None or _recorder._pid != os.getpid():
+            config = get_async_recording_config()
+            _recorder = BufferedRecorder(
+                queue_size=config.queue_size,
+                batch_size=config.batch_size,
+                flush_interval=config.flush_interval,
+                on_full=config.on_full,
+            )
+            atexit.register(_recorder.stop)
+            _install_sigterm_handler(_recorder)
+        return _recorder
+
+
+def _install_sigterm_handler(recorder: BufferedRecorder) -> None:
+    # Signal handlers can only be installed from the main thread; servers that
+    # create the recorder lazily on a worker thread rely on the atexit hook.
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _chain(signum, frame):
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def _handle_sigterm(signum, frame):
+        recorder.stop_from_signal(partial(_chain, signum, frame))
+
+    try:
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+    except ValueError:  # pragma: no cover - not in the main interpreter
+        pass
+
+
+def submit_prediction_event(**kwargs: Any) -> str:
+    """
+    Queue a prediction event for the background writer and return its `prediction_id`.
+
+    Accepts the same keyword arguments as `record_prediction_event`;
+    `prediction_id` and `timestamp` are filled in at submission time so the
+    caller can hand the ID back before the event is written.
+    """
+    kwargs["prediction_id"] = kwargs.get("prediction_id") or str(new_id())
+    kwargs["timestamp"] = kwargs.get("timestamp") or timezone.now()
+    get_buffered_recorder().submit(BufferedEvent(**kwargs))
+    return kwargs["prediction_id"]
+
+
+async def asubmit_prediction_event(**kwargs: Any) -> str:
+    """Async version of `submit_prediction_event` (see `BufferedRecorder.asubmit`)."""
+    kwargs["prediction_id"] = kwargs.get("prediction_id") or str(new_id())
+    kwargs["timestamp"] = kwargs.get("timestamp") or timezone.now()
+    await get_buffered_recorder().asubmit(BufferedEvent(**kwargs))
+    return kwargs["prediction_id"]
+
+
+def submit_explanation(*, prediction_id: str, **kwargs: Any) -> None:
+    """Queue an explanation to be attached after its event has been flushed."""
+    get_buffered_recorder().submit(BufferedExplanation(prediction_id=prediction_id, **kwargs))
+
+
+async def asubmit_explanation(*, prediction_id: str, **kwargs: Any) -> None:
+    """Async version of `submit_explanation`."""
+    await get_buffered_recorder().asubmit(
+        BufferedExplanation(prediction_id=prediction_id, **kwargs)
+    )
+
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import heapq
+import inspect
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from django.db import close_old_connections, connection
+
+from ml_audit.conf import get_explanation_workers_config
+from ml_audit.models import ExplanationStatus, PredictionEvent
+from ml_audit.services.buffering import submit_explanation
+from ml_audit.services.explanations import (
+    aattach_explanation,
+    attach_explanation,
+    attach_explanations,
+)
+
+logger = logging.getLogger(__name__)
+
+ExplanationKwargs = Callable[[Any], Dict[str, Any]]
+
+
+def _build_explanation(
+    builder: Callable, features: Any, output: Any, prediction_event: PredictionEvent
+) -> Any:
+    """Run `builder` in a pool worker; coroutine builders get their own event loop."""
+    # Pool workers outlive requests, so each job gets the connection
+    # housekeeping Django does around a request.
+    close_old_connections()
+    try:
+        result = builder(features, output, prediction_event)
+        if inspect.isawaitable(result):
+            result = asyncio.run(_await(result))
+        return result
+    finally:
+        close_old_connections()
+
+
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
+
+
+@dataclass(eq=False)
+class _Task:
+    prediction_id: str
+    prediction_pk: Any
+    method: str
+    to_kwargs: ExplanationKwargs
+    use_buffer: bool
+    deadline: Optional[float]
+    future: Optional[Future] = None
+    settled: bool = False
+    seq: int = field(default_factory=itertools.count().__next__)
+
+
+class ExplanationPool:
+    """
+    Builds explanations on a thread or process pool, off the request thread.
+
+    `submit` reserves a slot in a bounded queue, records a PENDING
+    explanation (unless events are buffered) and hands the builder to the
+    pool. A single collector thread attaches finished results in batches
+    with `attach_explanations` (SUCCESS, or FAILED with the error), and
+    marks explanations FAILED once `timeout` passes; a late result is
+    discarded. Builders cannot be interrupted, so a timed-out builder keeps
+    its slot until it returns.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+        queue_size: int = 1000,
+        timeout: Optional[float] = 30.0,
+    ) -> None:
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor: Optional[Executor] = None
+        self._done: queue.Queue[_Task] = queue.Queue()
+        self._deadlines: List[tuple] = []
+        self._deadlines_lock = threading.Lock()
+        self._outstanding = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._pid = os.getpid()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    # -- producer side -----------------------------------------------------
+
+    def reserve(self) -> bool:
+        """Take a queue slot; False (and counted as rejected) when the queue is full."""
+        if self._slots.acquire(blocking=False):
+            return True
+        self.rejected += 1
+        return False
+
+    def pending_kwargs(self, method: str) -> Dict[str, Any]:
+        return {"method": method, "payload": {}, "status": ExplanationStatus.PENDING}
+
+    def submit(
+        self,
+        builder: Callable,
+        features: Any,
+        output: Any,
+        prediction_event: PredictionEvent,
+        *,
+        to_kwargs: ExplanationKwargs,
+        method: str = "auto",
+        use_buffer: bool = False,
+    ) -> bool:
+        """
+        Queue `builder(features, output, prediction_event)` for the pool.
+
+        Returns False when the queue is full; the caller decides whether to
+        build inline instead.
+        """
+        if not self.reserve():
+            return False
+        try:
+            if not use_buffer:
+                attach_explanation(prediction=prediction_event, **self.pending_kwargs(method))
+            self.dispatch(
+                builder,
+                features,
+                output,
+                prediction_event,
+                to_kwargs=to_kwargs,
+                method=method,
+                use_buffer=use_buffer,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        return True
+
+    async def asubmit(
+        self,
+        builder: Callable,
+        features: Any,
+        output: Any,
+        prediction_event: PredictionEvent,
+        *,
+        to_kwargs: ExplanationKwargs,
+        method: str = "auto",
+        use_buffer: bool = False,
+    ) -> bool:
+        """Async counterpart of `submit` (records the PENDING row with the async ORM)."""
+        if not self.reserve():
+            return False
+        try:
+            if not use_buffer:
+                await aattach_explanation(
+                    prediction=prediction_event, **self.pending_kwargs(method)
+                )
+            self.dispatch(
+                builder,
+                features,
+                output,
+                prediction_event,
+                to_kwargs=to_kwargs,
+                method=method,
+                use_buffer=use_buffer,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        return True
+
+    def dispatch(
+        self,
+        builder: Callable,
+        features: Any,
+        output: Any,
+        prediction_event: PredictionEvent,
+        *,
+        to_kwargs: ExplanationKwargs,
+        method: str,
+        use_buffer: bool,
+    ) -> None:
+        """Hand an already reserved task to the pool."""
+        self.start()
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        task = _Task(
+            prediction_id=prediction_event.prediction_id,
+            prediction_pk=prediction_event.pk,
+            method=method,
+            to_kwargs=to_kwargs,
+            use_buffer=use_buffer,
+            deadline=deadline,
+        )
+        with self._deadlines_lock:
+            self._outstanding += 1
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, task.seq, task))
+        try:
+            task.future = self._get_executor().submit(
+                _build_explanation, builder, features, output, prediction_event
+            )
+        except BaseException:
+            with self._deadlines_lock:
+                self._outstanding -= 1
+            task.settled = True
+            raise
+        self.submitted += 1
+        task.future.add_done_callback(lambda future: self._done.put(task))
+
+    # -- collector side ----------------------------------------------------
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._start_lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="ml-audit-explainer",
+                        )
+        return self._executor
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ml-audit-explanations", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Cancel queued builders and wait for the collector to record what is left."""
+        self._stopping.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _next_wait(self) -> float:
+        with self._deadlines_lock:
+            if not self._deadlines:
+                return 0.5
+            return max(0.0, min(0.5, self._deadlines[0][0] - time.monotonic()))
+
+    def drain(self, timeout: Optional[float] = None) -> None:
+        """Collect results in the calling thread until nothing is outstanding (or `timeout`)."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self._idle():
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            self._collect(self._next_wait())
+
+    def _idle(self) -> bool:
+        with self._deadlines_lock:
+            return self._outstanding == 0 and self._done.empty()
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._idle()):
+            self._collect(self._next_wait())
+        connection.close()
+
+    def _collect(self, wait: float) -> None:
+        finished: List[_Task] = []
+        try:
+            finished.append(self._done.get(timeout=wait))
+            while True:
+                finished.append(self._done.get_nowait())
+        except queue.Empty:
+            pass
+
+        items: List[tuple] = []
+        for task in finished:
+            with self._deadlines_lock:
+                self._outstanding -= 1
+            self._slots.release()
+            if not task.settled:
+                task.settled = True
+                items.append((task, self._result_kwargs(task)))
+        for task in self._expired():
+            task.settled = True
+            self.timed_out += 1
+            items.append(
+                (
+                    task,
+                    {
+                        "method": task.method,
+                        "payload": {"error": "timeout"},
+                        "status": ExplanationStatus.FAILED,
+                    },
+                )
+            )
+
+        if items:
+            self._write(items)
+            close_old_connections()
+
+    def _expired(self) -> List[_Task]:
+        now = time.monotonic()
+        expired = []
+        with self._deadlines_lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                task = heapq.heappop(self._deadlines)[2]
+                if not task.settled:
+                    expired.append(task)
+        return expired
+
+    def _result_kwargs(self, task: _Task) -> Dict[str, Any]:
+        future = task.future
+        try:
+            if future.cancelled():
+                raise RuntimeError("cancelled")
+            kwargs = {"method": task.method, **task.to_kwargs(future.result())}
+        except Exception as exc:
+            logger.warning(
+                "ml-audit explanation builder failed for prediction %s",
+                task.prediction_id,
+                exc_info=True,
+            )
+            return {
+                "method": task.method,
+                "payload": {"error": str(exc) or type(exc).__name__},
+                "status": ExplanationStatus.FAILED,
+            }
+        kwargs.setdefault("status", ExplanationStatus.SUCCESS)
+        return kwargs
+
+    def _write(self, items: List[tuple]) -> None:
+        for task, kwargs in items:
+            if kwargs["status"] == ExplanationStatus.FAILED:
+                self.failed += 1
+            else:
+                self.succeeded += 1
+        try:
+            buffered = [(task, kwargs) for task, kwargs in items if task.use_buffer]
+            for task, kwargs in buffered:
+                submit_explanation(prediction_id=task.prediction_id, **kwargs)
+            direct = [
+                {"prediction": task.prediction_pk, **kwargs}
+                for task, kwargs in items
+                if not task.use_buffer
+            ]
+            if direct:
+                for result in attach_explanations(direct):
+                    if not result.ok:
+                        logger.warning(
+                            "ml-audit could not attach explanation for %s: %s",
+                            result.prediction,
+                            result.error,
+                        )
+        except Exception:
+            logger.exception(
+                "ml-audit failed to record %d explanation result(s)", len(items)
+            )
+
+
+_pool: Optional[ExplanationPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_explanation_pool() -> ExplanationPool:
+    """Return the process-wide explanation pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._pid != os.getpid():
+            config = get_explanation_workers_config()
+            _pool = ExplanationPool(
+                executor=config.executor,
+                max_workers=config.max_workers,
+                queue_size=config.queue_size,
+                timeout=config.timeout,
+            )
+            atexit.register(_pool.stop)
+        return _pool
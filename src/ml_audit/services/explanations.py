@@ -1,11 +1,33 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Dict, Optional, Union
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from ml_audit.models import Explanation, PredictionEvent, PredictionStatus
+from ml_audit.attributions import pack_attributions
+from ml_audit.cache import LRUCache, MemoCache
+from ml_audit.conf import get_explanation_cache_config, get_model_version_cache_config
+from ml_audit.db import audit_database
+from ml_audit.models import Explanation, ModelVersion, PredictionEvent, PredictionStatus
+from ml_audit.routers import note_write
 
 PredictionRef = Union[uuid.UUID, str, PredictionEvent]
 
@@ -25,6 +47,41 @@ def _resolve_prediction(ref: PredictionRef) -> PredictionEvent:
     return PredictionEvent.objects.get(pk=pk)
 
 
+async def _aresolve_prediction(ref: PredictionRef) -> PredictionEvent:
+    if isinstance(ref, PredictionEvent):
+        return ref
+
+    if isinstance(ref, uuid.UUID):
+        return await PredictionEvent.objects.aget(pk=ref)
+
+    try:
+        pk = uuid.UUID(ref)
+    except (ValueError, TypeError):
+        return await PredictionEvent.objects.aget(prediction_id=ref)
+
+    return await PredictionEvent.objects.aget(pk=pk)
+
+
+def _explanation_defaults(
+    *,
+    method: str,
+    payload: Dict[str, Any],
+    summary_text: Optional[str],
+    status: PredictionStatus,
+    method_version: Optional[str],
+    generated_at,
+) -> Dict[str, Any]:
+    return {
+        "method": method,
+        "method_version": method_version or "",
+        "payload": payload,
+        "packed_attributions": None,
+        "summary_text": summary_text or "",
+        "status": status,
+        "generated_at": generated_at or timezone.now(),
+    }
+
+
 def attach_explanation(
     *,
     method: str,
@@ -39,13 +96,469 @@ def attach_explanation(
 
     explanation, created = Explanation.objects.update_or_create(
         prediction=prediction,
-        defaults={
-            "method": method,
-            "method_version": method_version or "",
-            "payload": payload,
-            "summary_text": summary_text or "",
-            "status": status,
-            "generated_at": generated_at or timezone.now(),
-        },
+        defaults=_explanation_defaults(
+            method=method,
+            payload=payload,
+            summary_text=summary_text,
+            status=status,
+            method_version=method_version,
+            generated_at=generated_at,
+        ),
     )
+    note_write()
     return explanation
+
+
+async def aattach_explanation(
+    *,
+    method: str,
+    prediction: PredictionRef,
+    payload: Dict[str, Any],
+    summary_text: Optional[str] = None,
+    status: PredictionStatus = PredictionStatus.SUCCESS,
+    method_version: Optional[str] = None,
+    generated_at=None,
+) -> Explanation:
+    """Async counterpart of `attach_explanation`."""
+    prediction = await _aresolve_prediction(prediction)
+
+    explanation, created = await Explanation.objects.aupdate_or_create(
+        prediction=prediction,
+        defaults=_explanation_defaults(
+            method=method,
+            payload=payload,
+            summary_text=summary_text,
+            status=status,
+            method_version=method_version,
+            generated_at=generated_at,
+        ),
+    )
+    note_write()
+    return explanation
+
+
+_feature_names_cache: LRUCache | None = None
+
+
+def get_feature_names_cache() -> LRUCache:
+    """
+    Return the process-local `ModelVersion.pk -> feature names` cache.
+
+    Sized like the model version cache; entries are added once the
+    transaction that registered or read them commits.
+    """
+    global _feature_names_cache
+    if _feature_names_cache is None:
+        _feature_names_cache = LRUCache(
+            maxsize=get_model_version_cache_config().max_size
+        )
+    return _feature_names_cache
+
+
+def _register_feature_names(model_id: uuid.UUID, feature_names: Sequence[str]) -> None:
+    """
+    Store `feature_names` on the model version the first time they are seen.
+
+    Raises ValueError if the version already has different feature names.
+    """
+    names: Tuple[str, ...] = tuple(str(name) for name in feature_names)
+    cache = get_feature_names_cache()
+    known = cache.get(model_id)
+    if known is None:
+        registered = ModelVersion.objects.filter(
+            pk=model_id, feature_names__isnull=True
+        ).update(feature_names=list(names))
+        if registered:
+            known = names
+        else:
+            known = tuple(
+                ModelVersion.objects.values_list("feature_names", flat=True).get(pk=model_id)
+            )
+        transaction.on_commit(partial(cache.set, model_id, known), using=audit_database())
+    if known != names:
+        raise ValueError(
+            "feature_names differ from the names registered for this model version."
+        )
+
+
+def attach_attributions(
+    *,
+    prediction: PredictionRef,
+    values: Any,
+    feature_names: Optional[Sequence[str]] = None,
+    method: str = "shap",
+    method_version: Optional[str] = None,
+    dtype: str = "float32",
+    top_k: Optional[int] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    summary_text: Optional[str] = None,
+    status: PredictionStatus = PredictionStatus.SUCCESS,
+    generated_at=None,
+) -> Explanation:
+    """
+    Attach a per-feature attribution vector (list or NumPy array) to a prediction.
+
+    Values are packed as `dtype` ("float32" or "float16"), optionally keeping
+    only the `top_k` largest-magnitude entries. `feature_names` are stored
+    once on the prediction's ModelVersion rather than per explanation;
+    `Explanation.attributions` (and the API) expand them back to
+    `{feature name: value}`. `payload` holds any extra JSON (e.g. base value).
+    """
+    prediction = _resolve_prediction(prediction)
+    packed = pack_attributions(values, dtype=dtype, top_k=top_k)
+
+    with transaction.atomic(using=audit_database()):
+        if feature_names is not None:
+            if len(feature_names) != len(values):
+                raise ValueError("feature_names and values must have the same length.")
+            _register_feature_names(prediction.model_id, feature_names)
+
+        defaults = _explanation_defaults(
+            method=method,
+            payload=payload or {},
+            summary_text=summary_text,
+            status=status,
+            method_version=method_version,
+            generated_at=generated_at,
+        )
+        defaults["packed_attributions"] = packed
+        explanation, created = Explanation.objects.update_or_create(
+            prediction=prediction,
+            defaults=defaults,
+        )
+    note_write()
+    return explanation
+
+
+_EXPLANATION_ITEM_FIELDS = frozenset(
+    {
+        "prediction",
+        "method",
+        "payload",
+        "summary_text",
+        "status",
+        "method_version",
+        "generated_at",
+    }
+)
+_REQUIRED_EXPLANATION_ITEM_FIELDS = ("prediction", "method", "payload")
+
+# Columns overwritten when an explanation already exists for the prediction.
+_EXPLANATION_UPDATE_FIELDS = [
+    "method",
+    "method_version",
+    "payload",
+    "packed_attributions",
+    "summary_text",
+    "status",
+    "generated_at",
+]
+
+
+@dataclass(frozen=True)
+class AttachResult:
+    """
+    Outcome of attaching one item through `attach_explanations`.
+
+    `error` describes why the item was skipped (unknown prediction, invalid
+    item); `id` and `created` are only meaningful when it is None.
+    """
+
+    prediction: PredictionRef
+    id: Optional[uuid.UUID] = None
+    created: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _validate_explanation_item(item: Mapping[str, Any]) -> Optional[str]:
+    unknown = set(item) - _EXPLANATION_ITEM_FIELDS
+    if unknown:
+        return f"Unexpected explanation field(s): {', '.join(sorted(unknown))}"
+    missing = [name for name in _REQUIRED_EXPLANATION_ITEM_FIELDS if name not in item]
+    if missing:
+        return f"Missing required explanation field(s): {', '.join(missing)}"
+    return None
+
+
+def _bulk_resolve_predictions(refs: Iterable[PredictionRef]) -> Dict[Any, uuid.UUID]:
+    """
+    Map each prediction reference to a PredictionEvent pk with a single query.
+
+    String references that parse as UUIDs are matched against the primary
+    key first, like `attach_explanation`, and then against `prediction_id`.
+    """
+    resolved: Dict[Any, uuid.UUID] = {}
+    prediction_ids = set()
+    pks = set()
+    for ref in refs:
+        if isinstance(ref, PredictionEvent):
+            resolved[ref] = ref.pk
+        elif isinstance(ref, uuid.UUID):
+            pks.add(ref)
+        else:
+            prediction_ids.add(str(ref))
+            try:
+                pks.add(uuid.UUID(str(ref)))
+            except ValueError:
+                pass
+
+    if not prediction_ids and not pks:
+        return resolved
+
+    by_prediction_id: Dict[str, uuid.UUID] = {}
+    by_pk = set()
+    rows = PredictionEvent.objects.filter(
+        Q(prediction_id__in=prediction_ids) | Q(pk__in=pks)
+    ).values_list("pk", "prediction_id")
+    for pk, prediction_id in rows:
+        by_prediction_id[prediction_id] = pk
+        by_pk.add(pk)
+
+    for ref in prediction_ids:
+        try:
+            pk = uuid.UUID(ref)
+        except ValueError:
+            pk = None
+        if pk in by_pk:
+            resolved[ref] = pk
+        elif ref in by_prediction_id:
+            resolved[ref] = by_prediction_id[ref]
+    for pk in pks:
+        if pk in by_pk:
+            resolved.setdefault(pk, pk)
+    return resolved
+
+
+def _ref_key(ref: PredictionRef) -> Any:
+    if isinstance(ref, (PredictionEvent, uuid.UUID)):
+        return ref
+    return str(ref)
+
+
+def _attach_explanation_chunk(items: List[Mapping[str, Any]]) -> List[AttachResult]:
+    results: List[Optional[AttachResult]] = [None] * len(items)
+    valid: List[int] = []
+    for position, item in enumerate(items):
+        error = _validate_explanation_item(item)
+        if error is not None:
+            results[position] = AttachResult(prediction=item.get("prediction"), error=error)
+        else:
+            valid.append(position)
+
+    prediction_pks = _bulk_resolve_predictions(
+        _ref_key(items[position]["prediction"]) for position in valid
+    )
+
+    # One row per prediction: a later item for the same prediction wins.
+    latest: Dict[uuid.UUID, int] = {}
+    for position in valid:
+        ref = items[position]["prediction"]
+        pk = prediction_pks.get(_ref_key(ref))
+        if pk is None:
+            results[position] = AttachResult(prediction=ref, error="Prediction not found.")
+        else:
+            latest[pk] = position
+
+    existing = dict(
+        Explanation.objects.filter(prediction_id__in=list(latest)).values_list(
+            "prediction_id", "pk"
+        )
+    )
+    explanations = []
+    for prediction_pk, position in latest.items():
+        item = items[position]
+        explanation = Explanation(
+            prediction_id=prediction_pk,
+            **_explanation_defaults(
+                method=item["method"],
+                payload=item["payload"],
+                summary_text=item.get("summary_text"),
+                status=item.get("status") or PredictionStatus.SUCCESS,
+                method_version=item.get("method_version"),
+                generated_at=item.get("generated_at"),
+            ),
+        )
+        explanations.append(explanation)
+
+    if explanations:
+        Explanation.objects.bulk_create(
+            explanations,
+            update_conflicts=True,
+            unique_fields=["prediction"],
+            update_fields=_EXPLANATION_UPDATE_FIELDS,
+        )
+
+    # Rows that already existed keep their primary key on update.
+    ids = {
+        explanation.prediction_id: existing.get(explanation.prediction_id, explanation.pk)
+        for explanation in explanations
+    }
+    for position in valid:
+        if results[position] is not None:
+            continue
+        ref = items[position]["prediction"]
+        prediction_pk = prediction_pks[_ref_key(ref)]
+        results[position] = AttachResult(
+            prediction=ref,
+            id=ids[prediction_pk],
+            created=prediction_pk not in existing and latest[prediction_pk] == position,
+        )
+    return results
+
+
+def attach_explanations(
+    items: Iterable[Mapping[str, Any]], *, batch_size: int = 500
+) -> List[AttachResult]:
+    """
+    Attach (insert or replace) many explanations using chunked bulk upserts.
+
+    Each item is a mapping with the keyword arguments of `attach_explanation`.
+    Per chunk, all prediction references are resolved with one query and the
+    explanations are written with one `INSERT ... ON CONFLICT (prediction)
+    DO UPDATE`. Items that cannot be attached are reported through
+    `AttachResult.error` rather than raised; when several items target the
+    same prediction, the last one wins.
+
+    Returns one `AttachResult` per input item, in input order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+
+    results: List[AttachResult] = []
+    using = audit_database()
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            return results
+        with transaction.atomic(using=using):
+            results.extend(_attach_explanation_chunk(chunk))
+        note_write()
+
+
+# (model_name, model_version, input_fingerprint, method, method_version)
+ExplanationKey = Tuple[str, str, str, str, str]
+
+
+def explanation_key(
+    *,
+    model_name: str,
+    model_version: str,
+    input_fingerprint: str,
+    method: str,
+    method_version: Optional[str] = None,
+) -> ExplanationKey:
+    return (model_name, model_version, input_fingerprint, method, method_version or "")
+
+
+class ExplanationCache(MemoCache):
+    """
+    Memoizes explanation payloads by model version, input fingerprint and method.
+
+    The database fallback returns the latest successful stored Explanation
+    for a prediction of the same model version with the same
+    `input_fingerprint`. Values are `{"payload": ..., "summary_text": ...}`
+    dicts.
+    """
+
+    def remember(self, key: ExplanationKey, explanation_kwargs: Mapping[str, Any]) -> None:
+        self._memory.set(
+            key,
+            {
+                "payload": explanation_kwargs["payload"],
+                "summary_text": explanation_kwargs.get("summary_text") or "",
+            },
+        )
+
+    def _query(self, key: ExplanationKey) -> Optional[Dict[str, Any]]:
+        model_name, model_version, input_fingerprint, method, method_version = key
+        explanations = Explanation.objects.filter(
+            prediction__model_name=model_name,
+            prediction__model_version=model_version,
+            prediction__input_fingerprint=input_fingerprint,
+            method=method,
+            method_version=method_version,
+            status=PredictionStatus.SUCCESS,
+            packed_attributions__isnull=True,
+        )
+        if self.ttl is not None:
+            explanations = explanations.filter(
+                generated_at__gte=timezone.now() - timedelta(seconds=self.ttl)
+            )
+        row = explanations.order_by("-generated_at").values_list(
+            "payload", "summary_text"
+        ).first()
+        if row is None:
+            return None
+        return {"payload": row[0], "summary_text": row[1]}
+
+
+_explanation_cache: ExplanationCache | None = None
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Return the process-local explanation cache configured by `ML_AUDIT_EXPLANATION_CACHE`."""
+    global _explanation_cache
+    if _explanation_cache is None:
+        config = get_explanation_cache_config()
+        _explanation_cache = ExplanationCache(
+            maxsize=config.max_size, ttl=config.ttl, database=config.database
+        )
+    return _explanation_cache
+
+
+def attach_memoized_explanation(
+    *,
+    prediction: PredictionRef,
+    method: str,
+    build: Callable[[], Mapping[str, Any]],
+    method_version: Optional[str] = None,
+    input_fingerprint: Optional[str] = None,
+    generated_at=None,
+) -> Explanation:
+    """
+    Attach an explanation, reusing a cached one for identical inputs.
+
+    `build()` returns `{"payload": ..., "summary_text": ...}` and is only
+    called when no explanation is cached for the prediction's model version,
+    `input_fingerprint` (default: the prediction's own) and method. Without
+    a fingerprint nothing can be matched, so `build()` always runs.
+    """
+    prediction = _resolve_prediction(prediction)
+    input_fingerprint = input_fingerprint or prediction.input_fingerprint
+    if not input_fingerprint:
+        return attach_explanation(
+            prediction=prediction,
+            method=method,
+            method_version=method_version,
+            generated_at=generated_at,
+            **_memoized_kwargs(build()),
+        )
+
+    key = explanation_key(
+        model_name=prediction.model_name,
+        model_version=prediction.model_version,
+        input_fingerprint=input_fingerprint,
+        method=method,
+        method_version=method_version,
+    )
+    cache = get_explanation_cache()
+    cached = cache.lookup(key)
+    if cached is None:
+        cached = _memoized_kwargs(build())
+        cache.remember(key, cached)
+    return attach_explanation(
+        prediction=prediction,
+        method=method,
+        method_version=method_version,
+        generated_at=generated_at,
+        **cached,
+    )
+
+
+def _memoized_kwargs(data: Mapping[str, Any]) -> Dict[str, Any]:
+    return {"payload": data["payload"], "summary_text": data.get("summary_text")}
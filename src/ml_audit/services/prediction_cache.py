@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, NamedTuple, Optional, Tuple
+
+from django.utils import timezone
+
+from ml_audit.cache import MemoCache
+from ml_audit.conf import get_fingerprint_config, get_prediction_cache_config
+from ml_audit.models import PredictionEvent, PredictionStatus
+
+# (model_name, model_version, raw input fingerprint)
+PredictionKey = Tuple[str, str, str]
+
+
+class CachedPrediction(NamedTuple):
+    output: Any
+    prediction_id: str
+
+
+class PredictionCache(MemoCache):
+    """
+    Recorded outputs of deterministic model versions, keyed by raw input fingerprint.
+
+    The database fallback returns the latest successful PredictionEvent of
+    the same model version with the same `input_fingerprint`. Stored
+    fingerprints are only comparable when they are computed from the raw
+    features, so it is skipped unless `ML_AUDIT_FINGERPRINT["SOURCE"]` is "raw".
+    """
+
+    def remember(self, key: PredictionKey, output: Any, prediction_id: str) -> None:
+        self._memory.set(key, CachedPrediction(output=output, prediction_id=prediction_id))
+
+    def _use_database(self) -> bool:
+        return self.database and get_fingerprint_config().source == "raw"
+
+    def _query(self, key: PredictionKey) -> Optional[CachedPrediction]:
+        model_name, model_version, input_fingerprint = key
+        events = PredictionEvent.objects.filter(
+            model_name=model_name,
+            model_version=model_version,
+            input_fingerprint=input_fingerprint,
+            status=PredictionStatus.SUCCESS,
+        )
+        if self.ttl is not None:
+            events = events.filter(timestamp__gte=timezone.now() - timedelta(seconds=self.ttl))
+        row = events.order_by("-timestamp").values_list("output", "prediction_id").first()
+        if row is None:
+            return None
+        return CachedPrediction(output=row[0], prediction_id=row[1])
+
+
+_prediction_cache: PredictionCache | None = None
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Return the process-local prediction cache configured by `ML_AUDIT_PREDICTION_CACHE`."""
+    global _prediction_cache
+    if _prediction_cache is None:
+        config = get_prediction_cache_config()
+        _prediction_cache = PredictionCache(
+            maxsize=config.max_size, ttl=config.ttl, database=config.database
+        )
+    return _prediction_cache
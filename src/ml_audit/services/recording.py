@@ -1,19 +1,62 @@
 from __future__ import annotations
 
+import logging
 import uuid
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import partial, wraps
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.db import (
+    DatabaseError,
+    InterfaceError,
+    OperationalError,
+    close_old_connections,
+    connections,
+    router,
+    transaction,
+)
 from django.utils import timezone
 
-from ml_audit.conf import get_redaction_config
+from ml_audit.cache import LRUCache
+from ml_audit.conf import (
+    get_actor_cache_config,
+    get_feature_storage_config,
+    get_fingerprint_config,
+    get_model_version_cache_config,
+    get_rollup_config,
+    get_sketch_config,
+    get_spool_config,
+)
+from ml_audit.db import audit_database, supports_insert_ignore
+from ml_audit.fingerprint import compute_fingerprint, fingerprint_many
+from ml_audit.ids import new_id
 from ml_audit.models import (
+    FeatureSnapshot,
     ModelVersion,
     PredictionEvent,
     PredictionStatus,
     RequestingActor,
 )
+from ml_audit.partitioning import is_partitioned, lock_prediction_ids
+from ml_audit.redaction import redact_features
+from ml_audit.routers import note_write
+from ml_audit.services.rollups import add_to_rollups
+from ml_audit.services.sketches import observe_recorded_events
+from ml_audit.spool import get_spool_writer
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -30,6 +73,28 @@ class ActorPayload:
     auth_token: Dict[str, Any] | None = None
 
 
+ModelVersionKey = Tuple[str, str]
+ActorKey = Tuple[str, str, str]
+
+
+def _actor_key(payload: ActorPayload) -> ActorKey:
+    return (payload.actor_type, payload.actor_id, payload.tenant_id or "")
+
+
+def _denormalized_fields(
+    model_name: str, model_version: str, actor: Optional[ActorPayload]
+) -> Dict[str, str]:
+    """The model/actor columns copied onto each PredictionEvent."""
+    fields = {"model_name": model_name, "model_version": model_version}
+    if actor is not None:
+        fields.update(
+            actor_type=actor.actor_type,
+            actor_external_id=actor.actor_id,
+            tenant_id=actor.tenant_id or "",
+        )
+    return fields
+
+
 def _get_or_create_model_version(
     *,
     model_name: str,
@@ -50,13 +115,128 @@ def _get_or_create_model_version(
     if config_snapshot is not None:
         defaults["config_snapshot"] = config_snapshot
 
-    obj, created = ModelVersion.objects.get_or_create(
+    using = router.db_for_write(ModelVersion)
+    if not supports_insert_ignore(using):
+        obj, created = ModelVersion.objects.get_or_create(
+            model_name=model_name,
+            version=model_version,
+            defaults=defaults,
+        )
+        return obj
+
+    # Known versions are the common case, so look up first; a new version is
+    # inserted with ON CONFLICT DO NOTHING so a concurrent insert of the same
+    # version cannot raise IntegrityError inside the surrounding atomic block.
+    lookup = ModelVersion.objects.using(using).filter(
+        model_name=model_name, version=model_version
+    )
+    obj = lookup.first()
+    if obj is None:
+        ModelVersion.objects.using(using).bulk_create(
+            [ModelVersion(model_name=model_name, version=model_version, **defaults)],
+            ignore_conflicts=True,
+        )
+        # Ours or a concurrent writer's row; bulk_create cannot tell which.
+        obj = lookup.get()
+    return obj
+
+
+_model_version_cache: LRUCache | None = None
+
+
+def get_model_version_cache() -> LRUCache:
+    """
+    Return the process-local `(model_name, version) -> ModelVersion.pk` cache.
+
+    Entries are only added once the transaction that resolved them commits,
+    and are invalidated by ModelVersion post_save/post_delete signals.
+    """
+    global _model_version_cache
+    if _model_version_cache is None:
+        _model_version_cache = LRUCache(
+            maxsize=get_model_version_cache_config().max_size
+        )
+    return _model_version_cache
+
+
+def warm_model_version_cache() -> int:
+    """Preload active model versions into the cache. Returns the number loaded."""
+    cache = get_model_version_cache()
+    try:
+        rows = list(
+            ModelVersion.objects.filter(is_active=True)
+            .order_by("-updated_at")
+            .values_list("model_name", "version", "pk")[: cache.maxsize]
+        )
+    except DatabaseError:
+        # Tables may not exist yet (e.g. before the first migrate).
+        return 0
+    for model_name, version, pk in reversed(rows):
+        cache.set((model_name, version), pk)
+    return len(rows)
+
+
+def _resolve_model_version_id(
+    *,
+    model_name: str,
+    model_version: str,
+    framework: str | None = None,
+    build_id: str | None = None,
+    commit_hash: str | None = None,
+    config_snapshot: Optional[Dict[str, Any]] = None,
+) -> uuid.UUID:
+    """Resolve a model version primary key, consulting the process-local cache first."""
+    cache = get_model_version_cache()
+    key = (model_name, model_version)
+    pk = cache.get(key)
+    if pk is not None:
+        return pk
+
+    obj = _get_or_create_model_version(
         model_name=model_name,
-        version=model_version,
-        defaults=defaults,
+        model_version=model_version,
+        framework=framework,
+        build_id=build_id,
+        commit_hash=commit_hash,
+        config_snapshot=config_snapshot,
     )
+    transaction.on_commit(partial(cache.set, key, obj.pk), using=audit_database())
+    return obj.pk
 
-    return obj
+
+_actor_cache: LRUCache | None = None
+
+
+def get_actor_cache() -> LRUCache:
+    """
+    Return the process-local `(actor_type, actor_id, tenant_id) -> RequestingActor.pk` cache.
+
+    Sized and expired according to `ML_AUDIT_ACTOR_CACHE`; entries are only
+    added once the transaction that resolved them commits.
+    """
+    global _actor_cache
+    if _actor_cache is None:
+        config = get_actor_cache_config()
+        _actor_cache = LRUCache(maxsize=config.max_size, ttl=config.ttl)
+    return _actor_cache
+
+
+def _resolve_actor_id(*, payload: Optional[ActorPayload]) -> Optional[uuid.UUID]:
+    """
+    Resolve a requesting actor primary key, consulting the process-local cache first.
+
+    Concurrent misses for the same actor wait for a single database lookup;
+    they reuse its result once it is committed and otherwise look the actor
+    up themselves, so a rolled-back insert is never handed to another caller.
+    """
+    if payload is None:
+        return None
+
+    return get_actor_cache().get_or_load(
+        _actor_key(payload),
+        lambda: _get_or_create_actor(payload=payload).pk,
+        defer=partial(transaction.on_commit, using=audit_database()),
+    )
 
 
 def _get_or_create_actor(
@@ -80,22 +260,203 @@ def _get_or_create_actor(
     return obj
 
 
+# Snapshots are shared by every event with the same fingerprint, so floats
+# are hashed at full (round-trip) precision rather than `FLOAT_PRECISION`.
+_SNAPSHOT_FLOAT_PRECISION = 17
+
+_feature_snapshot_cache: LRUCache | None = None
+
+
+def get_feature_snapshot_cache() -> LRUCache:
+    """
+    Return the process-local `fingerprint -> FeatureSnapshot.pk` cache.
+
+    Snapshots are immutable, so entries never go stale; they are only added
+    once the transaction that resolved them commits.
+    """
+    global _feature_snapshot_cache
+    if _feature_snapshot_cache is None:
+        _feature_snapshot_cache = LRUCache(
+            maxsize=get_feature_storage_config().cache_size
+        )
+    return _feature_snapshot_cache
+
+
+def _snapshot_fingerprint(features: Dict[str, Any]) -> str:
+    return compute_fingerprint(features, float_precision=_SNAPSHOT_FLOAT_PRECISION)
+
+
+def _resolve_feature_snapshot_id(features: Dict[str, Any]) -> uuid.UUID:
+    """Store redacted `features` once, returning the primary key of their snapshot."""
+    fingerprint = _snapshot_fingerprint(features)
+    cache = get_feature_snapshot_cache()
+    pk = cache.get(fingerprint)
+    if pk is not None:
+        return pk
+
+    using = router.db_for_write(FeatureSnapshot)
+    if supports_insert_ignore(using):
+        lookup = FeatureSnapshot.objects.using(using).filter(fingerprint=fingerprint)
+        pk = lookup.values_list("pk", flat=True).first()
+        if pk is None:
+            FeatureSnapshot.objects.using(using).bulk_create(
+                [FeatureSnapshot(fingerprint=fingerprint, features=features)],
+                ignore_conflicts=True,
+            )
+            pk = lookup.values_list("pk", flat=True).get()
+    else:
+        obj, created = FeatureSnapshot.objects.get_or_create(
+            fingerprint=fingerprint, defaults={"features": features}
+        )
+        pk = obj.pk
+    transaction.on_commit(partial(cache.set, fingerprint, pk), using=using)
+    return pk
+
+
+_EVENT_PAYLOAD_FIELDS = frozenset(
+    {
+        "model_name",
+        "model_version",
+        "features",
+        "output",
+        "decision_outcome",
+        "actor",
+        "environment",
+        "trace_id",
+        "latency_ms",
+        "status",
+        "confidence",
+        "metadata",
+        "input_fingerprint",
+        "framework",
+        "build_id",
+        "commit_hash",
+        "config_snapshot",
+        "prediction_id",
+        "timestamp",
+    }
+)
+_REQUIRED_EVENT_PAYLOAD_FIELDS = ("model_name", "model_version", "features", "output")
+
+
+@dataclass(frozen=True)
+class RecordResult:
+    """
+    Outcome of recording a single event through `record_prediction_events`.
+
+    `created` is False when an event with the same `prediction_id` already
+    existed (or appeared earlier in the same batch); `id` then points at
+    the stored event.
+    """
+
+    prediction_id: str
+    id: uuid.UUID
+    created: bool
+
+    @property
+    def duplicate(self) -> bool:
+        return not self.created
+
+
 def _redact_features(features: Dict[str, Any]) -> Dict[str, Any]:
-    config = get_redaction_config()
-    redacted: Dict[str, Any] = {}
+    return redact_features(features)
 
-    for key, value in features.items():
-        key_str = str(key)
 
-        if config.is_sensitive(key_str):
-            redacted[key_str] = config.mask_value
-        else:
-            redacted[key_str] = value
+def _auto_fingerprint(
+    features: Dict[str, Any],
+    redacted_features: Dict[str, Any],
+    auto_fingerprint: bool | None,
+) -> str | None:
+    """The fingerprint `auto_fingerprint` asks for, computed per `ML_AUDIT_FINGERPRINT`."""
+    fingerprint_config = get_fingerprint_config()
+    if not (auto_fingerprint if auto_fingerprint is not None else fingerprint_config.enabled):
+        return None
+    return compute_fingerprint(
+        features if fingerprint_config.source == "raw" else redacted_features
+    )
+
+
+def _spool_event(event_kwargs: Dict[str, Any]) -> PredictionEvent:
+    """
+    Append an event to the local spool and return it as an unsaved instance.
+
+    Only the fields replay accepts are spooled. The fingerprint is resolved
+    here, while the raw features are still at hand, so replay stores the
+    same `input_fingerprint` a direct write would have.
+    """
+    redacted_features = _redact_features(event_kwargs["features"])
+    input_fingerprint = event_kwargs.get("input_fingerprint")
+    if input_fingerprint is None:
+        input_fingerprint = _auto_fingerprint(
+            event_kwargs["features"], redacted_features, event_kwargs.get("auto_fingerprint")
+        )
+    event_kwargs = {
+        **{name: value for name, value in event_kwargs.items() if name in _EVENT_PAYLOAD_FIELDS},
+        "features": redacted_features,
+        "input_fingerprint": input_fingerprint or "",
+    }
+    get_spool_writer().append(event_kwargs)
+    return PredictionEvent(
+        prediction_id=event_kwargs["prediction_id"],
+        timestamp=event_kwargs["timestamp"],
+        features=event_kwargs["features"],
+        output=event_kwargs["output"],
+        status=event_kwargs.get("status") or PredictionStatus.SUCCESS,
+        environment=event_kwargs.get("environment") or "",
+    )
+
+
+def _with_spool(func: Callable[..., PredictionEvent]) -> Callable[..., PredictionEvent]:
+    """
+    Route events through the local spool when `ML_AUDIT_SPOOL` is configured.
+
+    In "fallback" mode the event is spooled only if the database is
+    unreachable; in "always" mode it is spooled without touching the
+    database. Spooled events are returned unsaved and written later by
+    `manage.py ml_audit_replay_spool`.
+    """
+
+    @wraps(func)
+    def wrapper(**kwargs: Any) -> PredictionEvent:
+        config = get_spool_config()
+        if not config.enabled:
+            return func(**kwargs)
+
+        # Fix the identity up front so the spooled copy matches any row a
+        # partially successful attempt may have written.
+        kwargs["prediction_id"] = kwargs.get("prediction_id") or str(new_id())
+        kwargs["timestamp"] = kwargs.get("timestamp") or timezone.now()
 
-    return redacted
+        if config.mode == "always":
+            return _spool_event(kwargs)
+        try:
+            return func(**kwargs)
+        except (OperationalError, InterfaceError):
+            logger.warning(
+                "Audit database unavailable; spooling prediction %s",
+                kwargs["prediction_id"],
+                exc_info=True,
+            )
+            return _spool_event(kwargs)
 
+    return wrapper
 
-@transaction.atomic
+
+def _in_audit_transaction(func: Callable[..., PredictionEvent]) -> Callable[..., PredictionEvent]:
+    """Run `func` in `transaction.atomic` on the audit database, resolved per call."""
+
+    @wraps(func)
+    def wrapper(**kwargs: Any) -> PredictionEvent:
+        with transaction.atomic(using=audit_database()):
+            event = func(**kwargs)
+        note_write()
+        return event
+
+    return wrapper
+
+
+@_with_spool
+@_in_audit_transaction
 def record_prediction_event(
     *,
     model_name: str,
@@ -117,11 +478,23 @@ def record_prediction_event(
     config_snapshot: Optional[Dict[str, Any]] = None,
     prediction_id: str | None = None,
     timestamp=None,
+    auto_fingerprint: bool | None = None,
 ) -> PredictionEvent:
     """
     Record a prediction event in the audit log.
+
+    When no `input_fingerprint` is given and `auto_fingerprint` is true
+    (default: `ML_AUDIT_FINGERPRINT["ENABLED"]`), one is computed from the
+    redacted (or, if configured, raw) features.
+
+    With `ML_AUDIT_FEATURE_STORAGE["MODE"] = "snapshot"` the redacted
+    features are stored once per distinct payload in `FeatureSnapshot` and
+    the event references it instead of holding them inline.
+
+    When `ML_AUDIT_SPOOL` is configured the event may instead be appended
+    to the local spool and returned unsaved (see `_with_spool`).
     """
-    model_version_obj = _get_or_create_model_version(
+    model_version_id = _resolve_model_version_id(
         model_name=model_name,
         model_version=model_version,
         framework=framework,
@@ -130,29 +503,435 @@ def record_prediction_event(
         config_snapshot=config_snapshot,
     )
 
-    requesting_actor = _get_or_create_actor(payload=actor)
+    requesting_actor_id = _resolve_actor_id(payload=actor)
 
     redacted_features = _redact_features(features)
 
-    prediction_id = prediction_id or str(uuid.uuid4())
+    if input_fingerprint is None:
+        input_fingerprint = _auto_fingerprint(features, redacted_features, auto_fingerprint)
 
-    prediction_event, created = PredictionEvent.objects.get_or_create(
-        prediction_id=prediction_id,
-        defaults={
-            "model": model_version_obj,
-            "actor": requesting_actor,
-            "features": redacted_features,
-            "output": output,
-            "decision_outcome": decision_outcome or "",
-            "environment": environment or "",
-            "trace_id": trace_id or "",
-            "latency_ms": latency_ms,
-            "status": status,
-            "confidence": confidence,
-            "metadata": metadata or {},
-            "input_fingerprint": input_fingerprint or "",
-            "timestamp": timestamp or timezone.now(),
-        },
-    )
+    prediction_id = prediction_id or str(new_id())
+
+    fields = {
+        "model_id": model_version_id,
+        "actor_id": requesting_actor_id,
+        **_denormalized_fields(model_name, model_version, actor),
+        "features": redacted_features,
+        "output": output,
+        "decision_outcome": decision_outcome or "",
+        "environment": environment or "",
+        "trace_id": trace_id or "",
+        "latency_ms": latency_ms,
+        "status": status,
+        "confidence": confidence,
+        "metadata": metadata or {},
+        "input_fingerprint": input_fingerprint or "",
+        "timestamp": timestamp or timezone.now(),
+    }
+    if get_feature_storage_config().use_snapshots:
+        fields["feature_snapshot_id"] = _resolve_feature_snapshot_id(redacted_features)
+        fields["features"] = None
+
+    using = router.db_for_write(PredictionEvent)
+    if is_partitioned(using):
+        prediction_event, created = _insert_partitioned_event(
+            prediction_id, fields, using=using
+        )
+    elif supports_insert_ignore(using):
+        # INSERT ... ON CONFLICT DO NOTHING, so a concurrent duplicate cannot
+        # raise IntegrityError inside the surrounding atomic block. The stored
+        # primary key tells whether this insert or an earlier one won.
+        prediction_event = PredictionEvent(prediction_id=prediction_id, **fields)
+        events = PredictionEvent.objects.using(using)
+        events.bulk_create([prediction_event], ignore_conflicts=True)
+        stored_pk = events.values_list("pk", flat=True).get(prediction_id=prediction_id)
+        created = stored_pk == prediction_event.pk
+        if not created:
+            prediction_event = events.get(pk=stored_pk)
+    else:
+        prediction_event, created = PredictionEvent.objects.get_or_create(
+            prediction_id=prediction_id,
+            defaults=fields,
+        )
+
+    if created and get_rollup_config().inline:
+        add_to_rollups([prediction_event], using=using)
+    if created and get_sketch_config().enabled:
+        observe_recorded_events([prediction_event], using=using)
 
     return prediction_event
+
+
+def _insert_partitioned_event(
+    prediction_id: str, fields: Dict[str, Any], *, using: str
+) -> Tuple[PredictionEvent, bool]:
+    # A partitioned table can only enforce (prediction_id, timestamp)
+    # uniqueness, so writers of the same prediction_id are serialized instead.
+    with transaction.atomic(using=using):
+        lock_prediction_ids(connections[using], [prediction_id])
+        existing = (
+            PredictionEvent.objects.using(using).filter(prediction_id=prediction_id).first()
+        )
+        if existing is not None:
+            return existing, False
+        prediction_event = PredictionEvent(prediction_id=prediction_id, **fields)
+        PredictionEvent.objects.using(using).bulk_create([prediction_event])
+        return prediction_event, True
+
+
+def _record_in_worker_thread(**kwargs: Any) -> PredictionEvent:
+    try:
+        return record_prediction_event(**kwargs)
+    finally:
+        # Executor threads never see request_finished; honour CONN_MAX_AGE here.
+        close_old_connections()
+
+
+async def arecord_prediction_event(**kwargs: Any) -> PredictionEvent:
+    """
+    Async counterpart of `record_prediction_event`; accepts the same keyword arguments.
+
+    The whole atomic unit (model/actor resolution and the insert) runs in a
+    single hop to the thread pool rather than one hop per ORM call, and is
+    not pinned to the shared thread-sensitive executor, so concurrent async
+    views are not serialised behind one thread.
+    """
+    return await sync_to_async(_record_in_worker_thread, thread_sensitive=False)(
+        **kwargs
+    )
+
+
+def _coerce_actor(actor: Any) -> Optional[ActorPayload]:
+    if actor is None or isinstance(actor, ActorPayload):
+        return actor
+    return ActorPayload(**actor)
+
+
+def _validate_event_payload(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    unknown = set(payload) - _EVENT_PAYLOAD_FIELDS
+    if unknown:
+        raise TypeError(
+            f"Unexpected prediction event field(s): {', '.join(sorted(unknown))}"
+        )
+    missing = [name for name in _REQUIRED_EVENT_PAYLOAD_FIELDS if name not in payload]
+    if missing:
+        raise TypeError(
+            f"Missing required prediction event field(s): {', '.join(missing)}"
+        )
+    event = dict(payload)
+    event["actor"] = _coerce_actor(event.get("actor"))
+    return event
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_resolve_model_versions(
+    events: List[Dict[str, Any]], resolved: Dict[ModelVersionKey, uuid.UUID]
+) -> None:
+    """Resolve (or create) every model version referenced by `events` not yet in `resolved`."""
+    cache = get_model_version_cache()
+    pending: Dict[ModelVersionKey, Dict[str, Any]] = {}
+    for event in events:
+        key = (event["model_name"], event["model_version"])
+        if key in resolved or key in pending:
+            continue
+        cached_pk = cache.get(key)
+        if cached_pk is not None:
+            resolved[key] = cached_pk
+            continue
+        defaults: Dict[str, Any] = {}
+        for field_name in ("framework", "build_id", "commit_hash", "config_snapshot"):
+            if event.get(field_name) is not None:
+                defaults[field_name] = event[field_name]
+        pending[key] = defaults
+
+    if not pending:
+        return
+    using = audit_database()
+
+    def _lookup() -> None:
+        rows = ModelVersion.objects.filter(
+            model_name__in={name for name, _ in pending},
+            version__in={version for _, version in pending},
+        ).values_list("model_name", "version", "pk")
+        for model_name, version, pk in rows:
+            key = (model_name, version)
+            if key in pending:
+                resolved[key] = pk
+                del pending[key]
+                transaction.on_commit(partial(cache.set, key, pk), using=using)
+
+    _lookup()
+    if pending:
+        ModelVersion.objects.bulk_create(
+            [
+                ModelVersion(model_name=name, version=version, **defaults)
+                for (name, version), defaults in pending.items()
+            ],
+            ignore_conflicts=True,
+        )
+        _lookup()
+
+
+def _bulk_resolve_actors(
+    events: List[Dict[str, Any]], resolved: Dict[ActorKey, uuid.UUID]
+) -> None:
+    """Resolve (or create) every requesting actor referenced by `events` not yet in `resolved`."""
+    cache = get_actor_cache()
+    pending: Dict[ActorKey, ActorPayload] = {}
+    for event in events:
+        payload = event["actor"]
+        if payload is None:
+            continue
+        key = _actor_key(payload)
+        if key in resolved or key in pending:
+            continue
+        cached_pk = cache.get(key)
+        if cached_pk is not None:
+            resolved[key] = cached_pk
+        else:
+            pending[key] = payload
+
+    if not pending:
+        return
+    using = audit_database()
+
+    def _lookup() -> None:
+        rows = RequestingActor.objects.filter(
+            actor_id__in={key[1] for key in pending}
+        ).values_list("actor_type", "actor_id", "tenant_id", "pk")
+        for actor_type, actor_id, tenant_id, pk in rows:
+            key = (actor_type, actor_id, tenant_id)
+            if key in pending:
+                resolved[key] = pk
+                del pending[key]
+                transaction.on_commit(partial(cache.set, key, pk), using=using)
+
+    _lookup()
+    if pending:
+        RequestingActor.objects.bulk_create(
+            [
+                RequestingActor(
+                    actor_type=payload.actor_type,
+                    actor_id=payload.actor_id,
+                    tenant_id=payload.tenant_id or "",
+                    ip_address=payload.ip_address,
+                    user_agent=payload.user_agent or "",
+                    auth_context=payload.auth_token,
+                )
+                for payload in pending.values()
+            ],
+            ignore_conflicts=True,
+        )
+        _lookup()
+
+
+def _bulk_resolve_feature_snapshots(
+    features: Iterable[Dict[str, Any]],
+) -> List[uuid.UUID]:
+    """Store each distinct payload in `features` once; return snapshot keys in input order."""
+    features = list(features)
+    cache = get_feature_snapshot_cache()
+    fingerprints = fingerprint_many(features, float_precision=_SNAPSHOT_FLOAT_PRECISION)
+
+    resolved: Dict[str, uuid.UUID] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    using = audit_database()
+    for fingerprint, payload in zip(fingerprints, features):
+        if fingerprint in resolved or fingerprint in pending:
+            continue
+        cached_pk = cache.get(fingerprint)
+        if cached_pk is not None:
+            resolved[fingerprint] = cached_pk
+        else:
+            pending[fingerprint] = payload
+
+    def _lookup() -> None:
+        rows = FeatureSnapshot.objects.filter(fingerprint__in=list(pending)).values_list(
+            "fingerprint", "pk"
+        )
+        for fingerprint, pk in rows:
+            resolved[fingerprint] = pk
+            del pending[fingerprint]
+            transaction.on_commit(partial(cache.set, fingerprint, pk), using=using)
+
+    if pending:
+        _lookup()
+    if pending:
+        FeatureSnapshot.objects.bulk_create(
+            [
+                FeatureSnapshot(fingerprint=fingerprint, features=payload)
+                for fingerprint, payload in pending.items()
+            ],
+            ignore_conflicts=True,
+        )
+        _lookup()
+
+    return [resolved[fingerprint] for fingerprint in fingerprints]
+
+
+def _insert_event_chunk(
+    events: List[Dict[str, Any]],
+    model_ids: Dict[ModelVersionKey, uuid.UUID],
+    actor_ids: Dict[ActorKey, uuid.UUID],
+    *,
+    auto_fingerprint: bool,
+) -> List[RecordResult]:
+    now = timezone.now()
+    unique_events: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        event["prediction_id"] = event.get("prediction_id") or str(new_id())
+        if event["prediction_id"] not in unique_events:
+            unique_events[event["prediction_id"]] = event
+
+    redacted = {
+        prediction_id: _redact_features(event["features"])
+        for prediction_id, event in unique_events.items()
+    }
+
+    fingerprints: Dict[str, str] = {}
+    if auto_fingerprint:
+        raw = get_fingerprint_config().source == "raw"
+        missing = [
+            prediction_id
+            for prediction_id, event in unique_events.items()
+            if event.get("input_fingerprint") is None
+        ]
+        fingerprints = dict(
+            zip(
+                missing,
+                fingerprint_many(
+                    unique_events[prediction_id]["features"] if raw else redacted[prediction_id]
+                    for prediction_id in missing
+                ),
+            )
+        )
+
+    snapshot_ids: Dict[str, uuid.UUID] = {}
+    if get_feature_storage_config().use_snapshots:
+        snapshot_ids = dict(
+            zip(redacted, _bulk_resolve_feature_snapshots(redacted.values()))
+        )
+
+    candidates: Dict[str, PredictionEvent] = {}
+    for prediction_id, event in unique_events.items():
+        actor = event["actor"]
+        snapshot_id = snapshot_ids.get(prediction_id)
+        candidates[prediction_id] = PredictionEvent(
+            prediction_id=prediction_id,
+            model_id=model_ids[(event["model_name"], event["model_version"])],
+            actor_id=actor_ids[_actor_key(actor)] if actor is not None else None,
+            **_denormalized_fields(event["model_name"], event["model_version"], actor),
+            features=redacted[prediction_id] if snapshot_id is None else None,
+            feature_snapshot_id=snapshot_id,
+            output=event["output"],
+            decision_outcome=event.get("decision_outcome") or "",
+            environment=event.get("environment") or "",
+            trace_id=event.get("trace_id") or "",
+            latency_ms=event.get("latency_ms"),
+            status=event.get("status") or PredictionStatus.SUCCESS,
+            confidence=event.get("confidence"),
+            metadata=event.get("metadata") or {},
+            input_fingerprint=(
+                event.get("input_fingerprint") or fingerprints.get(prediction_id, "")
+            ),
+            timestamp=event.get("timestamp") or now,
+        )
+
+    using = router.db_for_write(PredictionEvent)
+    if is_partitioned(using):
+        # See `_insert_partitioned_event`: hold the prediction_ids until commit.
+        lock_prediction_ids(connections[using], candidates)
+
+    existing = dict(
+        PredictionEvent.objects.filter(prediction_id__in=list(candidates)).values_list(
+            "prediction_id", "pk"
+        )
+    )
+    new_events = [
+        obj for prediction_id, obj in candidates.items() if prediction_id not in existing
+    ]
+    if new_events:
+        # Conflicts here mean a concurrent writer inserted the same prediction_id
+        # between our lookup and the insert; re-read to learn which rows won.
+        PredictionEvent.objects.bulk_create(new_events, ignore_conflicts=True)
+        existing.update(
+            PredictionEvent.objects.filter(
+                prediction_id__in=[obj.prediction_id for obj in new_events]
+            ).values_list("prediction_id", "pk")
+        )
+
+    results: List[RecordResult] = []
+    claimed = set()
+    for event in events:
+        prediction_id = event["prediction_id"]
+        pk = existing[prediction_id]
+        created = (
+            prediction_id not in claimed and pk == candidates[prediction_id].pk
+        )
+        claimed.add(prediction_id)
+        results.append(RecordResult(prediction_id=prediction_id, id=pk, created=created))
+
+    created_events = [
+        candidates[result.prediction_id] for result in results if result.created
+    ]
+    if get_rollup_config().inline:
+        add_to_rollups(created_events, using=using)
+    if get_sketch_config().enabled:
+        observe_recorded_events(created_events, using=using)
+    return results
+
+
+def record_prediction_events(
+    events: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int = 1000,
+    auto_fingerprint: bool | None = None,
+) -> List[RecordResult]:
+    """
+    Record many prediction events using chunked bulk inserts.
+
+    Each item in `events` is a mapping with the same keys as the keyword
+    arguments of `record_prediction_event` (`actor` may be an `ActorPayload`
+    or a dict). Model versions and actors are resolved once per distinct key,
+    and idempotency on `prediction_id` is preserved: items whose
+    `prediction_id` already exists are reported as duplicates instead of
+    being inserted again.
+
+    `auto_fingerprint` (default: `ML_AUDIT_FINGERPRINT["ENABLED"]`) fills in
+    `input_fingerprint` for items without one, fingerprinting each chunk in
+    one `fingerprint_many` call. In snapshot feature storage mode each
+    chunk's distinct payloads are stored with one lookup and one insert.
+
+    Returns one `RecordResult` per input item, in input order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    if auto_fingerprint is None:
+        auto_fingerprint = get_fingerprint_config().enabled
+
+    model_ids: Dict[ModelVersionKey, uuid.UUID] = {}
+    actor_ids: Dict[ActorKey, uuid.UUID] = {}
+    results: List[RecordResult] = []
+    using = audit_database()
+
+    for chunk in _chunked(events, batch_size):
+        chunk = [_validate_event_payload(payload) for payload in chunk]
+        with transaction.atomic(using=using):
+            _bulk_resolve_model_versions(chunk, model_ids)
+            _bulk_resolve_actors(chunk, actor_ids)
+            results.extend(
+                _insert_event_chunk(
+                    chunk, model_ids, actor_ids, auto_fingerprint=auto_fingerprint
+                )
+            )
+        note_write()
+
+    return results
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from ml_audit.conf import get_spool_config
+from ml_audit.services.recording import record_prediction_events
+from ml_audit.spool import list_segments, read_segment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayStats:
+    segments: int = 0
+    created: int = 0
+    duplicates: int = 0
+
+
+def replay_spool(
+    directory: Optional[str] = None,
+    *,
+    batch_size: int = 1000,
+    include_open: bool = False,
+    keep_segments: bool = False,
+) -> ReplayStats:
+    """
+    Drain spooled events into the database with bulk inserts.
+
+    Segments are removed once fully written (unless `keep_segments`). Since
+    inserts are idempotent on `prediction_id`, replaying a segment again
+    after a crash only reports its events as duplicates.
+    """
+    directory = directory or get_spool_config().directory
+    if not directory:
+        raise ValueError("No spool directory given and ML_AUDIT_SPOOL['DIRECTORY'] is not set.")
+
+    stats = ReplayStats()
+    for segment in list_segments(directory, include_open=include_open):
+        results = record_prediction_events(read_segment(segment), batch_size=batch_size)
+        created = sum(1 for result in results if result.created)
+        stats.segments += 1
+        stats.created += created
+        stats.duplicates += len(results) - created
+        logger.info(
+            "Replayed spool segment %s: %d created, %d duplicate(s)",
+            segment,
+            created,
+            len(results) - created,
+        )
+        if not keep_segments:
+            os.remove(segment)
+    return stats
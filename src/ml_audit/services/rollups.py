@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from ml_audit.conf import get_rollup_config
+from ml_audit.db import supports_insert_ignore
+from ml_audit.models import (
+    PredictionEvent,
+    PredictionRollup,
+    PredictionStatus,
+    RollupWatermark,
+)
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "prediction_rollup"
+
+# (bucket, model_name, model_version, environment, tenant_id)
+RollupKey = Tuple[datetime, str, str, str, str]
+
+
+def bucket_start(value: datetime) -> datetime:
+    """The UTC hour containing `value`."""
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class RollupDelta:
+    """Aggregates to add to one rollup row."""
+
+    events: int = 0
+    failed: int = 0
+    partial: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    latency_max: Optional[float] = None
+    confidence_sum: float = 0.0
+    confidence_count: int = 0
+
+    def add_event(self, event: PredictionEvent) -> None:
+        self.events += 1
+        if event.status == PredictionStatus.FAILED:
+            self.failed += 1
+        elif event.status == PredictionStatus.PARTIAL:
+            self.partial += 1
+        self.outcomes[event.decision_outcome] += 1
+        if event.latency_ms is not None:
+            self.latency_sum += event.latency_ms
+            self.latency_count += 1
+            self.latency_max = _max(self.latency_max, event.latency_ms)
+        if event.confidence is not None:
+            self.confidence_sum += event.confidence
+            self.confidence_count += 1
+
+    def apply_to(self, row: PredictionRollup) -> None:
+        row.event_count += self.events
+        row.failed_count += self.failed
+        row.partial_count += self.partial
+        outcomes = Counter(row.outcome_counts)
+        outcomes.update(self.outcomes)
+        row.outcome_counts = dict(outcomes)
+        row.latency_sum += self.latency_sum
+        row.latency_count += self.latency_count
+        row.latency_max = _max(row.latency_max, self.latency_max)
+        row.confidence_sum += self.confidence_sum
+        row.confidence_count += self.confidence_count
+
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def event_key(event: PredictionEvent) -> RollupKey:
+    return (
+        bucket_start(event.timestamp),
+        event.model_name,
+        event.model_version,
+        event.environment,
+        event.tenant_id,
+    )
+
+
+def event_deltas(events: Iterable[PredictionEvent]) -> Dict[RollupKey, RollupDelta]:
+    deltas: Dict[RollupKey, RollupDelta] = {}
+    for event in events:
+        deltas.setdefault(event_key(event), RollupDelta()).add_event(event)
+    return deltas
+
+
+def apply_deltas(deltas: Dict[RollupKey, RollupDelta], *, using: Optional[str] = None) -> None:
+    """
+    Add `deltas` to their rollup rows, creating missing rows.
+
+    Rows are locked in key order, so concurrent writers cannot deadlock.
+    """
+    using = using or router.db_for_write(PredictionRollup)
+    with transaction.atomic(using=using):
+        for key in sorted(deltas):
+            row = _locked_row(key, using)
+            deltas[key].apply_to(row)
+            row.save(using=using)
+
+
+def _locked_row(key: RollupKey, using: str) -> PredictionRollup:
+    bucket, model_name, model_version, environment, tenant_id = key
+    lookup = dict(
+        bucket=bucket,
+        model_name=model_name,
+        model_version=model_version,
+        environment=environment,
+        tenant_id=tenant_id,
+    )
+    rows = PredictionRollup.objects.using(using).select_for_update().filter(**lookup)
+    row = rows.first()
+    if row is not None:
+        return row
+    if supports_insert_ignore(using):
+        PredictionRollup.objects.using(using).bulk_create(
+            [PredictionRollup(**lookup)], ignore_conflicts=True
+        )
+    else:
+        try:
+            with transaction.atomic(using=using):
+                PredictionRollup.objects.using(using).create(**lookup)
+        except IntegrityError:
+            pass  # created concurrently
+    return rows.get()
+
+
+def add_to_rollups(events: Iterable[PredictionEvent], *, using: Optional[str] = None) -> None:
+    """Fold newly recorded events into their rollups (`ML_AUDIT_ROLLUP["INLINE"]`)."""
+    deltas = event_deltas(events)
+    if deltas:
+        apply_deltas(deltas, using=using)
+
+
+def _aggregate_window(
+    start: Optional[datetime], end: datetime, *, using: str
+) -> Dict[RollupKey, RollupDelta]:
+    events = PredictionEvent.objects.using(using).filter(created_at__lte=end)
+    if start is not None:
+        events = events.filter(created_at__gt=start)
+    rows = (
+        events.annotate(bucket=TruncHour("timestamp", tzinfo=dt_timezone.utc))
+        .values(
+            "bucket",
+            "model_name",
+            "model_version",
+            "environment",
+            "tenant_id",
+            "decision_outcome",
+        )
+        .annotate(
+            events=Count("id"),
+            failed=Count("id", filter=Q(status=PredictionStatus.FAILED)),
+            partial=Count("id", filter=Q(status=PredictionStatus.PARTIAL)),
+            latency_sum=Sum("latency_ms"),
+            latency_count=Count("latency_ms"),
+            latency_max=Max("latency_ms"),
+            confidence_sum=Sum("confidence"),
+            confidence_count=Count("confidence"),
+        )
+        .order_by()
+    )
+    deltas: Dict[RollupKey, RollupDelta] = {}
+    for row in rows:
+        key = (
+            row["bucket"],
+            row["model_name"],
+            row["model_version"],
+            row["environment"],
+            row["tenant_id"],
+        )
+        delta = deltas.setdefault(key, RollupDelta())
+        delta.events += row["events"]
+        delta.failed += row["failed"]
+        delta.partial += row["partial"]
+        delta.outcomes[row["decision_outcome"]] += row["events"]
+        delta.latency_sum += row["latency_sum"] or 0.0
+        delta.latency_count += row["latency_count"]
+        delta.latency_max = _max(delta.latency_max, row["latency_max"])
+        delta.confidence_sum += row["confidence_sum"] or 0.0
+        delta.confidence_count += row["confidence_count"]
+    return deltas
+
+
+@dataclass
+class RollupRun:
+    windows: int = 0
+    buckets: int = 0
+    position: Optional[datetime] = None
+
+
+def update_rollups(
+    *,
+    lag: Optional[int] = None,
+    step: timedelta = timedelta(days=1),
+    using: Optional[str] = None,
+) -> RollupRun:
+    """
+    Fold events written since the watermark into the rollups.
+
+    Events are read by `created_at` (so late-arriving events with old
+    timestamps are still counted) up to `lag` seconds ago, in windows of
+    `step`. Each window's rollup updates and the advanced watermark are
+    committed together, so an interrupted run resumes without double counting.
+    """
+    using = using or router.db_for_write(PredictionRollup)
+    lag = get_rollup_config().lag if lag is None else lag
+    until = timezone.now() - timedelta(seconds=lag)
+    run = RollupRun()
+
+    RollupWatermark.objects.using(using).get_or_create(name=WATERMARK)
+    while True:
+        with transaction.atomic(using=using):
+            # Overlapping runs queue on the watermark row and continue from
+            # wherever the previous holder left it.
+            watermark = (
+                RollupWatermark.objects.using(using).select_for_update().get(name=WATERMARK)
+            )
+            position = watermark.position
+            if position is None:
+                start = PredictionEvent.objects.using(using).aggregate(
+                    first=Min("created_at")
+                )["first"]
+                if start is None:
+                    break
+            elif position >= until:
+                break
+            else:
+                start = position
+            end = min(start + step, until)
+            deltas = _aggregate_window(position, end, using=using)
+            apply_deltas(deltas, using=using)
+            watermark.position = end
+            watermark.updated_at = timezone.now()
+            watermark.save(using=using, update_fields=["position", "updated_at"])
+        position = end
+        run.windows += 1
+        run.buckets += len(deltas)
+    run.position = position
+    logger.info("ml-audit rollups updated to %s (%d buckets)", position, run.buckets)
+    return run
+
+
+def rebuild_rollups(
+    *,
+    lag: Optional[int] = None,
+    step: timedelta = timedelta(days=1),
+    using: Optional[str] = None,
+) -> RollupRun:
+    """
+    Delete all rollups and recompute them from the stored events.
+
+    With `ML_AUDIT_ROLLUP["INLINE"]` the rebuild covers every committed
+    event (`lag` is ignored) in a single transaction that holds the rollup
+    table against writers: an explicit table lock on PostgreSQL, the
+    database write lock on SQLite. Inline writers wait for the rebuild and
+    then add their events, so nothing is counted twice. Pause writers
+    during an inline rebuild on other backends.
+    """
+    using = using or router.db_for_write(PredictionRollup)
+    if not get_rollup_config().inline:
+        with transaction.atomic(using=using):
+            PredictionRollup.objects.using(using).all().delete()
+            RollupWatermark.objects.using(using).filter(name=WATERMARK).delete()
+        return update_rollups(lag=lag, step=step, using=using)
+
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "LOCK TABLE %s IN EXCLUSIVE MODE"
+                    % connection.ops.quote_name(PredictionRollup._meta.db_table)
+                )
+        PredictionRollup.objects.using(using).all().delete()
+        RollupWatermark.objects.using(using).filter(name=WATERMARK).delete()
+        return update_rollups(lag=0, step=step, using=using)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import IntegrityError, close_old_connections, router, transaction
+
+from ml_audit.conf import get_sketch_config
+from ml_audit.db import supports_insert_ignore
+from ml_audit.models import PredictionEvent, QuantileSketch, SketchMetric
+from ml_audit.services.rollups import bucket_start
+from ml_audit.sketches import DDSketch
+
+logger = logging.getLogger(__name__)
+
+# (model_name, model_version, metric, bucket)
+SketchKey = Tuple[str, str, str, datetime]
+
+METRICS = (SketchMetric.LATENCY_MS, SketchMetric.CONFIDENCE)
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class SketchAggregator:
+    """
+    Process-local quantile sketches, merged into `QuantileSketch` rows by `flush()`.
+
+    A daemon thread flushes every `flush_interval` seconds, and `stop()` (registered
+    with atexit) flushes what is left. Sketches that fail to flush are kept and
+    retried with the next flush.
+    """
+
+    def __init__(
+        self,
+        *,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+        flush_interval: float = 10.0,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.flush_interval = flush_interval
+        self._pending: Dict[SketchKey, DDSketch] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+
+    def _new_sketch(self) -> DDSketch:
+        return DDSketch(self.relative_accuracy, self.max_bins)
+
+    def observe(self, events: Iterable[PredictionEvent]) -> None:
+        """Add the events' `latency_ms` and `confidence` to their hourly sketches."""
+        self.start()
+        with self._lock:
+            for event in events:
+                bucket = bucket_start(event.timestamp)
+                for metric in METRICS:
+                    value = getattr(event, metric)
+                    if value is None:
+                        continue
+                    key = (event.model_name, event.model_version, metric, bucket)
+                    sketch = self._pending.get(key)
+                    if sketch is None:
+                        sketch = self._pending[key] = self._new_sketch()
+                    sketch.add(value)
+
+    def pending(self) -> int:
+        """Number of sketches not yet flushed."""
+        return len(self._pending)
+
+    def flush(self, *, using: Optional[str] = None) -> int:
+        """Merge the pending sketches into the database. Returns the number of rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                merge_sketches(pending, using=using)
+            except Exception:
+                logger.exception("ml-audit failed to flush %d quantile sketch(es)", len(pending))
+                with self._lock:
+                    for key, sketch in pending.items():
+                        current = self._pending.get(key)
+                        if current is not None:
+                            sketch.merge(current)
+                        self._pending[key] = sketch
+                return 0
+            return len(pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ml-audit-sketches", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the flush thread and flush what is still pending."""
+        self._stopping.set()
+        thread = self._thread
+        if (
+            thread is not None
+            and thread.is_alive()
+            and thread is not threading.current_thread()
+        ):
+            thread.join(timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+            close_old_connections()
+
+
+def merge_sketches(sketches: Dict[SketchKey, DDSketch], *, using: Optional[str] = None) -> None:
+    """
+    Merge `sketches` into their `QuantileSketch` rows, creating missing rows.
+
+    Rows are locked in key order, so workers flushing concurrently cannot
+    deadlock or lose each other's counts.
+    """
+    using = using or router.db_for_write(QuantileSketch)
+    with transaction.atomic(using=using):
+        for key in sorted(sketches):
+            row = _locked_row(key, sketches[key], using)
+            if row is None:
+                continue
+            stored = row.to_sketch()
+            stored.merge(sketches[key])
+            row.sketch = stored.to_dict()
+            row.count = stored.count
+            row.save(using=using, update_fields=["sketch", "count", "updated_at"])
+
+
+def _locked_row(key: SketchKey, sketch: DDSketch, using: str) -> Optional[QuantileSketch]:
+    """The locked row for `key`, or None if it was just created holding `sketch`."""
+    model_name, model_version, metric, bucket = key
+    rows = QuantileSketch.objects.using(using).select_for_update().filter(
+        model_name=model_name, model_version=model_version, metric=metric, bucket=bucket
+    )
+    row = rows.first()
+    if row is not None:
+        return row
+    new = QuantileSketch(
+        model_name=model_name,
+        model_version=model_version,
+        metric=metric,
+        bucket=bucket,
+        count=sketch.count,
+        sketch=sketch.to_dict(),
+    )
+    if supports_insert_ignore(using):
+        QuantileSketch.objects.using(using).bulk_create([new], ignore_conflicts=True)
+        row = rows.get()
+        # Ours unless a concurrent writer created the row first.
+        return None if row.pk == new.pk else row
+    else:
+        try:
+            with transaction.atomic(using=using):
+                new.save(using=using, force_insert=True)
+            return None
+        except IntegrityError:
+            pass  # created concurrently
+    return rows.get()
+
+
+def window_sketch(
+    *,
+    model_name: str,
+    metric: str,
+    model_version: Optional[str] = None,
+    time_from: Optional[datetime] = None,
+    time_to: Optional[datetime] = None,
+    using: Optional[str] = None,
+) -> Optional[DDSketch]:
+    """
+    Merge the stored hourly sketches of a window into one sketch.
+
+    Windows are resolved to whole hours: every hour overlapping
+    `[time_from, time_to]` is included. Returns None if none match.
+    """
+    rows = QuantileSketch.objects.filter(model_name=model_name, metric=metric)
+    if using is not None:
+        rows = rows.using(using)
+    if model_version:
+        rows = rows.filter(model_version=model_version)
+    if time_from is not None:
+        rows = rows.filter(bucket__gte=bucket_start(time_from))
+    if time_to is not None:
+        rows = rows.filter(bucket__lte=time_to)
+    merged: Optional[DDSketch] = None
+    for data in rows.values_list("sketch", flat=True).iterator():
+        sketch = DDSketch.from_dict(data)
+        if merged is None:
+            merged = sketch
+        else:
+            merged.merge(sketch)
+    return merged
+
+
+def quantiles(sketch: Optional[DDSketch], qs: Sequence[float]) -> Dict[str, Optional[float]]:
+    return {str(q): sketch.quantile(q) if sketch else None for q in qs}
+
+
+_aggregator: Optional[SketchAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_sketch_aggregator() -> SketchAggregator:
+    """
+    Return the process-wide sketch aggregator, creating it on first use.
+
+    An aggregator inherited across `fork()` is replaced, so a child process
+    never flushes its parent's pending sketches a second time.
+    """
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None or _aggregator._pid != os.getpid():
+            config = get_sketch_config()
+            _aggregator = SketchAggregator(
+                relative_accuracy=config.relative_accuracy,
+                max_bins=config.max_bins,
+                flush_interval=config.flush_interval,
+            )
+            atexit.register(_aggregator.stop)
+        return _aggregator
+
+
+def observe_recorded_events(events: List[PredictionEvent], *, using: str) -> None:
+    """Feed newly recorded events to the aggregator once their transaction commits."""
+    if events:
+        transaction.on_commit(
+            lambda: get_sketch_aggregator().observe(events), using=using
+        )
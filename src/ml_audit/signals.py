@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ml_audit.models import ModelVersion, RequestingActor
+from ml_audit.services.explanations import get_explanation_cache, get_feature_names_cache
+from ml_audit.services.prediction_cache import get_prediction_cache
+from ml_audit.services.recording import get_actor_cache, get_model_version_cache
+
+
+@receiver(post_save, sender=ModelVersion, dispatch_uid="ml_audit_model_version_saved")
+@receiver(post_delete, sender=ModelVersion, dispatch_uid="ml_audit_model_version_deleted")
+def invalidate_model_version_cache(sender, instance: ModelVersion, **kwargs) -> None:
+    # A rename leaves the old (model_name, version) key pointing at this pk,
+    # so drop entries by value as well as by the current key.
+    cache = get_model_version_cache()
+    cache.invalidate((instance.model_name, instance.version))
+    cache.remove_if(lambda key, pk: pk == instance.pk)
+    get_feature_names_cache().invalidate(instance.pk)
+    get_explanation_cache().remove_if(
+        lambda key, value: key[:2] == (instance.model_name, instance.version)
+    )
+    get_prediction_cache().remove_if(
+        lambda key, value: key[:2] == (instance.model_name, instance.version)
+    )
+
+
+@receiver(post_delete, sender=RequestingActor, dispatch_uid="ml_audit_actor_deleted")
+def invalidate_actor_cache(sender, instance: RequestingActor, **kwargs) -> None:
+    get_actor_cache().remove_if(lambda key, pk: pk == instance.pk)
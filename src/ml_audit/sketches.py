@@ -0,0 +1,151 @@
+"""
+DDSketch: a mergeable quantile sketch with relative-error guarantees.
+
+Values are counted in logarithmic bins of ratio `gamma = (1 + a) / (1 - a)`,
+so every quantile estimate is within a relative error `a` (the
+`relative_accuracy`) of the true value. Two sketches with the same accuracy
+merge exactly by adding bin counts, which is what lets per-worker and
+per-hour sketches be combined into any window.
+
+When a sketch holds more than `max_bins` bins per sign, the bins closest to
+zero are collapsed into one, so only the lowest quantiles lose accuracy.
+See Masson, Rim and Lee, "DDSketch: A Fast and Fully-Mergeable Quantile
+Sketch with Relative-Error Guarantees" (VLDB 2019).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+# Values closer to zero than this are counted as zero.
+MIN_INDEXABLE = 1e-9
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        if max_bins < 1:
+            raise ValueError("max_bins must be a positive integer.")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # Midpoint (in relative terms) of the bin (gamma^(i-1), gamma^i].
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if count <= 0:
+            return
+        if value > MIN_INDEXABLE:
+            bins = self.positive
+            index = self._index(value)
+        elif value < -MIN_INDEXABLE:
+            bins = self.negative
+            index = self._index(-value)
+        else:
+            bins = None
+            self.zero_count += count
+        if bins is not None:
+            bins[index] = bins.get(index, 0) + count
+            if len(bins) > self.max_bins:
+                self._collapse(bins)
+        self.count += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def _collapse(self, bins: Dict[int, int]) -> None:
+        indexes = sorted(bins)
+        excess = indexes[: len(indexes) - self.max_bins + 1]
+        target = indexes[len(excess)]
+        bins[target] += sum(bins.pop(index) for index in excess)
+
+    def merge(self, other: DDSketch) -> None:
+        """Add `other`'s values to this sketch; both must use the same accuracy."""
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        if other.count == 0:
+            return
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in theirs.items():
+                mine[index] = mine.get(index, 0) + count
+            if len(mine) > self.max_bins:
+                self._collapse(mine)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The estimated `q`-quantile (0 <= q <= 1), or None for an empty sketch."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1.")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        # Walk from the most negative value upwards.
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return self._clamp(-self._value(index))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._clamp(self._value(index))
+        return self.max
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+    @property
+    def avg(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form; see `from_dict`."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "positive": {str(index): count for index, count in self.positive.items()},
+            "negative": {str(index): count for index, count in self.negative.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> DDSketch:
+        sketch = cls(data["relative_accuracy"], data["max_bins"])
+        sketch.positive = {int(index): count for index, count in data["positive"].items()}
+        sketch.negative = {int(index): count for index, count in data["negative"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ml_audit.conf import get_spool_config
+
+logger = logging.getLogger(__name__)
+
+SEALED_SUFFIX = ".jsonl"
+OPEN_SUFFIX = ".jsonl.open"
+SPOOL_FORMAT_VERSION = 1
+
+
+class _SpoolJSONEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder truncates datetimes to milliseconds; keep full precision.
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_event(event_kwargs: Dict[str, Any]) -> bytes:
+    """Serialize `record_prediction_event` keyword arguments as one JSONL line."""
+    event = dict(event_kwargs)
+    actor = event.get("actor")
+    if actor is not None and not isinstance(actor, dict):
+        event["actor"] = asdict(actor)
+    record = {"v": SPOOL_FORMAT_VERSION, "event": event}
+    return (
+        json.dumps(record, cls=_SpoolJSONEncoder, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def decode_event(line: bytes) -> Dict[str, Any]:
+    """Inverse of `encode_event`: return keyword arguments for the recording API."""
+    record = json.loads(line)
+    if record.get("v") != SPOOL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported spool record version: {record.get('v')!r}")
+    event = record["event"]
+    if event.get("timestamp"):
+        event["timestamp"] = parse_datetime(event["timestamp"])
+    return event
+
+
+class SpoolWriter:
+    """
+    Append-only, segmented JSONL spool owned by a single process.
+
+    Each process writes to its own `*.jsonl.open` segment; a segment is
+    sealed (renamed to `*.jsonl`) once it exceeds `segment_max_bytes`, once
+    it is `segment_max_age` seconds old (by a timer, so an idle segment does
+    not wait for the next append), or when the writer is closed. Writes are unbuffered so records survive a process
+    crash, and fsync is batched by record count and elapsed time so they
+    also survive a host crash once synced.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        *,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync_every: int = 100,
+        fsync_interval: float = 1.0,
+        segment_max_age: float = 60.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Optional[Path] = None
+        self._seal_timer: Optional[threading.Timer] = None
+        self._sequence = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._opened_at = time.monotonic()
+
+    def append(self, event_kwargs: Dict[str, Any]) -> None:
+        line = encode_event(event_kwargs)
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(line)
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+            if (
+                self._file.tell() >= self.segment_max_bytes
+                or time.monotonic() - self._opened_at >= self.segment_max_age
+            ):
+                self._seal()
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def close(self) -> None:
+        """Sync and seal the active segment."""
+        with self._lock:
+            if self._file is not None:
+                self._seal()
+
+    def _open_segment(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+        self._path = self.directory / (
+            f"segment-{stamp}-{self.pid}-{self._sequence:06d}{OPEN_SUFFIX}"
+        )
+        self._file = open(self._path, "ab", buffering=0)
+        self._last_sync = self._opened_at = time.monotonic()
+        self._seal_timer = threading.Timer(
+            self.segment_max_age, self._seal_expired, args=(self._path,)
+        )
+        self._seal_timer.daemon = True
+        self._seal_timer.start()
+
+    def _seal_expired(self, path: Path) -> None:
+        with self._lock:
+            # The segment may already have been sealed by size or `close()`.
+            if self._path == path:
+                self._seal()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _seal(self) -> None:
+        if self._seal_timer is not None:
+            self._seal_timer.cancel()
+            self._seal_timer = None
+        self._sync()
+        self._file.close()
+        sealed = self._path.with_name(self._path.name[: -len(OPEN_SUFFIX)] + SEALED_SUFFIX)
+        os.replace(self._path, sealed)
+        self._file = None
+        self._path = None
+
+
+_writer: Optional[SpoolWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_spool_writer() -> SpoolWriter:
+    """Return this process's spool writer, configured from `ML_AUDIT_SPOOL`."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            config = get_spool_config()
+            if not config.enabled:
+                raise RuntimeError("ML_AUDIT_SPOOL['DIRECTORY'] is not configured.")
+            _writer = SpoolWriter(
+                config.directory,
+                segment_max_bytes=config.segment_max_bytes,
+                fsync_every=config.fsync_every,
+                fsync_interval=config.fsync_interval,
+                segment_max_age=config.segment_max_age,
+            )
+            atexit.register(_writer.close)
+        return _writer
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _segment_pid(path: Path) -> Optional[int]:
+    try:
+        return int(path.name.split("-")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def list_segments(directory: str | os.PathLike, *, include_open: bool = False) -> List[Path]:
+    """
+    Return replayable segments in write order.
+
+    Open segments are only included when `include_open` is set and the
+    process that owned them is no longer running on this host.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    segments = list(directory.glob(f"segment-*{SEALED_SUFFIX}"))
+    if include_open:
+        for path in directory.glob(f"segment-*{OPEN_SUFFIX}"):
+            pid = _segment_pid(path)
+            if pid is not None and pid != os.getpid() and not _pid_alive(pid):
+                segments.append(path)
+    return sorted(segments, key=lambda path: path.name)
+
+
+def read_segment(path: str | os.PathLike) -> Iterator[Dict[str, Any]]:
+    """
+    Yield decoded events from a segment.
+
+    A torn final line (the process died mid-write) is skipped; other
+    undecodable lines are logged and skipped.
+    """
+    with open(path, "rb") as fh:
+        for line_number, line in enumerate(fh, start=1):
+            if not line.endswith(b"\n"):
+                logger.warning("Skipping torn trailing record in spool segment %s", path)
+                break
+            try:
+                yield decode_event(line)
+            except (KeyError, ValueError):
+                logger.warning("Skipping corrupt record at %s:%d", path, line_number)
@@ -0,0 +1,64 @@
+# tests/conftest.py
+
+import pytest
+
+from ml_audit.services import record_prediction_event
+from ml_audit.services.explanations import get_explanation_cache, get_feature_names_cache
+from ml_audit.services.prediction_cache import get_prediction_cache
+from ml_audit.services.recording import (
+    get_actor_cache,
+    get_feature_snapshot_cache,
+    get_model_version_cache,
+)
+from ml_audit.services.sketches import get_sketch_aggregator
+
+
+@pytest.fixture(autouse=True)
+def _clear_lookup_caches():
+    # Test transactions roll back, so primary keys cached by one test must
+    # never leak into the next.
+    caches = [
+        get_model_version_cache(),
+        get_actor_cache(),
+        get_feature_snapshot_cache(),
+        get_feature_names_cache(),
+        get_explanation_cache(),
+        get_prediction_cache(),
+        get_sketch_aggregator(),
+    ]
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def event_payload():
+    """
+    Factory for `record_prediction_event` keyword arguments.
+
+    Keyword overrides replace the defaults. Modules needing other defaults
+    override this fixture, and `record_event` picks them up.
+    """
+
+    def payload(**overrides):
+        return {
+            "model_name": "fraud_model",
+            "model_version": "1.0.0",
+            "features": {"amount": 10},
+            "output": {"score": 0.9},
+            **overrides,
+        }
+
+    return payload
+
+
+@pytest.fixture
+def record_event(event_payload):
+    """Factory recording `event_payload(**overrides)` with `record_prediction_event`."""
+
+    def record(**overrides):
+        return record_prediction_event(**event_payload(**overrides))
+
+    return record
@@ -0,0 +1,129 @@
+# tests/test_actor_cache.py
+
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ml_audit.cache import LRUCache
+from ml_audit.services import ActorPayload
+from ml_audit.services.recording import get_actor_cache
+
+
+@pytest.fixture
+def actor_cache():
+    return get_actor_cache()
+
+
+@pytest.mark.django_db
+def test_actor_resolution_is_cached_after_commit(
+    actor_cache, record_event, django_capture_on_commit_callbacks
+):
+    actor = ActorPayload(actor_type="api_key", actor_id="client-1", tenant_id="t1")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = record_event(actor=actor)
+
+    assert actor_cache.get(("api_key", "client-1", "t1")) == first.actor_id
+
+    with CaptureQueriesContext(connection) as queries:
+        second = record_event(actor=actor)
+
+    assert second.actor_id == first.actor_id
+    assert not any("ml_audit_requestingactor" in q["sql"] for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_deleted_actor_is_evicted(actor_cache, record_event, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        event = record_event(actor=ActorPayload(actor_type="user", actor_id="u1"))
+
+    event.actor.delete()
+
+    assert ("user", "u1", "") not in actor_cache
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache(maxsize=4, ttl=0.01)
+    cache.set("key", 1)
+
+    assert cache.get("key") == 1
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert cache.info().misses == 1
+
+
+def test_concurrent_misses_share_a_single_load():
+    cache = LRUCache(maxsize=4)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "pk"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == ["pk"] * 8
+    assert len(calls) == 1
+    assert cache.get("key") == "pk"
+
+
+def test_loader_errors_propagate_to_waiters_and_are_not_cached():
+    cache = LRUCache(maxsize=4)
+
+    def loader():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", loader)
+
+    assert "key" not in cache
+
+
+def test_waiters_do_not_share_an_uncommitted_load():
+    cache = LRUCache(maxsize=4)
+    pending_commit = []
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(threading.current_thread().name)
+        if len(loads) == 1:
+            release.wait(timeout=5)
+            return "rolled-back-pk"
+        return "own-pk"
+
+    results = {}
+
+    def call(name):
+        results[name] = cache.get_or_load("key", loader, defer=pending_commit.append)
+
+    leader = threading.Thread(target=call, args=("leader",), name="leader")
+    leader.start()
+    time.sleep(0.05)
+    follower = threading.Thread(target=call, args=("follower",), name="follower")
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+    # The leader's transaction rolls back: its on_commit callback never runs.
+    pending_commit.clear()
+
+    assert results == {"leader": "rolled-back-pk", "follower": "own-pk"}
+    assert loads == ["leader", "follower"]
+    assert "key" not in cache
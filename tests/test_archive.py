@@ -0,0 +1,181 @@
+# tests/test_archive.py
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIRequestFactory
+
+from ml_audit import archive
+from ml_audit.api.views import PredictionEventViewSet
+from ml_audit.archive import load_manifest, query_archive, verify_archive
+from ml_audit.models import PredictionEvent
+from ml_audit.services import attach_explanation
+from ml_audit.services.archiving import archive_events
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def archive_dir(settings, tmp_path):
+    settings.ML_AUDIT_ARCHIVE = {"DIRECTORY": str(tmp_path), "FORMAT": "native"}
+    return tmp_path
+
+
+@pytest.fixture
+def record_aged(record_event):
+    """`record_event` for an event `days_ago` old, backdating when it was recorded too."""
+
+    def record(prediction_id, days_ago, recorded_days_ago=None, **overrides):
+        event = record_event(
+            prediction_id=prediction_id,
+            features={"amount": days_ago},
+            output={"score": 0.5},
+            timestamp=NOW - timedelta(days=days_ago),
+            **overrides,
+        )
+        # Events are exported by when they were recorded.
+        recorded = NOW - timedelta(
+            days=days_ago if recorded_days_ago is None else recorded_days_ago
+        )
+        PredictionEvent.objects.filter(pk=event.pk).update(created_at=recorded)
+        return event
+
+    return record
+
+
+@pytest.mark.django_db
+def test_old_events_are_exported_with_a_checksummed_manifest(archive_dir, record_aged):
+    old = record_aged("old-1", 40)
+    attach_explanation(prediction=old, method="shap", payload={"amount": 0.2})
+    record_aged("old-2", 35)
+    record_aged("recent", 1)
+
+    stats = archive_events(NOW - timedelta(days=30))
+
+    assert (stats.events, stats.segments) == (2, 1)
+    manifest = load_manifest()
+    assert manifest.archived_until.startswith("2026-09-01T00:00:00")
+    (segment,) = manifest.segments
+    assert (segment.min_prediction_id, segment.max_prediction_id) == ("old-1", "old-2")
+    assert verify_archive() == []
+
+    (record,) = query_archive(prediction_id="old-1")
+    assert record["features"] == {"amount": 40}
+    assert record["explanation"]["payload"] == {"amount": 0.2}
+    assert record["model_version"] == "1.0.0"
+
+    # Already exported rows are not exported again.
+    assert archive_events(NOW - timedelta(days=30)).events == 0
+
+    path = archive_dir / segment.file
+    path.write_bytes(path.read_bytes()[:-1] + b"x")
+    assert verify_archive() == [f"{segment.file}: checksum mismatch"]
+
+
+@pytest.mark.django_db
+def test_late_events_and_late_explanations_are_archived_by_the_next_run(
+    archive_dir, record_aged
+):
+    exported = record_aged("exported", 40)
+    archive_events(NOW - timedelta(days=30))
+
+    # Recorded after the first run, with a timestamp it had already passed.
+    record_aged("late", 45, recorded_days_ago=20)
+    attach_explanation(prediction=exported, method="shap", payload={"amount": 0.3})
+
+    stats = archive_events(NOW - timedelta(days=10))
+
+    assert stats.events == 2
+    assert [record["prediction_id"] for record in query_archive()] == ["late", "exported"]
+    (record,) = query_archive(prediction_id="exported")
+    assert record["explanation"]["payload"] == {"amount": 0.3}
+    assert archive_events(NOW - timedelta(days=10)).events == 0
+
+
+@pytest.mark.django_db
+def test_queries_prune_segments_by_time_and_model(
+    archive_dir, record_aged, settings, monkeypatch
+):
+    settings.ML_AUDIT_ARCHIVE = {**settings.ML_AUDIT_ARCHIVE, "SEGMENT_ROWS": 1}
+    record_aged("a", 50)
+    record_aged("b", 45, model_version="2.0.0")
+    archive_events(NOW - timedelta(days=30))
+    assert len(load_manifest().segments) == 2
+
+    opened = []
+    read_segment = archive.read_segment
+    monkeypatch.setattr(
+        archive,
+        "read_segment",
+        lambda segment, *args: opened.append(segment.file) or read_segment(segment, *args),
+    )
+
+    records = list(query_archive(model_version="2.0.0"))
+    assert [record["prediction_id"] for record in records] == ["b"]
+    assert len(set(opened)) == 1
+
+    records = list(query_archive(time_to=NOW - timedelta(days=48)))
+    assert [record["prediction_id"] for record in records] == ["a"]
+
+
+@pytest.mark.django_db
+def test_archive_query_command_and_api(archive_dir, record_aged):
+    record_aged("a", 50)
+    record_aged("b", 45)
+    call_command("ml_audit_archive", "--older-than", "0", stdout=io.StringIO())
+
+    out = io.StringIO()
+    call_command("ml_audit_archive_query", "--prediction-id", "b", stdout=out)
+    (line,) = out.getvalue().splitlines()
+    assert json.loads(line)["prediction_id"] == "b"
+
+    view = PredictionEventViewSet.as_view({"get": "archived"})
+    window = {
+        "time_from": (NOW - timedelta(days=60)).isoformat(),
+        "time_to": NOW.isoformat(),
+        "model_name": "fraud_model",
+    }
+    response = view(APIRequestFactory().get("/", window))
+    assert [record["prediction_id"] for record in response.data["results"]] == ["a", "b"]
+    assert response.data["next"] is None
+
+    response = view(APIRequestFactory().get("/", {"model_name": "fraud_model"}))
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_archive_api_reads_only_the_segments_of_the_requested_page(
+    archive_dir, record_aged, settings, monkeypatch
+):
+    settings.ML_AUDIT_ARCHIVE = {**settings.ML_AUDIT_ARCHIVE, "SEGMENT_ROWS": 1}
+    for days_ago in (50, 49, 48, 47):
+        record_aged(f"p-{days_ago}", days_ago)
+    archive_events(NOW - timedelta(days=30))
+    opened = []
+    read_segment = archive.read_segment
+    monkeypatch.setattr(
+        archive,
+        "read_segment",
+        lambda segment, columns, *args: opened.append((segment.file, columns is None))
+        or read_segment(segment, columns, *args),
+    )
+    view = PredictionEventViewSet.as_view({"get": "archived"})
+    window = {
+        "time_from": (NOW - timedelta(days=60)).isoformat(),
+        "time_to": NOW.isoformat(),
+        "limit": 1,
+        "offset": 1,
+    }
+
+    response = view(APIRequestFactory().get("/", window))
+
+    assert [record["prediction_id"] for record in response.data["results"]] == ["p-49"]
+    assert "offset=2" in response.data["next"]
+    assert "offset=0" in response.data["previous"]
+    # Full rows are decoded for the page and the look-ahead record only,
+    # and the last segment is never opened.
+    assert sum(full for _, full in opened) == 2
+    assert len({file for file, _ in opened}) == 3
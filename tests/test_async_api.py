@@ -0,0 +1,108 @@
+# tests/test_async_api.py
+
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.integrations.drf import audited_prediction
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.services import (
+    ActorPayload,
+    aattach_explanation,
+    arecord_prediction_event,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_arecord_prediction_event_and_aattach_explanation():
+    event = async_to_sync(arecord_prediction_event)(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10, "email": "user@example.com"},
+        output={"score": 0.4},
+        actor=ActorPayload(actor_type="service", actor_id="async-scorer"),
+        prediction_id="async-1",
+    )
+
+    stored = PredictionEvent.objects.get(prediction_id="async-1")
+    assert stored.pk == event.pk
+    assert stored.features["email"] == "*****"
+
+    explanation = async_to_sync(aattach_explanation)(
+        prediction="async-1",
+        method="shap",
+        payload={"amount": 0.7},
+    )
+
+    assert Explanation.objects.get().pk == explanation.pk
+
+
+@pytest.mark.django_db(transaction=True)
+def test_audited_prediction_wraps_async_views():
+    async def build_explanation(features, output, prediction_event):
+        return {"payload": {"amount": 1.0}, "summary": "amount"}
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            confidence_field="fraud_probability",
+            explanation_builder=build_explanation,
+        )
+        async def post(self, request):
+            return {"fraud_probability": 0.8}
+
+    request = Request(
+        APIRequestFactory().post("/predict/", {"amount": 10}, format="json"),
+        parsers=[JSONParser()],
+    )
+
+    response = async_to_sync(View().post)(request)
+
+    assert response.status_code == 200
+    event = PredictionEvent.objects.get(prediction_id=response.data["prediction_id"])
+    assert event.confidence == 0.8
+    assert event.explanation.summary_text == "amount"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_run_sync_explanation_builders_off_the_event_loop():
+    released = threading.Event()
+
+    def build_explanation(features, output, prediction_event):
+        # Blocks until a coroutine on the event loop runs; on the loop itself
+        # this would time out.
+        assert released.wait(timeout=5)
+        return {"payload": {"amount": 1.0}, "summary": "amount"}
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            explanation_builder=build_explanation,
+        )
+        async def post(self, request):
+            return {"fraud_probability": 0.8}
+
+    request = Request(
+        APIRequestFactory().post("/predict/", {"amount": 10}, format="json"),
+        parsers=[JSONParser()],
+    )
+
+    async def release():
+        await asyncio.sleep(0.05)
+        released.set()
+
+    async def main():
+        response, _ = await asyncio.gather(View().post(request), release())
+        return response
+
+    response = async_to_sync(main)()
+
+    event = PredictionEvent.objects.get(prediction_id=response.data["prediction_id"])
+    assert event.explanation.summary_text == "amount"
@@ -0,0 +1,94 @@
+# tests/test_attributions.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import PredictionEventViewSet
+from ml_audit.attributions import expand_attributions, pack_attributions, unpack_attributions
+from ml_audit.models import Explanation, ModelVersion
+from ml_audit.services import attach_attributions, attach_explanation
+
+FEATURES = ["amount", "country", "age", "hour"]
+
+
+def test_pack_roundtrip_and_top_k():
+    packed = pack_attributions([0.25, -2.0, 0.5, 3.0])
+    assert len(packed) == 14 + 4 * 4
+    assert expand_attributions(packed, FEATURES) == {
+        "amount": 0.25,
+        "country": -2.0,
+        "age": 0.5,
+        "hour": 3.0,
+    }
+
+    top = pack_attributions([0.25, -2.0, 0.5, 3.0], dtype="float16", top_k=2)
+    assert unpack_attributions(top) == (4, [1, 3], [-2.0, 3.0])
+    assert expand_attributions(top) == {"1": -2.0, "3": 3.0}
+
+
+def test_pack_rejects_unknown_dtype_and_float16_overflow():
+    with pytest.raises(ValueError):
+        pack_attributions([1.0], dtype="float64")
+    with pytest.raises(ValueError):
+        pack_attributions([1e6], dtype="float16")
+
+
+@pytest.mark.django_db
+def test_attach_attributions_stores_feature_names_once(
+    django_capture_on_commit_callbacks, record_event
+):
+    record_event(prediction_id="attr-1")
+    record_event(prediction_id="attr-2")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = attach_attributions(
+            prediction="attr-1", values=[0.125, 0.25, 0.5, 0.75], feature_names=FEATURES
+        )
+    with CaptureQueriesContext(connection) as queries:
+        attach_attributions(
+            prediction="attr-2", values=[0.4, 0.3, 0.2, 0.1], feature_names=FEATURES
+        )
+
+    assert ModelVersion.objects.get().feature_names == FEATURES
+    assert not any("UPDATE" in q["sql"] and "modelversion" in q["sql"] for q in queries)
+    assert Explanation.objects.get(pk=first.pk).attributions == {
+        "amount": 0.125,
+        "country": 0.25,
+        "age": 0.5,
+        "hour": 0.75,
+    }
+
+    with pytest.raises(ValueError):
+        attach_attributions(prediction="attr-2", values=[1.0, 2.0], feature_names=["a", "b"])
+
+
+@pytest.mark.django_db
+def test_attach_explanation_clears_previous_attributions(record_event):
+    record_event(prediction_id="attr-1")
+    attach_attributions(prediction="attr-1", values=[1.0, 2.0, 3.0, 4.0], feature_names=FEATURES)
+
+    explanation = attach_explanation(prediction="attr-1", method="lime", payload={"x": 1})
+
+    assert explanation.attributions is None
+
+
+@pytest.mark.django_db
+def test_api_expands_attributions(record_event):
+    record_event(prediction_id="attr-1")
+    attach_attributions(
+        prediction="attr-1",
+        values=[1.0, -2.0, 3.0, 0.5],
+        feature_names=FEATURES,
+        top_k=2,
+        payload={"base_value": 0.1},
+    )
+
+    view = PredictionEventViewSet.as_view({"get": "list"})
+    response = view(APIRequestFactory().get("/predictions/"))
+
+    results = response.data["results"] if "results" in response.data else response.data
+    explanation = results[0]["explanation"]
+    assert explanation["attributions"] == {"country": -2.0, "age": 3.0}
+    assert explanation["payload"] == {"base_value": 0.1}
@@ -0,0 +1,187 @@
+# tests/test_buffered_recording.py
+
+import signal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ml_audit.integrations.drf import audited_prediction
+
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.services import buffering
+from ml_audit.services.buffering import (
+    BufferedEvent,
+    BufferedExplanation,
+    BufferedRecorder,
+)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    # Flush explicitly from the test thread instead of the writer thread.
+    monkeypatch.setattr(BufferedRecorder, "start", lambda self: None)
+    recorder = BufferedRecorder(queue_size=10, batch_size=5)
+    monkeypatch.setattr(buffering, "_recorder", recorder)
+    return recorder
+
+
+def _event(prediction_id):
+    return BufferedEvent(
+        prediction_id=prediction_id,
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10, "email": "user@example.com"},
+        output={"score": 0.2},
+        timestamp=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_buffered_records_are_written_on_flush(recorder):
+    recorder.submit(_event("p-1"))
+    recorder.submit(_event("p-2"))
+    recorder.submit(
+        BufferedExplanation(prediction_id="p-1", method="shap", payload={"amount": 0.4})
+    )
+
+    assert recorder.pending() == 3
+    assert PredictionEvent.objects.count() == 0
+
+    assert recorder.flush() == 3
+
+    assert PredictionEvent.objects.count() == 2
+    assert PredictionEvent.objects.get(prediction_id="p-1").features["email"] == "*****"
+    assert Explanation.objects.get().prediction.prediction_id == "p-1"
+    assert recorder.written == 2
+
+
+@pytest.mark.django_db
+def test_full_queue_policies(monkeypatch):
+    monkeypatch.setattr(BufferedRecorder, "start", lambda self: None)
+
+    dropping = BufferedRecorder(queue_size=1, on_full="drop")
+    dropping.submit(_event("p-1"))
+    dropping.submit(_event("p-2"))
+    assert dropping.dropped == 1
+    assert dropping.pending() == 1
+
+    synchronous = BufferedRecorder(queue_size=1, on_full="sync")
+    synchronous.submit(_event("p-3"))
+    synchronous.submit(_event("p-4"))
+    assert synchronous.pending() == 0
+    assert set(PredictionEvent.objects.values_list("prediction_id", flat=True)) == {
+        "p-3",
+        "p-4",
+    }
+
+
+@pytest.mark.django_db
+def test_decorator_returns_prediction_id_before_the_event_is_written(recorder, settings):
+    settings.ML_AUDIT_ASYNC_RECORDING = {"ENABLED": True}
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user("buffered", "b@test.com", "pass"))
+
+    response = client.post(reverse("fraud-prediction"), {"amount": 10})
+
+    assert response.status_code == 200
+    prediction_id = response.data["prediction_id"]
+    assert not PredictionEvent.objects.filter(prediction_id=prediction_id).exists()
+
+    recorder.flush()
+
+    assert PredictionEvent.objects.filter(prediction_id=prediction_id).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_write_a_full_queue_off_the_event_loop(monkeypatch, settings):
+    settings.ML_AUDIT_ASYNC_RECORDING = {"ENABLED": True}
+    monkeypatch.setattr(BufferedRecorder, "start", lambda self: None)
+    recorder = BufferedRecorder(queue_size=1, on_full="sync")
+    monkeypatch.setattr(buffering, "_recorder", recorder)
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            explanation_builder=lambda features, output, prediction_event: {
+                "payload": {"amount": 1.0},
+                "summary": "amount",
+            },
+        )
+        async def post(self, request):
+            return {"fraud_probability": 0.8}
+
+    def post():
+        request = Request(
+            APIRequestFactory().post("/predict/", {"amount": 10}, format="json"),
+            parsers=[JSONParser()],
+        )
+        return async_to_sync(View().post)(request).data["prediction_id"]
+
+    # Each event fills the queue; its explanation finds it full and the
+    # backlog is written synchronously, in a worker thread. On the event
+    # loop the ORM would raise SynchronousOnlyOperation and the records
+    # would be counted as failed.
+    prediction_ids = {post(), post()}
+
+    assert (recorder.failed, recorder.written, recorder.pending()) == (0, 2, 0)
+    assert set(
+        Explanation.objects.values_list("prediction__prediction_id", flat=True)
+    ) == prediction_ids
+
+
+@pytest.mark.django_db
+def test_sigterm_during_a_write_on_the_main_thread_waits_for_it(recorder, monkeypatch):
+    calls = []
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: calls.append("previous"))
+    try:
+        buffering._install_sigterm_handler(recorder)
+        handler = signal.getsignal(signal.SIGTERM)
+        write_events = buffering.record_prediction_events
+
+        def interrupted(payloads, **kwargs):
+            if not calls:
+                # SIGTERM arrives while this thread is inside the write.
+                recorder.submit(_event("p-2"))
+                calls.append("signal")
+                handler(signal.SIGTERM, None)
+            calls.append(f"write {len(payloads)}")
+            return write_events(payloads, **kwargs)
+
+        monkeypatch.setattr(buffering, "record_prediction_events", interrupted)
+        recorder.submit(_event("p-1"))
+        recorder.flush()
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+    # The interrupted write finishes, then the queue is drained, then the
+    # previous handler runs.
+    assert calls == ["signal", "write 1", "write 1", "previous"]
+    assert recorder.written == 2
+    assert PredictionEvent.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_a_bad_record_does_not_lose_the_rest_of_its_batch(recorder):
+    bad = _event("p-bad")
+    bad.output = object()  # not JSON serializable
+    for record in (_event("p-1"), bad, _event("p-2")):
+        recorder.submit(record)
+    recorder.submit(
+        BufferedExplanation(prediction_id="p-1", method="shap", payload={"amount": 0.4})
+    )
+
+    recorder.flush()
+
+    assert set(PredictionEvent.objects.values_list("prediction_id", flat=True)) == {
+        "p-1",
+        "p-2",
+    }
+    assert Explanation.objects.get().prediction.prediction_id == "p-1"
+    assert (recorder.written, recorder.failed) == (2, 1)
@@ -0,0 +1,102 @@
+# tests/test_bulk_explanations.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ml_audit.models import Explanation, PredictionStatus
+from ml_audit.services import attach_explanation, attach_explanations, record_prediction_events
+
+
+@pytest.fixture
+def predictions(db):
+    results = record_prediction_events(
+        {
+            "model_name": "fraud_model",
+            "model_version": "1.0.0",
+            "features": {"amount": i},
+            "output": {"score": 0.1},
+            "prediction_id": f"bulk-exp-{i}",
+        }
+        for i in range(6)
+    )
+    return results
+
+
+def test_attach_explanations_resolves_refs_and_upserts_in_bulk(predictions):
+    existing = attach_explanation(prediction="bulk-exp-0", method="shap", payload={"old": 1})
+    items = [
+        {"prediction": "bulk-exp-0", "method": "shap", "payload": {"new": 1}},
+        {"prediction": predictions[1].id, "method": "lime", "payload": {"b": 2}},
+        {"prediction": str(predictions[2].id), "method": "shap", "payload": {"c": 3}},
+        {"prediction": "bulk-exp-3", "method": "shap", "payload": {"d": 4}, "status": PredictionStatus.PARTIAL},
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        results = attach_explanations(items)
+
+    selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+    inserts = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(selects) == 2
+    assert len(inserts) == 1
+
+    assert [result.ok for result in results] == [True] * 4
+    assert [result.created for result in results] == [False, True, True, True]
+    assert results[0].id == existing.pk
+    assert Explanation.objects.count() == 4
+    assert Explanation.objects.get(pk=existing.pk).payload == {"new": 1}
+    assert Explanation.objects.get(prediction__prediction_id="bulk-exp-3").status == "partial"
+
+
+def test_attach_explanations_reports_errors_per_item(predictions):
+    results = attach_explanations(
+        [
+            {"prediction": "missing", "method": "shap", "payload": {}},
+            {"prediction": "bulk-exp-4", "payload": {}},
+            {"prediction": "bulk-exp-4", "method": "shap", "payload": {}, "colour": "red"},
+            {"prediction": "bulk-exp-5", "method": "shap", "payload": {"ok": True}},
+        ]
+    )
+
+    assert results[0].error == "Prediction not found."
+    assert "method" in results[1].error
+    assert "colour" in results[2].error
+    assert results[3].ok and results[3].created
+    assert Explanation.objects.count() == 1
+
+
+def test_attach_explanations_last_item_wins_within_a_batch(predictions):
+    results = attach_explanations(
+        [
+            {"prediction": "bulk-exp-1", "method": "shap", "payload": {"v": 1}},
+            {"prediction": "bulk-exp-1", "method": "shap", "payload": {"v": 2}},
+        ],
+        batch_size=10,
+    )
+
+    assert [result.created for result in results] == [False, True]
+    assert results[0].id == results[1].id
+    assert Explanation.objects.get().payload == {"v": 2}
+
+
+def test_uuid_refs_match_primary_keys_before_prediction_ids(predictions):
+    # Another event's prediction_id happens to be this event's primary key.
+    ambiguous = str(predictions[1].id)
+    record_prediction_events(
+        [
+            {
+                "model_name": "fraud_model",
+                "model_version": "1.0.0",
+                "features": {"amount": 99},
+                "output": {"score": 0.1},
+                "prediction_id": ambiguous,
+            }
+        ]
+    )
+
+    (result,) = attach_explanations([{"prediction": ambiguous, "method": "shap", "payload": {}}])
+    single = attach_explanation(prediction=ambiguous, method="shap", payload={})
+
+    assert result.ok
+    assert Explanation.objects.get(pk=result.id).prediction_id == predictions[1].id
+    assert single.pk == result.id
@@ -0,0 +1,92 @@
+# tests/test_bulk_recording.py
+
+import pytest
+
+from ml_audit.models import ModelVersion, PredictionEvent, RequestingActor
+from ml_audit.services import (
+    ActorPayload,
+    record_prediction_event,
+    record_prediction_events,
+)
+
+
+def _payload(prediction_id, **overrides):
+    payload = {
+        "model_name": "fraud_model",
+        "model_version": "1.0.0",
+        "features": {"amount": 10, "email": "user@example.com"},
+        "output": {"score": 0.1},
+        "prediction_id": prediction_id,
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.django_db
+def test_bulk_record_creates_events_and_resolves_related_objects_once():
+    actor = ActorPayload(actor_type="service", actor_id="scorer", tenant_id="t1")
+    events = [
+        _payload(f"p-{i}", actor=actor if i % 2 else {"actor_type": "job", "actor_id": "nightly"})
+        for i in range(25)
+    ]
+    events.append(_payload("p-other", model_version="2.0.0"))
+
+    results = record_prediction_events(events, batch_size=10)
+
+    assert len(results) == 26
+    assert all(result.created for result in results)
+    assert PredictionEvent.objects.count() == 26
+    assert ModelVersion.objects.count() == 2
+    assert RequestingActor.objects.count() == 2
+
+    event = PredictionEvent.objects.get(prediction_id="p-1")
+    assert event.id == results[1].id
+    assert event.features["email"] == "*****"
+    assert event.actor.actor_id == "scorer"
+
+
+@pytest.mark.django_db
+def test_bulk_record_is_idempotent_on_prediction_id():
+    existing = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 1},
+        output={"score": 0.5},
+        prediction_id="p-0",
+    )
+
+    results = record_prediction_events(
+        [_payload("p-0"), _payload("p-1"), _payload("p-1")]
+    )
+
+    assert [result.created for result in results] == [False, True, False]
+    assert results[0].id == existing.id
+    assert results[0].duplicate
+    assert results[1].id == results[2].id
+    assert PredictionEvent.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_record_rejects_unknown_fields():
+    with pytest.raises(TypeError):
+        record_prediction_events([_payload("p-0", unexpected=True)])
+
+
+@pytest.mark.django_db
+def test_bulk_record_reuses_an_actor_created_concurrently(monkeypatch):
+    bulk_create = RequestingActor.objects.bulk_create
+    concurrent = []
+
+    def racing_bulk_create(objs, **kwargs):
+        # Another writer inserts the same actor after our lookup missed it.
+        concurrent.append(RequestingActor.objects.create(actor_type="service", actor_id="scorer"))
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(RequestingActor.objects, "bulk_create", racing_bulk_create)
+    actor = ActorPayload(actor_type="service", actor_id="scorer")
+
+    record_prediction_events([_payload("p-1", actor=actor), _payload("p-2", actor=actor)])
+
+    (existing,) = concurrent
+    assert list(RequestingActor.objects.values_list("pk", flat=True)) == [existing.pk]
+    assert set(PredictionEvent.objects.values_list("actor_id", flat=True)) == {existing.pk}
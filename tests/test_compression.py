@@ -0,0 +1,137 @@
+# tests/test_compression.py
+
+from functools import partial
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from ml_audit.api.serializers import PredictionEventSerializer
+from ml_audit.checks import check_json_column_types
+from ml_audit.db import json_column_is_binary
+from ml_audit.fields import MAGIC
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.services import attach_explanation
+
+
+def _raw_column(table, column, pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {column} FROM {table} WHERE id = %s", [pk.hex])
+        value = cursor.fetchone()[0]
+        return value if isinstance(value, str) else bytes(value)
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(
+        event_payload, prediction_id="cmp-1", output={"score": 0.5}, metadata={"source": "test"}
+    )
+
+
+def _features_column_is_binary():
+    return json_column_is_binary(
+        connection, PredictionEvent, PredictionEvent._meta.get_field("features")
+    )
+
+
+@pytest.fixture
+def compression(settings):
+    # Schema changes cannot run inside the test transaction on SQLite, so
+    # tests using this fixture need `django_db(transaction=True)`.
+    settings.ML_AUDIT_COMPRESSION = {"ENABLED": True, "THRESHOLD": 256}
+    call_command("ml_audit_convert_json_columns", stdout=StringIO())
+    yield
+    settings.ML_AUDIT_COMPRESSION = {}
+    call_command("ml_audit_convert_json_columns", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_disabled_compression_keeps_native_json_columns_and_lookups(record_event):
+    event = record_event(features={"amount": 10, "country": "DE"})
+
+    assert not _features_column_is_binary()
+    assert PredictionEvent.objects.filter(features__amount=10).get() == event
+    assert PredictionEvent.objects.filter(output__score=0.5, metadata__source="test").exists()
+    assert not PredictionEvent.objects.filter(features__country="FR").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_values_are_compressed_and_read_back_transparently(compression, record_event):
+    features = {f"feature_{i}": i * 0.5 for i in range(200)}
+    event = record_event(features=features)
+
+    assert _features_column_is_binary()
+    raw = _raw_column("ml_audit_predictionevent", "features", event.pk)
+    assert raw.startswith(MAGIC + b"z")
+    assert _raw_column("ml_audit_predictionevent", "metadata", event.pk) == b'{"source":"test"}'
+
+    stored = PredictionEvent.objects.get(pk=event.pk)
+    assert stored.features == features
+    assert stored.output == {"score": 0.5}
+    assert PredictionEventSerializer(stored).data["features"] == features
+
+
+@pytest.mark.django_db(transaction=True)
+def test_columns_convert_back_to_json_with_values_decompressed(
+    compression, settings, record_event
+):
+    features = {f"feature_{i}": i for i in range(200)}
+    event = record_event(features=features)
+    with connection.cursor() as cursor:
+        # A value written before the column was converted.
+        cursor.execute(
+            "UPDATE ml_audit_predictionevent SET metadata = %s WHERE id = %s",
+            ['{"source": "legacy"}', event.pk.hex],
+        )
+    assert PredictionEvent.objects.get(pk=event.pk).metadata == {"source": "legacy"}
+
+    settings.ML_AUDIT_COMPRESSION = {}
+    out = StringIO()
+    call_command("ml_audit_convert_json_columns", stdout=out)
+
+    assert "ml_audit.PredictionEvent: converted features, output, metadata" in out.getvalue()
+    assert not _features_column_is_binary()
+    stored = PredictionEvent.objects.get(features__feature_3=3)
+    assert (stored.features, stored.metadata) == (features, {"source": "legacy"})
+
+
+@pytest.mark.django_db(transaction=True)
+def test_explanation_payload_is_compressed(compression, record_event):
+    record_event(features={"amount": 10})
+    payload = {f"feature_{i}": 0.001 * i for i in range(300)}
+
+    explanation = attach_explanation(prediction="cmp-1", method="shap", payload=payload)
+
+    assert _raw_column("ml_audit_explanation", "payload", explanation.pk).startswith(MAGIC)
+    assert Explanation.objects.get().payload == payload
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compression_report_command(compression, record_event):
+    record_event(features={f"feature_{i}": i for i in range(200)}, prediction_id="cmp-a")
+    record_event(features={"amount": 1}, prediction_id="cmp-b")
+
+    out = StringIO()
+    call_command("ml_audit_compression_report", stdout=out)
+
+    report = out.getvalue()
+    assert "ml_audit.PredictionEvent (features, output, metadata): 2 row(s), 1 compressed value(s)" in report
+    assert "ml_audit.Explanation (payload): 0 row(s)" in report
+
+
+@pytest.mark.django_db(transaction=True)
+def test_system_check_rejects_columns_that_disagree_with_the_setting(settings):
+    assert check_json_column_types(databases=["default"]) == []
+
+    settings.ML_AUDIT_COMPRESSION = {"ENABLED": True}
+    errors = check_json_column_types(databases=["default"])
+    assert {error.id for error in errors} == {"ml_audit.E001"}
+    assert "features" in {error.obj.name for error in errors}
+
+    call_command("ml_audit_convert_json_columns", stdout=StringIO())
+    try:
+        assert check_json_column_types(databases=["default"]) == []
+    finally:
+        settings.ML_AUDIT_COMPRESSION = {}
+        call_command("ml_audit_convert_json_columns", stdout=StringIO())
@@ -0,0 +1,91 @@
+# tests/test_denormalized_filters.py
+
+import importlib
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import PredictionEventViewSet
+from ml_audit.models import PredictionEvent
+from ml_audit.services import ActorPayload, record_prediction_events
+
+backfill = importlib.import_module(
+    "ml_audit.migrations.0009_backfill_filter_columns"
+).backfill
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(
+        event_payload, actor=ActorPayload(actor_type="user", actor_id="u-1", tenant_id="tenant-a")
+    )
+
+
+@pytest.mark.django_db
+def test_recording_copies_model_and_actor_identity(record_event, event_payload):
+    record_event(prediction_id="single")
+    record_prediction_events(
+        [
+            event_payload(
+                model_version="2.0.0",
+                prediction_id="bulk",
+                actor=ActorPayload(actor_type="service", actor_id="svc"),
+            )
+        ]
+    )
+
+    rows = PredictionEvent.objects.order_by("prediction_id").values_list(
+        "model_name", "model_version", "actor_type", "actor_external_id", "tenant_id"
+    )
+    assert list(rows) == [
+        ("fraud_model", "2.0.0", "service", "svc", ""),
+        ("fraud_model", "1.0.0", "user", "u-1", "tenant-a"),
+    ]
+
+
+@pytest.mark.django_db
+def test_api_filters_use_copied_columns_without_joins(record_event):
+    record_event(prediction_id="a-1")
+    record_event(
+        prediction_id="b-1",
+        model_version="2.0.0",
+        actor=ActorPayload(actor_type="user", actor_id="u-1", tenant_id="tenant-b"),
+    )
+
+    view = PredictionEventViewSet.as_view({"get": "list"})
+    with CaptureQueriesContext(connection) as queries:
+        response = view(
+            APIRequestFactory().get(
+                "/predictions/", {"tenant_id": "tenant-b", "model_version": "2.0.0"}
+            )
+        )
+
+    results = response.data["results"] if "results" in response.data else response.data
+    assert [item["prediction_id"] for item in results] == ["b-1"]
+    sql = " ".join(query["sql"] for query in queries.captured_queries)
+    assert '"ml_audit_requestingactor"."tenant_id" =' not in sql
+    assert '"ml_audit_modelversion"."version" =' not in sql
+
+
+@pytest.mark.django_db
+def test_backfill_migration_fills_existing_rows(record_event):
+    record_event(prediction_id="old-1")
+    record_event(prediction_id="old-2", actor=ActorPayload(actor_type="user", actor_id="u-1"))
+    PredictionEvent.objects.update(
+        model_name="", model_version="", actor_type="", actor_external_id="", tenant_id=""
+    )
+
+    backfill(apps, SimpleNamespace(connection=connection))
+
+    rows = PredictionEvent.objects.order_by("prediction_id").values_list(
+        "model_name", "model_version", "actor_external_id", "tenant_id"
+    )
+    assert list(rows) == [
+        ("fraud_model", "1.0.0", "u-1", "tenant-a"),
+        ("fraud_model", "1.0.0", "u-1", ""),
+    ]
@@ -0,0 +1,129 @@
+# tests/test_explanation_cache.py
+
+from functools import partial
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.integrations.drf import audited_prediction
+from ml_audit.models import PredictionEvent
+from ml_audit.services import (
+    ExplanationCache,
+    attach_memoized_explanation,
+    explanation_key,
+    get_explanation_cache,
+)
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(event_payload, input_fingerprint="blake2b:abc")
+
+
+@pytest.mark.django_db
+def test_decorator_reuses_explanations_for_identical_inputs():
+    calls = []
+
+    def build_explanation(features, output, prediction_event):
+        calls.append(features["amount"])
+        return {"payload": {"amount": 1.0}, "summary": "amount"}
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            explanation_builder=build_explanation,
+            explanation_cache=True,
+        )
+        def post(self, request):
+            return {"fraud_probability": 0.8}
+
+    def call(amount):
+        request = Request(
+            APIRequestFactory().post("/predict/", {"amount": amount}, format="json"),
+            parsers=[JSONParser()],
+        )
+        return View().post(request)
+
+    responses = [call(10), call(10), call(20)]
+
+    assert calls == [10, 20]
+    for response in responses:
+        event = PredictionEvent.objects.get(prediction_id=response.data["prediction_id"])
+        assert event.explanation.payload == {"amount": 1.0}
+        assert event.explanation.summary_text == "amount"
+    info = get_explanation_cache().info()
+    assert (info.hits, info.misses) == (1, 2)
+    assert info.hit_rate == pytest.approx(1 / 3)
+
+
+@pytest.mark.django_db
+def test_memoized_attach_falls_back_to_stored_explanations(record_event):
+    first = record_event(prediction_id="memo-1")
+    attach_memoized_explanation(
+        prediction=first,
+        method="shap",
+        build=lambda: {"payload": {"amount": 0.5}, "summary_text": "amount"},
+    )
+    get_explanation_cache().clear()  # e.g. another process
+
+    def build():
+        raise AssertionError("builder should not run on a cache hit")
+
+    second = record_event(prediction_id="memo-2")
+    with CaptureQueriesContext(connection) as queries:
+        explanation = attach_memoized_explanation(prediction=second, method="shap", build=build)
+
+    assert explanation.payload == {"amount": 0.5}
+    # The fallback filters on the denormalized model columns, without a join.
+    assert not any("ml_audit_modelversion" in q["sql"] for q in queries.captured_queries)
+    assert explanation.summary_text == "amount"
+    info = get_explanation_cache().info()
+    assert (info.hits, info.database_hits, info.misses) == (0, 1, 0)
+
+
+@pytest.mark.django_db
+def test_memoized_attach_separates_model_versions_and_methods(record_event):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"payload": {"n": len(builds)}}
+
+    def attach(prediction_id, method_version=None, **overrides):
+        return attach_memoized_explanation(
+            prediction=record_event(prediction_id=prediction_id, **overrides),
+            method="shap",
+            method_version=method_version,
+            build=build,
+        )
+
+    attach("a")
+    attach("b", model_version="2.0.0")
+    attach("c", method_version="0.45")
+    attach("d", input_fingerprint="")
+    reused = attach("e")
+
+    assert len(builds) == 4
+    assert reused.payload == {"n": 1}
+
+
+def test_in_memory_entries_are_evicted_by_size():
+    cache = ExplanationCache(maxsize=1, database=False)
+    keys = [
+        explanation_key(
+            model_name="m", model_version="1", input_fingerprint=fp, method="shap"
+        )
+        for fp in ("a", "b")
+    ]
+    for key in keys:
+        cache.remember(key, {"payload": {"key": key[2]}})
+
+    assert cache.lookup(keys[0]) is None
+    assert cache.lookup(keys[1]) == {"payload": {"key": "b"}, "summary_text": ""}
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 1, 1)
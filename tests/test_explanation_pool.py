@@ -0,0 +1,148 @@
+# tests/test_explanation_pool.py
+
+import threading
+import time
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.integrations.drf import audited_prediction
+from ml_audit.models import Explanation, ExplanationStatus, PredictionEvent
+from ml_audit.services import explanation_pool
+from ml_audit.services.explanation_pool import ExplanationPool
+
+
+def _to_kwargs(data):
+    return {"payload": data["payload"], "summary_text": data["summary"]}
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Collect results in the test thread instead of the collector thread.
+    monkeypatch.setattr(ExplanationPool, "start", lambda self: None)
+    pool = ExplanationPool(max_workers=2, queue_size=2, timeout=5.0)
+    monkeypatch.setattr(explanation_pool, "_pool", pool)
+    yield pool
+    pool.stop(timeout=1.0)
+
+
+@pytest.fixture
+def event(db, record_event):
+    return record_event(prediction_id="pool-1")
+
+
+def test_pending_explanation_is_replaced_by_the_result(pool, event):
+    release = threading.Event()
+
+    def builder(features, output, prediction_event):
+        release.wait(5)
+        return {"payload": {"amount": 0.9}, "summary": "amount"}
+
+    assert pool.submit(builder, {"amount": 10}, {"score": 0.9}, event, to_kwargs=_to_kwargs)
+    assert Explanation.objects.get().status == ExplanationStatus.PENDING
+
+    release.set()
+    pool.drain(timeout=5)
+
+    explanation = Explanation.objects.get()
+    assert explanation.status == ExplanationStatus.SUCCESS
+    assert explanation.payload == {"amount": 0.9}
+    assert explanation.summary_text == "amount"
+    assert pool.succeeded == 1
+
+
+def test_workers_close_stale_connections_around_each_job(pool, event, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        explanation_pool,
+        "close_old_connections",
+        lambda: calls.append(threading.current_thread().name),
+    )
+
+    def builder(features, output, prediction_event):
+        calls.append("build")
+        return {"payload": {}, "summary": ""}
+
+    pool.submit(builder, {}, {}, event, to_kwargs=_to_kwargs)
+    pool.drain(timeout=5)
+
+    (before, build, after) = calls[:3]
+    assert build == "build"
+    assert before == after and before.startswith("ml-audit-explainer")
+
+
+def test_builder_errors_mark_the_explanation_failed(pool, event):
+    def builder(features, output, prediction_event):
+        raise RuntimeError("shap exploded")
+
+    pool.submit(builder, {}, {}, event, to_kwargs=_to_kwargs)
+    pool.drain(timeout=5)
+
+    explanation = Explanation.objects.get()
+    assert explanation.status == ExplanationStatus.FAILED
+    assert explanation.payload == {"error": "shap exploded"}
+
+
+def test_timed_out_builders_are_failed_and_late_results_discarded(pool, event):
+    pool.timeout = 0.05
+    release = threading.Event()
+
+    def builder(features, output, prediction_event):
+        release.wait(5)
+        return {"payload": {"late": True}, "summary": ""}
+
+    pool.submit(builder, {}, {}, event, to_kwargs=_to_kwargs)
+    time.sleep(0.1)
+    pool._collect(0)
+    assert pool.timed_out == 1
+
+    release.set()
+    pool.drain(timeout=5)
+
+    explanation = Explanation.objects.get()
+    assert explanation.status == ExplanationStatus.FAILED
+    assert explanation.payload == {"error": "timeout"}
+
+
+@pytest.mark.django_db
+def test_decorator_offloads_builder_and_falls_back_inline_when_full(pool):
+    pool.reserve()
+    pool.reserve()  # queue is now full
+    calls = []
+
+    def build_explanation(features, output, prediction_event):
+        calls.append(threading.current_thread().name)
+        return {"payload": {"amount": 1.0}, "summary": "amount"}
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            explanation_builder=build_explanation,
+            explanation_workers=True,
+        )
+        def post(self, request):
+            return {"fraud_probability": 0.8}
+
+    def call():
+        request = Request(
+            APIRequestFactory().post("/predict/", {"amount": 10}, format="json"),
+            parsers=[JSONParser()],
+        )
+        return View().post(request)
+
+    response = call()
+    assert calls == [threading.current_thread().name]
+    assert pool.rejected == 1
+    inline = PredictionEvent.objects.get(prediction_id=response.data["prediction_id"])
+    assert inline.explanation.status == ExplanationStatus.SUCCESS
+
+    pool._slots.release()
+    response = call()
+    pool.drain(timeout=5)
+
+    assert calls[1].startswith("ml-audit-explainer")
+    offloaded = PredictionEvent.objects.get(prediction_id=response.data["prediction_id"])
+    assert offloaded.explanation.status == ExplanationStatus.SUCCESS
@@ -0,0 +1,84 @@
+# tests/test_feature_snapshots.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import PredictionEventViewSet
+from ml_audit.models import FeatureSnapshot, PredictionEvent
+from ml_audit.services import record_prediction_events
+
+
+@pytest.fixture
+def snapshot_storage(settings):
+    settings.ML_AUDIT_FEATURE_STORAGE = {"MODE": "snapshot"}
+
+
+@pytest.mark.django_db
+def test_identical_features_share_one_snapshot(snapshot_storage, record_event):
+    email = "user@example.com"
+    first = record_event(prediction_id="snap-1", features={"amount": 10, "email": email})
+    second = record_event(prediction_id="snap-2", features={"email": email, "amount": 10})
+    third = record_event(prediction_id="snap-3", features={"amount": 11, "email": email})
+
+    assert FeatureSnapshot.objects.count() == 2
+    assert first.feature_snapshot_id == second.feature_snapshot_id != third.feature_snapshot_id
+
+    stored = PredictionEvent.objects.get(prediction_id="snap-1")
+    assert stored.features is None
+    assert stored.resolved_features == {"amount": 10, "email": "*****"}
+
+
+@pytest.mark.django_db
+def test_snapshots_keep_full_float_precision(snapshot_storage, record_event):
+    record_event(prediction_id="snap-a", features={"x": 0.1 + 0.2})
+    record_event(prediction_id="snap-b", features={"x": 0.3})
+
+    assert FeatureSnapshot.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_inline_storage_is_the_default(record_event):
+    event = record_event(prediction_id="inline-1", features={"amount": 10})
+
+    assert event.feature_snapshot_id is None
+    assert event.resolved_features == {"amount": 10}
+    assert not FeatureSnapshot.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_record_deduplicates_snapshots(snapshot_storage, record_event, event_payload):
+    record_event(prediction_id="existing", features={"amount": 0})
+    events = [
+        event_payload(features={"amount": i % 3}, prediction_id=f"bulk-{i}") for i in range(9)
+    ]
+
+    record_prediction_events(events, batch_size=4)
+
+    assert FeatureSnapshot.objects.count() == 3
+    features = {
+        event.prediction_id: event.resolved_features
+        for event in PredictionEvent.objects.select_related("feature_snapshot")
+    }
+    assert all(features[f"bulk-{i}"] == {"amount": i % 3} for i in range(9))
+
+
+@pytest.mark.django_db
+def test_api_resolves_snapshot_features_with_one_prefetch_query(
+    snapshot_storage, record_event
+):
+    for i in range(6):
+        record_event(prediction_id=f"api-{i}", features={"amount": i % 2})
+
+    view = PredictionEventViewSet.as_view({"get": "list"})
+    with CaptureQueriesContext(connection) as queries:
+        response = view(APIRequestFactory().get("/predictions/"))
+
+    assert response.status_code == 200
+    results = response.data["results"] if "results" in response.data else response.data
+    assert sorted(item["features"]["amount"] for item in results) == [0, 0, 0, 1, 1, 1]
+    snapshot_queries = [
+        query for query in queries.captured_queries if "featuresnapshot" in query["sql"]
+    ]
+    assert len(snapshot_queries) == 1
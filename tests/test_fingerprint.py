@@ -0,0 +1,122 @@
+# tests/test_fingerprint.py
+
+import pytest
+
+from ml_audit.fingerprint import compute_fingerprint, fingerprint_many
+from ml_audit.models import PredictionEvent
+from ml_audit.services import record_prediction_event, record_prediction_events
+
+
+def test_fingerprint_ignores_key_order_and_integral_floats():
+    first = compute_fingerprint({"amount": 10, "country": "IN", "score": 0.25})
+    second = compute_fingerprint({"score": 0.25, "country": "IN", "amount": 10.0})
+
+    assert first == second
+    assert first.startswith("blake2b:")
+
+
+def test_fingerprint_distinguishes_types_and_structure():
+    fingerprints = {
+        compute_fingerprint({"a": "1"}),
+        compute_fingerprint({"a": 1}),
+        compute_fingerprint({"a": True}),
+        compute_fingerprint({"a": None}),
+        compute_fingerprint({"a": [1]}),
+        compute_fingerprint({"a": {"b": 1}}),
+        compute_fingerprint({"a:": ""}),
+    }
+
+    assert len(fingerprints) == 7
+
+
+def test_fingerprint_normalizes_float_precision():
+    assert compute_fingerprint({"x": 0.1 + 0.2}) == compute_fingerprint({"x": 0.3})
+    assert compute_fingerprint({"x": 0.3}, float_precision=17) != compute_fingerprint(
+        {"x": 0.1 + 0.2}, float_precision=17
+    )
+
+
+def test_fingerprint_many_matches_single_fingerprints():
+    rows = [
+        {"amount": 10.5, "country": "IN"},
+        {"country": "US", "amount": 3},
+        {"amount": 7.25, "country": "IN", "tags": ["a", "b"]},
+        {"amount": None, "country": "IN"},
+        {"nested": {"z": 1, "a": [0.5, "x"]}},
+        {},
+    ]
+
+    assert fingerprint_many(rows) == [compute_fingerprint(row) for row in rows]
+    assert fingerprint_many(rows, float_precision=0) == [
+        compute_fingerprint(row, float_precision=0) for row in rows
+    ]
+
+
+@pytest.mark.django_db
+def test_record_prediction_event_computes_fingerprint_from_redacted_features(settings):
+    settings.ML_AUDIT_FINGERPRINT = {"ENABLED": True}
+    features = {"amount": 10, "email": "user@example.com"}
+
+    event = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features=features,
+        output={"score": 0.1},
+        prediction_id="fp-1",
+    )
+
+    assert event.input_fingerprint == compute_fingerprint({"amount": 10, "email": "*****"})
+
+
+@pytest.mark.django_db
+def test_explicit_fingerprint_wins_and_auto_can_be_requested_per_call():
+    explicit = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10},
+        output={"score": 0.1},
+        input_fingerprint="caller-supplied",
+        auto_fingerprint=True,
+    )
+    automatic = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10},
+        output={"score": 0.1},
+        auto_fingerprint=True,
+    )
+    disabled = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10},
+        output={"score": 0.1},
+    )
+
+    assert explicit.input_fingerprint == "caller-supplied"
+    assert automatic.input_fingerprint == compute_fingerprint({"amount": 10})
+    assert disabled.input_fingerprint == ""
+
+
+@pytest.mark.django_db
+def test_bulk_record_fingerprints_raw_features_when_configured(settings):
+    settings.ML_AUDIT_FINGERPRINT = {"ENABLED": True, "SOURCE": "raw"}
+    events = [
+        {
+            "model_name": "fraud_model",
+            "model_version": "1.0.0",
+            "features": {"amount": i, "email": f"user{i}@example.com"},
+            "output": {"score": 0.1},
+            "prediction_id": f"fp-bulk-{i}",
+        }
+        for i in range(3)
+    ]
+    events[0]["input_fingerprint"] = "caller-supplied"
+
+    record_prediction_events(events)
+
+    stored = dict(PredictionEvent.objects.values_list("prediction_id", "input_fingerprint"))
+    assert stored["fp-bulk-0"] == "caller-supplied"
+    for i in (1, 2):
+        assert stored[f"fp-bulk-{i}"] == compute_fingerprint(
+            {"amount": i, "email": f"user{i}@example.com"}
+        )
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from ml_audit.services.recording import record_prediction_event
 
@@ -23,3 +25,30 @@ class IdempotencyTest(TestCase):
         )
 
         self.assertEqual(event1.id, event2.id)
+
+    def test_new_event_is_written_with_a_conflict_ignoring_insert(self):
+        record_prediction_event(
+            model_name="test",
+            model_version="1",
+            features={"x": 1},
+            output={"y": 2},
+            prediction_id="first",
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            record_prediction_event(
+                model_name="test",
+                model_version="1",
+                features={"x": 1},
+                output={"y": 2},
+                prediction_id="second",
+            )
+
+        event_queries = [
+            q["sql"] for q in queries.captured_queries if "ml_audit_predictionevent" in q["sql"]
+        ]
+        # No SELECT before the insert; the primary key read afterwards only
+        # detects a duplicate.
+        self.assertEqual(len(event_queries), 2)
+        self.assertTrue(event_queries[0].startswith("INSERT OR IGNORE"))
+        self.assertTrue(event_queries[1].startswith("SELECT"))
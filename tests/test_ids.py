@@ -0,0 +1,46 @@
+# tests/test_ids.py
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ml_audit.ids import new_id, uuid7, uuid7_time
+from ml_audit.services import record_prediction_event
+
+
+def test_uuid7_values_are_versioned_and_strictly_increasing():
+    values = [uuid7() for _ in range(10000)]
+
+    assert all(value.version == 7 for value in values)
+    assert all(value.variant == uuid.RFC_4122 for value in values)
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert abs(uuid7_time(values[0]) - datetime.now(timezone.utc)) < timedelta(seconds=5)
+
+
+def test_new_id_follows_the_configured_algorithm(settings):
+    assert new_id().version == 4
+
+    settings.ML_AUDIT_ID_GENERATOR = {"ALGORITHM": "uuid7"}
+    assert new_id().version == 7
+
+    with pytest.raises(ValueError):
+        uuid7_time(uuid.uuid4())
+
+
+@pytest.mark.django_db
+def test_recorded_events_use_time_ordered_ids(settings):
+    settings.ML_AUDIT_ID_GENERATOR = {"ALGORITHM": "uuid7"}
+
+    event = record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10},
+        output={"score": 0.9},
+    )
+
+    assert event.pk.version == 7
+    assert event.model_id.version == 7
+    assert uuid7_time(event.pk) <= uuid7_time(new_id())
+    assert uuid.UUID(event.prediction_id).version == 7
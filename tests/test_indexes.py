@@ -0,0 +1,44 @@
+# tests/test_indexes.py
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from ml_audit.models import PredictionEvent
+
+
+def _indexes(model):
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    return {
+        name: info["columns"]
+        for name, info in constraints.items()
+        if info["index"] and not info["primary_key"]
+    }
+
+
+@pytest.mark.django_db
+def test_prediction_event_indexes_follow_api_filters():
+    indexes = _indexes(PredictionEvent)
+
+    assert indexes["ml_audit_pe_model_ts"] == ["model_name", "timestamp"]
+    assert indexes["ml_audit_pe_tenant_ts"] == ["tenant_id", "timestamp"]
+    assert indexes["ml_audit_pe_unsuccessful_ts"] == ["status", "timestamp"]
+    # Foreign keys keep an index leading with their column.
+    assert indexes["ml_audit_pe_model_fk_ts"] == ["model_id", "timestamp"]
+    assert indexes["ml_audit_pe_actor_fk_ts"] == ["actor_id", "timestamp"]
+    assert not any("output" in columns for columns in indexes.values())
+    # No column set is indexed twice.
+    column_sets = [tuple(columns) for columns in indexes.values()]
+    assert len(column_sets) == len(set(column_sets))
+
+
+@pytest.mark.django_db
+def test_model_time_range_query_uses_composite_index():
+    queryset = PredictionEvent.objects.filter(
+        model_name="fraud_model", timestamp__gte=timezone.now()
+    ).order_by("-timestamp")
+
+    assert "ml_audit_pe_model_ts" in queryset.explain()
@@ -0,0 +1,33 @@
+# tests/test_migrations.py
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from ml_audit.models import PredictionEvent, RequestingActor
+from ml_audit.services import ActorPayload
+
+
+def _migrate(target=None):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate([target] if target else executor.loader.graph.leaf_nodes("ml_audit"))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unique_actor_migration_merges_existing_duplicates(record_event):
+    _migrate(("ml_audit", "0012_quantile_sketches"))
+    try:
+        event = record_event(
+            actor=ActorPayload(actor_type="api_key", actor_id="client-1", tenant_id="t1")
+        )
+        duplicate = RequestingActor.objects.create(
+            actor_type="api_key", actor_id="client-1", tenant_id="t1"
+        )
+        PredictionEvent.objects.filter(pk=event.pk).update(actor=duplicate)
+    finally:
+        _migrate()
+
+    survivor = RequestingActor.objects.get(actor_id="client-1")
+    assert survivor.pk == event.actor_id
+    assert PredictionEvent.objects.get(pk=event.pk).actor_id == survivor.pk
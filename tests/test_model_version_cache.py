@@ -0,0 +1,66 @@
+# tests/test_model_version_cache.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ml_audit.models import ModelVersion
+from ml_audit.services.recording import (
+    get_model_version_cache,
+    warm_model_version_cache,
+)
+
+
+@pytest.fixture
+def model_version_cache():
+    return get_model_version_cache()
+
+
+@pytest.mark.django_db
+def test_resolution_is_cached_after_commit(
+    model_version_cache, record_event, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        first = record_event()
+
+    assert model_version_cache.get(("fraud_model", "1.0.0")) == first.model_id
+
+    with CaptureQueriesContext(connection) as queries:
+        second = record_event()
+
+    assert second.model_id == first.model_id
+    assert not any("ml_audit_modelversion" in q["sql"] for q in queries.captured_queries)
+    assert model_version_cache.info().hits >= 1
+
+
+@pytest.mark.django_db
+def test_uncommitted_resolution_is_not_cached(model_version_cache, record_event):
+    record_event()
+
+    assert ("fraud_model", "1.0.0") not in model_version_cache
+
+
+@pytest.mark.django_db
+def test_cache_is_invalidated_on_model_version_changes(model_version_cache):
+    model = ModelVersion.objects.create(model_name="fraud_model", version="1.0.0")
+    model_version_cache.set(("fraud_model", "1.0.0"), model.pk)
+
+    model.version = "1.0.1"
+    model.save()
+
+    assert ("fraud_model", "1.0.0") not in model_version_cache
+
+    model_version_cache.set(("fraud_model", "1.0.1"), model.pk)
+    model.delete()
+
+    assert len(model_version_cache) == 0
+
+
+@pytest.mark.django_db
+def test_warm_model_version_cache_loads_active_versions(model_version_cache):
+    active = ModelVersion.objects.create(model_name="fraud_model", version="1.0.0")
+    ModelVersion.objects.create(model_name="fraud_model", version="0.9.0", is_active=False)
+
+    assert warm_model_version_cache() == 1
+    assert model_version_cache.get(("fraud_model", "1.0.0")) == active.pk
+    assert ("fraud_model", "0.9.0") not in model_version_cache
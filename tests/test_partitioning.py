@@ -0,0 +1,155 @@
+# tests/test_partitioning.py
+
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connections
+
+from ml_audit.archive import query_archive
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.partitioning import (
+    TABLE,
+    is_partitioned,
+    list_partitions,
+    next_period,
+    partition_name,
+    partition_ranges,
+    period_start,
+    unpartition_prediction_events,
+)
+from ml_audit.services import attach_explanation
+from ml_audit.services.archiving import archive_events
+
+requires_postgresql = pytest.mark.skipif(
+    "postgresql" not in settings.DATABASES,
+    reason="set ML_AUDIT_TEST_POSTGRES_DSN to run the PostgreSQL tests",
+)
+POSTGRESQL_DATABASES = ["default", "postgresql"]
+
+
+def test_periods_align_to_interval_boundaries():
+    day = date(2026, 12, 17)  # a Thursday
+    assert period_start(day, "month") == date(2026, 12, 1)
+    assert period_start(day, "week") == date(2026, 12, 14)
+    assert period_start(day, "day") == day
+    assert next_period(date(2026, 12, 1), "month") == date(2027, 1, 1)
+    assert next_period(date(2026, 1, 1), "month") == date(2026, 2, 1)
+
+
+def test_partition_ranges_cover_every_period():
+    ranges = partition_ranges(date(2026, 11, 20), date(2027, 1, 3), "month")
+
+    assert ranges == [
+        (date(2026, 11, 1), date(2026, 12, 1)),
+        (date(2026, 12, 1), date(2027, 1, 1)),
+        (date(2027, 1, 1), date(2027, 2, 1)),
+    ]
+    assert partition_name(ranges[0][0]) == "ml_audit_predictionevent_p20261101"
+
+
+def test_list_partitions_parses_range_bounds():
+    class Cursor:
+        def execute(self, sql, params):
+            pass
+
+        def fetchall(self):
+            return [
+                (
+                    "ml_audit_predictionevent_p20261101",
+                    "FOR VALUES FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')",
+                ),
+                ("ml_audit_predictionevent_default", "DEFAULT"),
+            ]
+
+    monthly, default = list_partitions(Cursor())
+
+    assert monthly.start == datetime(2026, 11, 1, tzinfo=timezone.utc)
+    assert monthly.end == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert not monthly.is_default
+    assert default.is_default
+
+
+@pytest.mark.django_db
+def test_sqlite_keeps_a_single_table():
+    assert not is_partitioned("default")
+    with pytest.raises(CommandError, match="requires PostgreSQL"):
+        call_command("ml_audit_partitions", "create")
+
+
+@pytest.fixture
+def postgresql(settings):
+    """Route ml-audit to the PostgreSQL test database; undo any partitioning afterwards."""
+    settings.DATABASE_ROUTERS = ["ml_audit.routers.AuditRouter"]
+    settings.ML_AUDIT_DATABASES = {"WRITE": "postgresql"}
+    connection = connections["postgresql"]
+    yield connection
+    unpartition_prediction_events(connection, [("ml_audit_explanation", "prediction_id")])
+
+
+def _partition_of(connection, prediction_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {TABLE} WHERE prediction_id = %s",
+            [prediction_id],
+        )
+        return cursor.fetchone()[0]
+
+
+@requires_postgresql
+@pytest.mark.django_db(transaction=True, databases=POSTGRESQL_DATABASES)
+def test_convert_keeps_rows_and_routes_inserts_to_their_partitions(postgresql, record_event):
+    now = datetime.now(timezone.utc)
+    record_event(prediction_id="old", timestamp=now - timedelta(days=400))
+    record_event(prediction_id="recent", timestamp=now)
+
+    call_command("ml_audit_partitions", "convert", stdout=StringIO())
+
+    assert is_partitioned("postgresql")
+    record_event(prediction_id="next-month", timestamp=now + timedelta(days=40))
+    record_event(prediction_id="far-future", timestamp=now + timedelta(days=5 * 365))
+
+    expected = {
+        "old": now - timedelta(days=400),
+        "recent": now,
+        "next-month": now + timedelta(days=40),
+    }
+    for prediction_id, timestamp in expected.items():
+        assert _partition_of(postgresql, prediction_id) == partition_name(
+            period_start(timestamp.date(), "month")
+        )
+    assert _partition_of(postgresql, "far-future") == f"{TABLE}_default"
+
+    # prediction_id stays unique across partitions.
+    duplicate = record_event(prediction_id="old", timestamp=now)
+    assert duplicate.timestamp < now - timedelta(days=300)
+    assert PredictionEvent.objects.using("postgresql").filter(prediction_id="old").count() == 1
+
+
+@requires_postgresql
+@pytest.mark.django_db(transaction=True, databases=POSTGRESQL_DATABASES)
+def test_detach_refuses_unarchived_partitions_and_archives_late_explanations(
+    postgresql, settings, tmp_path, record_event
+):
+    settings.ML_AUDIT_ARCHIVE = {"DIRECTORY": str(tmp_path), "FORMAT": "native"}
+    old = record_event(
+        prediction_id="old", timestamp=datetime.now(timezone.utc) - timedelta(days=400)
+    )
+    # Converting creates partitions covering the existing rows.
+    call_command("ml_audit_partitions", "convert", stdout=StringIO())
+
+    with pytest.raises(CommandError, match="not in the archive manifest"):
+        call_command("ml_audit_partitions", "detach", "--older-than", "300", "--drop")
+    assert PredictionEvent.objects.using("postgresql").filter(prediction_id="old").exists()
+
+    archive_events(datetime.now(timezone.utc) - timedelta(days=300), detach=False)
+    # Attached after the partition was exported.
+    attach_explanation(prediction=old, method="shap", payload={"amount": 0.1})
+    call_command("ml_audit_partitions", "detach", "--older-than", "300", stdout=StringIO())
+
+    assert not PredictionEvent.objects.using("postgresql").filter(prediction_id="old").exists()
+    assert not Explanation.objects.using("postgresql").exists()
+    (record,) = query_archive(prediction_id="old")
+    assert record["explanation"]["payload"] == {"amount": 0.1}
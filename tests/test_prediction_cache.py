@@ -0,0 +1,93 @@
+# tests/test_prediction_cache.py
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.fingerprint import compute_fingerprint
+from ml_audit.integrations.drf import audited_prediction
+from ml_audit.models import PredictionEvent
+from ml_audit.services.prediction_cache import get_prediction_cache
+
+
+def _view(calls, **options):
+    class View:
+        @audited_prediction(model_name="fraud_model", model_version="1.0.0", **options)
+        def post(self, request):
+            calls.append(request.data["amount"])
+            return {"fraud_probability": request.data["amount"] / 100}
+
+    return View()
+
+
+def _call(view, amount):
+    request = Request(
+        APIRequestFactory().post("/predict/", {"amount": amount}, format="json"),
+        parsers=[JSONParser()],
+    )
+    return view.post(request)
+
+
+@pytest.mark.django_db
+def test_repeated_inputs_are_served_from_the_cache_and_still_audited():
+    calls = []
+    view = _view(calls, cache_predictions=True)
+
+    first = _call(view, 10)
+    second = _call(view, 10)
+    _call(view, 20)
+
+    assert calls == [10, 20]
+    assert second.data["fraud_probability"] == 0.1
+    assert second.data["prediction_id"] != first.data["prediction_id"]
+
+    original = PredictionEvent.objects.get(prediction_id=first.data["prediction_id"])
+    replayed = PredictionEvent.objects.get(prediction_id=second.data["prediction_id"])
+    assert original.metadata == {}
+    assert replayed.metadata == {
+        "cached": True,
+        "cached_from": first.data["prediction_id"],
+    }
+    assert replayed.output == original.output
+    info = get_prediction_cache().info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+@pytest.mark.django_db
+def test_recorded_events_back_the_cache_when_fingerprints_are_raw(settings):
+    settings.ML_AUDIT_FINGERPRINT = {"SOURCE": "raw"}
+    calls = []
+    view = _view(calls, cache_predictions=True)
+
+    first = _call(view, 10)
+    recorded = PredictionEvent.objects.get(prediction_id=first.data["prediction_id"])
+    assert recorded.input_fingerprint == compute_fingerprint({"amount": 10})
+
+    get_prediction_cache().clear()  # e.g. another process
+    second = _call(view, 10)
+
+    assert calls == [10]
+    assert second.data["fraud_probability"] == 0.1
+    assert get_prediction_cache().info().database_hits == 1
+
+    get_prediction_cache().clear()
+    key = ("fraud_model", "1.0.0", compute_fingerprint({"amount": 10}))
+    with CaptureQueriesContext(connection) as queries:
+        assert get_prediction_cache().lookup(key).output == recorded.output
+    # The fallback filters on the denormalized model columns, without a join.
+    assert not any("ml_audit_modelversion" in q["sql"] for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_views_without_cache_predictions_always_run():
+    calls = []
+    view = _view(calls)
+
+    _call(view, 10)
+    _call(view, 10)
+
+    assert calls == [10, 10]
+    assert get_prediction_cache().info().currsize == 0
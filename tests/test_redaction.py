@@ -1,5 +1,12 @@
 from django.test import TestCase
 
+from ml_audit.conf import (
+    RedactionConfig,
+    get_redaction_config,
+    get_spool_config,
+    parse_path_pattern,
+)
+from ml_audit.redaction import redact_features
 from ml_audit.services.recording import record_prediction_event
 
 
@@ -13,3 +20,84 @@ class RedactionTest(TestCase):
         )
 
         self.assertEqual(event.features["email"], "*****")
+
+
+class RedactionConfigCacheTest(TestCase):
+    def test_config_is_reused_until_settings_change(self):
+        config = get_redaction_config()
+        self.assertIs(get_redaction_config(), config)
+
+        with self.settings(ML_AUDIT_REDACTION={"ALLOWLIST": ["email"]}):
+            updated = get_redaction_config()
+            self.assertIsNot(updated, config)
+            self.assertFalse(updated.is_sensitive("email"))
+
+        self.assertTrue(get_redaction_config().is_sensitive("email"))
+
+    def test_other_configs_are_reused_until_their_settings_change(self):
+        config = get_spool_config()
+        self.assertIs(get_spool_config(), config)
+
+        with self.settings(ML_AUDIT_SPOOL={"DIRECTORY": "/tmp/spool"}):
+            self.assertTrue(get_spool_config().enabled)
+
+        self.assertFalse(get_spool_config().enabled)
+
+    def test_substring_rules_and_overrides(self):
+        config = RedactionConfig(allowlist={"token_count"}, denylist={"national_id"})
+
+        self.assertTrue(config.is_sensitive("customer_email_address"))
+        self.assertTrue(config.is_sensitive("national_id"))
+        self.assertFalse(config.is_sensitive("token_count"))
+        self.assertFalse(config.is_sensitive("amount"))
+        # Memoized verdicts stay consistent on repeat lookups.
+        self.assertTrue(config.is_sensitive("customer_email_address"))
+
+
+class NestedRedactionTest(TestCase):
+    def test_sensitive_names_are_masked_at_any_depth(self):
+        features = {
+            "amount": 10,
+            "customer": {
+                "contact": {"email": "user@example.com", "country": "DE"},
+                "cards": [{"card_number": "4111"}, {"card_number": "5500"}],
+            },
+        }
+
+        redacted = redact_features(features, RedactionConfig())
+
+        self.assertEqual(redacted["customer"]["contact"]["email"], "*****")
+        self.assertEqual(redacted["customer"]["contact"]["country"], "DE")
+        self.assertEqual(
+            redacted["customer"]["cards"], [{"card_number": "*****"}] * 2
+        )
+        # The input payload is left untouched.
+        self.assertEqual(features["customer"]["contact"]["email"], "user@example.com")
+
+    def test_path_rules(self):
+        config = RedactionConfig(
+            path_denylist=(parse_path_pattern("customer.*.dob"), parse_path_pattern("**.pin")),
+            path_allowlist=(parse_path_pattern("merchant.address"),),
+        )
+        features = {
+            "customer": {"profile": {"dob": "1990-01-01", "age": 35}},
+            "device": {"auth": {"pin": "1234"}},
+            "merchant": {"address": "Main St 1"},
+        }
+
+        redacted = redact_features(features, config)
+
+        self.assertEqual(redacted["customer"]["profile"], {"dob": "*****", "age": 35})
+        self.assertEqual(redacted["device"]["auth"]["pin"], "*****")
+        self.assertEqual(redacted["merchant"]["address"], "Main St 1")
+
+    def test_plans_are_cached_per_payload_shape(self):
+        config = RedactionConfig()
+
+        redact_features({"user": {"email": "a@example.com"}}, config)
+        redacted = redact_features({"user": {"email": "b@example.com"}}, config)
+        redact_features({"user": {"email": "c@example.com", "age": 3}}, config)
+
+        self.assertEqual(redacted["user"]["email"], "*****")
+        info = config.plan_cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
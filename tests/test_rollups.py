@@ -0,0 +1,136 @@
+# tests/test_rollups.py
+
+from datetime import datetime, timezone
+from functools import partial
+
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import PredictionRollupViewSet
+from ml_audit.models import PredictionRollup, PredictionStatus
+from ml_audit.services import ActorPayload, record_prediction_events
+from ml_audit.services.rollups import rebuild_rollups, update_rollups
+
+HOUR_1 = datetime(2026, 3, 1, 9, 15, tzinfo=timezone.utc)
+HOUR_2 = datetime(2026, 3, 1, 10, 45, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(
+        event_payload,
+        environment="production",
+        actor=ActorPayload(actor_type="user", actor_id="u-1", tenant_id="acme"),
+        decision_outcome="approved",
+        latency_ms=10.0,
+        confidence=0.5,
+    )
+
+
+def _rollups():
+    return {
+        row.bucket: row
+        for row in PredictionRollup.objects.filter(model_name="fraud_model", tenant_id="acme")
+    }
+
+
+@pytest.mark.django_db
+def test_periodic_rollup_counts_each_event_once(event_payload, record_event):
+    record_prediction_events(
+        [
+            event_payload(prediction_id="a", timestamp=HOUR_1),
+            event_payload(
+                prediction_id="b",
+                timestamp=HOUR_1,
+                status=PredictionStatus.FAILED,
+                decision_outcome="",
+                latency_ms=30.0,
+            ),
+            event_payload(prediction_id="c", timestamp=HOUR_2, confidence=None),
+        ]
+    )
+    update_rollups(lag=0)
+    record_event(prediction_id="d", timestamp=HOUR_1, decision_outcome="denied")
+    update_rollups(lag=0)
+    update_rollups(lag=0)
+
+    rollups = _rollups()
+    first = rollups[HOUR_1.replace(minute=0)]
+    assert (first.event_count, first.failed_count, first.success_count) == (3, 1, 2)
+    assert first.outcome_counts == {"approved": 1, "": 1, "denied": 1}
+    assert first.avg_latency_ms == pytest.approx(50 / 3)
+    assert first.latency_max == 30.0
+    second = rollups[HOUR_2.replace(minute=0)]
+    assert (second.event_count, second.confidence_count) == (1, 0)
+    assert second.avg_confidence is None
+
+
+@pytest.mark.django_db
+def test_inline_rollups_match_a_rebuild(settings, event_payload, record_event):
+    settings.ML_AUDIT_ROLLUP = {"INLINE": True}
+
+    record_event(prediction_id="a", timestamp=HOUR_1)
+    record_event(prediction_id="a", timestamp=HOUR_1)  # duplicate prediction_id
+    record_prediction_events(
+        [
+            event_payload(prediction_id="b", timestamp=HOUR_1, status=PredictionStatus.PARTIAL),
+            event_payload(prediction_id="a", timestamp=HOUR_1),
+            event_payload(prediction_id="c", timestamp=HOUR_2),
+        ]
+    )
+    inline = {
+        bucket: (row.event_count, row.partial_count, row.latency_sum, row.outcome_counts)
+        for bucket, row in _rollups().items()
+    }
+
+    # An inline rebuild covers every committed event, whatever the lag.
+    rebuild_rollups(lag=3600)
+    rebuilt = {
+        bucket: (row.event_count, row.partial_count, row.latency_sum, row.outcome_counts)
+        for bucket, row in _rollups().items()
+    }
+
+    assert inline == rebuilt
+    assert inline[HOUR_1.replace(minute=0)] == (2, 1, 20.0, {"approved": 2})
+
+
+@pytest.mark.django_db
+def test_command_refuses_incremental_runs_in_inline_mode(settings):
+    settings.ML_AUDIT_ROLLUP = {"INLINE": True}
+
+    with pytest.raises(CommandError):
+        call_command("ml_audit_rollup")
+    call_command("ml_audit_rollup", "--rebuild")
+
+
+@pytest.mark.django_db
+def test_api_lists_and_summarizes_buckets(event_payload):
+    record_prediction_events(
+        [
+            event_payload(prediction_id="a", timestamp=HOUR_1),
+            event_payload(
+                prediction_id="b",
+                timestamp=HOUR_2,
+                status=PredictionStatus.FAILED,
+                latency_ms=30.0,
+            ),
+            event_payload(prediction_id="c", timestamp=HOUR_2, model_version="2.0.0"),
+        ]
+    )
+    call_command("ml_audit_rollup", "--lag", "0")
+    factory = APIRequestFactory()
+
+    view = PredictionRollupViewSet.as_view({"get": "list"})
+    response = view(factory.get("/rollups/", {"model_version": "1.0.0"}))
+    results = response.data["results"] if "results" in response.data else response.data
+    assert [item["event_count"] for item in results] == [1, 1]
+    assert results[0]["failure_rate"] == 1.0
+
+    summary = PredictionRollupViewSet.as_view({"get": "summary"})
+    response = summary(factory.get("/rollups/summary/", {"model_name": "fraud_model"}))
+    assert response.data["buckets"] == 3
+    assert response.data["event_count"] == 3
+    assert response.data["failure_rate"] == pytest.approx(1 / 3)
+    assert response.data["avg_latency_ms"] == pytest.approx(50 / 3)
+    assert response.data["outcome_counts"] == {"approved": 3}
@@ -0,0 +1,117 @@
+# tests/test_routers.py
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import ModelVersionViewSet
+from ml_audit.middleware import AuditReadStickinessMiddleware
+from ml_audit.models import ModelVersion, PredictionEvent
+from ml_audit.routers import AuditRouter, last_write, note_write, read_database
+from ml_audit.services import record_prediction_event
+
+AUDIT_DATABASES = ["default", "audit", "audit_replica"]
+
+
+@pytest.fixture
+def audit_databases(settings):
+    settings.DATABASE_ROUTERS = ["ml_audit.routers.AuditRouter"]
+    settings.ML_AUDIT_DATABASES = {"WRITE": "audit", "READ": ["audit_replica"]}
+    token = last_write.set(0.0)
+    yield settings.ML_AUDIT_DATABASES
+    last_write.reset(token)
+
+
+def test_router_sends_ml_audit_models_to_the_write_alias(audit_databases):
+    router = AuditRouter()
+
+    assert router.db_for_write(PredictionEvent) == "audit"
+    assert router.db_for_read(ModelVersion) == "audit"
+    replica_row = ModelVersion()
+    replica_row._state.db = "audit_replica"
+    assert router.db_for_read(PredictionEvent, instance=replica_row) == "audit_replica"
+    assert router.allow_migrate("audit", "ml_audit") is True
+    assert router.allow_migrate("default", "ml_audit") is False
+    assert router.allow_migrate("default", "auth") is None
+    assert read_database() == "audit_replica"
+
+
+@pytest.mark.django_db(databases=AUDIT_DATABASES)
+def test_recording_transaction_targets_the_audit_database(
+    audit_databases, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(using="audit") as callbacks:
+        record_prediction_event(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            features={"amount": 10},
+            output={"score": 0.9},
+            prediction_id="p-1",
+        )
+
+    # The cache fills are deferred to the audit database's commit.
+    assert callbacks
+    assert PredictionEvent.objects.using("audit").filter(prediction_id="p-1").exists()
+    assert not PredictionEvent.objects.using("default").exists()
+
+
+@pytest.mark.django_db(databases=AUDIT_DATABASES)
+def test_api_reads_from_replicas_until_a_write_pins_the_primary(audit_databases):
+    audit_databases["STICKY"] = 5
+    ModelVersion.objects.using("audit").create(model_name="primary", version="1")
+    ModelVersion.objects.using("audit_replica").create(model_name="replica", version="1")
+    view = ModelVersionViewSet.as_view({"get": "list"})
+
+    def model_names():
+        response = view(APIRequestFactory().get("/models/"))
+        results = response.data["results"] if "results" in response.data else response.data
+        return [item["model_name"] for item in results]
+
+    assert model_names() == ["replica"]
+    note_write()
+    assert model_names() == ["primary"]
+
+
+def test_middleware_carries_stickiness_to_the_next_request(audit_databases):
+    audit_databases["STICKY"] = 5
+    seen = []
+
+    def view(request):
+        seen.append(read_database())
+        if request.method == "POST":
+            note_write()
+        return HttpResponse()
+
+    middleware = AuditReadStickinessMiddleware(view)
+    factory = RequestFactory()
+
+    response = middleware(factory.post("/predict/"))
+    cookie = response.cookies[AuditReadStickinessMiddleware.cookie_name]
+    assert cookie["max-age"] == 5
+
+    middleware(factory.get("/models/"))
+    request = factory.get("/models/")
+    request.COOKIES[cookie.key] = cookie.value
+    middleware(request)
+
+    assert seen == ["audit_replica", "audit_replica", None]
+    # Stickiness never leaks out of a request into the calling context.
+    assert read_database() == "audit_replica"
+
+
+@pytest.mark.django_db(databases=AUDIT_DATABASES)
+def test_only_actual_writes_start_the_sticky_window(audit_databases):
+    audit_databases["STICKY"] = 5
+
+    # Routing decisions alone (e.g. resolving the audit alias) write nothing.
+    AuditRouter().db_for_write(PredictionEvent)
+    assert read_database() == "audit_replica"
+
+    record_prediction_event(
+        model_name="fraud_model",
+        model_version="1.0.0",
+        features={"amount": 10},
+        output={"score": 0.9},
+    )
+    assert read_database() is None
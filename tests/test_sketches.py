@@ -0,0 +1,134 @@
+# tests/test_sketches.py
+
+import random
+from datetime import datetime, timezone
+from functools import partial
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from ml_audit.api.views import QuantileSketchViewSet
+from ml_audit.models import PredictionEvent, QuantileSketch, SketchMetric
+from ml_audit.services import ActorPayload, record_prediction_events
+from ml_audit.services.sketches import SketchAggregator, get_sketch_aggregator, window_sketch
+from ml_audit.sketches import DDSketch
+
+HOUR_1 = datetime(2026, 3, 1, 9, 15, tzinfo=timezone.utc)
+HOUR_2 = datetime(2026, 3, 1, 10, 45, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(
+        event_payload, actor=ActorPayload(actor_type="user", actor_id="u-1"), confidence=0.5
+    )
+
+
+def test_sketch_quantiles_are_within_relative_accuracy_after_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+    left, right = DDSketch(0.01), DDSketch(0.01)
+    left.update(values[:5000])
+    right.update(values[5000:])
+
+    left.merge(DDSketch.from_dict(right.to_dict()))
+
+    values.sort()
+    assert left.count == len(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert left.quantile(q) == pytest.approx(exact, rel=0.01)
+    with pytest.raises(ValueError):
+        left.merge(DDSketch(0.05))
+
+
+@pytest.mark.django_db
+def test_flushes_from_several_workers_merge_into_one_row(event_payload):
+    first, second = SketchAggregator(), SketchAggregator()
+    record_prediction_events(
+        [
+            event_payload(prediction_id=f"p-{i}", timestamp=HOUR_1, latency_ms=float(i))
+            for i in range(1, 101)
+        ]
+    )
+    events = list(PredictionEvent.objects.order_by("latency_ms"))
+    first.observe(events[:60])
+    second.observe(events[60:])
+
+    assert first.flush() == 2
+    assert second.flush() == 2
+    assert first.flush() == 0
+    first.stop()
+    second.stop()
+
+    row = QuantileSketch.objects.get(metric=SketchMetric.LATENCY_MS)
+    assert row.bucket == HOUR_1.replace(minute=0)
+    assert row.count == 100
+    assert row.to_sketch().quantile(0.5) == pytest.approx(50, rel=0.02)
+    assert QuantileSketch.objects.get(metric=SketchMetric.CONFIDENCE).count == 100
+
+
+@pytest.mark.django_db
+def test_recording_feeds_the_aggregator_after_commit(
+    settings, django_capture_on_commit_callbacks, event_payload
+):
+    settings.ML_AUDIT_SKETCHES = {"ENABLED": True}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record_prediction_events(
+            [
+                event_payload(prediction_id="a", timestamp=HOUR_1, latency_ms=10.0),
+                # A duplicate prediction_id.
+                event_payload(prediction_id="a", timestamp=HOUR_1, latency_ms=10.0),
+                event_payload(
+                    prediction_id="b", timestamp=HOUR_2, latency_ms=30.0, confidence=None
+                ),
+            ]
+        )
+    aggregator = get_sketch_aggregator()
+    assert aggregator.pending() == 3
+    aggregator.flush()
+
+    sketch = window_sketch(model_name="fraud_model", metric=SketchMetric.LATENCY_MS)
+    assert (sketch.count, sketch.min, sketch.max) == (2, 10.0, 30.0)
+
+
+@pytest.mark.django_db
+def test_window_endpoint_merges_hours(event_payload):
+    hour_1 = partial(event_payload, timestamp=HOUR_1, latency_ms=10.0)
+    hour_2 = partial(event_payload, timestamp=HOUR_2, latency_ms=100.0)
+    record_prediction_events(
+        [hour_1(prediction_id=f"a-{i}") for i in range(10)]
+        + [hour_2(prediction_id=f"b-{i}") for i in range(10)]
+        + [hour_2(prediction_id="c", latency_ms=500.0, model_version="2.0.0")]
+    )
+    aggregator = SketchAggregator()
+    aggregator.observe(PredictionEvent.objects.all())
+    aggregator.stop()
+    factory = APIRequestFactory()
+    view = QuantileSketchViewSet.as_view({"get": "window"})
+
+    response = view(
+        factory.get(
+            "/quantiles/window/",
+            {"model_name": "fraud_model", "model_version": "1.0.0", "q": "0.25,0.75"},
+        )
+    )
+    assert response.data["count"] == 20
+    assert response.data["quantiles"]["0.25"] == pytest.approx(10.0, rel=0.01)
+    assert response.data["quantiles"]["0.75"] == pytest.approx(100.0, rel=0.01)
+
+    response = view(
+        factory.get(
+            "/quantiles/window/",
+            {"model_name": "fraud_model", "time_from": "2026-03-01T10:30:00Z"},
+        )
+    )
+    assert (response.data["count"], response.data["max"]) == (11, 500.0)
+
+    response = view(factory.get("/quantiles/window/", {"metric": "confidence"}))
+    assert response.status_code == 400
+    assert "model_name" in response.data
+
+    response = view(factory.get("/quantiles/window/", {"model_name": "fraud_model", "q": "2"}))
+    assert response.status_code == 400
@@ -0,0 +1,165 @@
+# tests/test_spool.py
+
+import json
+import time
+from functools import partial
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ml_audit import spool
+from ml_audit.fingerprint import compute_fingerprint
+from ml_audit.integrations.drf import audited_prediction
+from ml_audit.models import Explanation, PredictionEvent
+from ml_audit.services import ActorPayload
+from ml_audit.services import recording
+from ml_audit.spool import SpoolWriter, list_segments, read_segment
+
+
+@pytest.fixture
+def spool_dir(tmp_path, settings, monkeypatch):
+    monkeypatch.setattr(spool, "_writer", None)
+    settings.ML_AUDIT_SPOOL = {"DIRECTORY": str(tmp_path), "FSYNC_EVERY": 1}
+    yield tmp_path
+    if spool._writer is not None:
+        spool._writer.close()
+
+
+@pytest.fixture
+def event_payload(event_payload):
+    return partial(
+        event_payload,
+        features={"amount": 10, "email": "user@example.com"},
+        output={"score": 0.3},
+        actor=ActorPayload(actor_type="service", actor_id="scorer"),
+    )
+
+
+@pytest.mark.django_db
+def test_always_mode_spools_redacted_events_and_replay_writes_them(
+    spool_dir, settings, record_event
+):
+    settings.ML_AUDIT_SPOOL = {**settings.ML_AUDIT_SPOOL, "MODE": "always"}
+
+    event = record_event(prediction_id="p-1")
+    spool.get_spool_writer().close()
+
+    assert event._state.adding
+    assert PredictionEvent.objects.count() == 0
+    (segment,) = list_segments(spool_dir)
+    stored = json.loads(segment.read_bytes())
+    assert stored["event"]["features"]["email"] == "*****"
+
+    call_command("ml_audit_replay_spool", "--keep")
+    call_command("ml_audit_replay_spool")
+
+    replayed = PredictionEvent.objects.get(prediction_id="p-1")
+    assert replayed.timestamp == event.timestamp
+    assert replayed.actor.actor_id == "scorer"
+    assert list_segments(spool_dir) == []
+
+
+@pytest.mark.django_db
+def test_spooled_auto_fingerprint_is_computed_before_replay(spool_dir, settings, record_event):
+    settings.ML_AUDIT_SPOOL = {**settings.ML_AUDIT_SPOOL, "MODE": "always"}
+    settings.ML_AUDIT_FINGERPRINT = {"SOURCE": "raw"}
+    features = {"amount": 10, "email": "user@example.com"}
+
+    record_event(prediction_id="p-1", features=features, auto_fingerprint=True)
+    spool.get_spool_writer().close()
+    (segment,) = list_segments(spool_dir)
+    assert "auto_fingerprint" not in json.loads(segment.read_bytes())["event"]
+
+    call_command("ml_audit_replay_spool")
+
+    replayed = PredictionEvent.objects.get(prediction_id="p-1")
+    assert replayed.input_fingerprint == compute_fingerprint(features)
+
+
+@pytest.mark.django_db
+def test_fallback_mode_spools_when_database_is_unavailable(spool_dir, monkeypatch, record_event):
+    def unavailable(**kwargs):
+        raise OperationalError("database is down")
+
+    monkeypatch.setattr(recording, "_resolve_model_version_id", unavailable)
+
+    event = record_event()
+    spool.get_spool_writer().close()
+
+    (segment,) = list_segments(spool_dir)
+    assert [e["prediction_id"] for e in read_segment(segment)] == [event.prediction_id]
+
+
+@pytest.mark.django_db
+def test_decorator_skips_explanations_for_spooled_events(spool_dir, settings):
+    settings.ML_AUDIT_SPOOL = {**settings.ML_AUDIT_SPOOL, "MODE": "always"}
+    built = []
+
+    def build_explanation(features, output, prediction_event):
+        built.append(prediction_event.prediction_id)
+        return {"payload": {"amount": 1.0}, "summary": "amount"}
+
+    class View:
+        @audited_prediction(
+            model_name="fraud_model",
+            model_version="1.0.0",
+            explanation_builder=build_explanation,
+        )
+        def post(self, request):
+            return {"score": 0.3}
+
+    request = Request(
+        APIRequestFactory().post("/predict/", {"amount": 10}, format="json"),
+        parsers=[JSONParser()],
+    )
+
+    response = View().post(request)
+    spool.get_spool_writer().close()
+
+    assert response.status_code == 200
+    assert built == []
+    assert Explanation.objects.count() == 0
+    (segment,) = list_segments(spool_dir)
+    assert [e["prediction_id"] for e in read_segment(segment)] == [
+        response.data["prediction_id"]
+    ]
+
+
+def test_torn_trailing_record_is_skipped(tmp_path):
+    writer = SpoolWriter(tmp_path)
+    writer.append({"prediction_id": "p-1", "features": {}, "output": None})
+    writer.close()
+    (segment,) = list_segments(tmp_path)
+    with open(segment, "ab") as fh:
+        fh.write(b'{"v":1,"event":{"predic')
+
+    assert [e["prediction_id"] for e in read_segment(segment)] == ["p-1"]
+
+
+def test_open_segments_are_only_replayed_when_requested(tmp_path):
+    writer = SpoolWriter(tmp_path)
+    writer.append({"prediction_id": "p-1", "features": {}, "output": None})
+
+    # Our own open segment is never handed out, even with include_open.
+    assert list_segments(tmp_path) == []
+    assert list_segments(tmp_path, include_open=True) == []
+
+    writer.close()
+    assert len(list_segments(tmp_path)) == 1
+
+
+def test_idle_segments_are_sealed_without_another_append(tmp_path):
+    writer = SpoolWriter(tmp_path, segment_max_age=0.05)
+    writer.append({"prediction_id": "p-1", "features": {}, "output": None})
+
+    deadline = time.monotonic() + 5
+    while not list_segments(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    (segment,) = list_segments(tmp_path)
+    assert [e["prediction_id"] for e in read_segment(segment)] == ["p-1"]
+    writer.close()